@@ -1,5 +1,18 @@
-from .ui import run_app
+import sys
 
 
-if __name__ == "__main__":
+def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["serve"]:
+        # The server never imports the Tk UI, so it runs on hosts without a display or tkinter.
+        from .server import main as serve
+
+        serve(argv[1:])
+        return
+    from .ui import run_app
+
     run_app()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, TypeVar
+
+from .config import ASYNC_HASH_WORKERS, ASYNC_IO_WORKERS
+from .services import BankService
+from .storage import Storage
+
+T = TypeVar("T")
+
+
+def _offload(name: str, lane: str):
+    async def method(self: "AsyncBankService", *args, **kwargs):
+        return await self._run(lane, getattr(self.service, name), *args, **kwargs)
+
+    method.__name__ = name
+    method.__qualname__ = f"AsyncBankService.{name}"
+    method.__doc__ = f"Awaitable BankService.{name}, run on the {lane} executor."
+    return method
+
+
+class AsyncBankService:
+    """asyncio front-end for BankService.
+
+    Calls run on one of two thread pools: ``io`` for storage-only operations and
+    ``hash`` for anything that runs Argon2. Each pool has its own semaphore of the
+    same size, so a burst of logins queues behind the hash lane while deposits keep
+    flowing through the I/O lane. Work waits for a slot *before* it is handed to a
+    thread, so cancelling a waiting call means it never runs; a call that has
+    already started finishes in its thread and its result is discarded.
+
+    Validation and errors are BankService's own: the same ``bank_app.errors``
+    exceptions are raised from the awaited call. Use one instance per event loop.
+    """
+
+    def __init__(
+        self,
+        service: BankService,
+        io_workers: int = ASYNC_IO_WORKERS,
+        hash_workers: int = ASYNC_HASH_WORKERS,
+    ):
+        if io_workers < 1 or hash_workers < 1:
+            raise ValueError("Executor sizes must be at least 1.")
+        self.service = service
+        self._executors = {
+            "io": ThreadPoolExecutor(max_workers=io_workers, thread_name_prefix="bank-aio-io"),
+            "hash": ThreadPoolExecutor(max_workers=hash_workers, thread_name_prefix="bank-aio-hash"),
+        }
+        self._slots = {"io": asyncio.Semaphore(io_workers), "hash": asyncio.Semaphore(hash_workers)}
+
+    @classmethod
+    def create_default(
+        cls,
+        db_path,
+        io_workers: int = ASYNC_IO_WORKERS,
+        hash_workers: int = ASYNC_HASH_WORKERS,
+    ) -> "AsyncBankService":
+        # One pooled connection per executor thread, so neither lane waits on the other for a connection.
+        storage = Storage(db_path, pool_size=io_workers + hash_workers)
+        return cls(BankService(storage), io_workers, hash_workers)
+
+    async def _run(self, lane: str, operation: Callable[..., T], *args, **kwargs) -> T:
+        async with self._slots[lane]:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executors[lane], partial(operation, *args, **kwargs))
+
+    async def aclose(self) -> None:
+        """Wait for running calls, then close the executors and the underlying service."""
+        loop = asyncio.get_running_loop()
+        for executor in self._executors.values():
+            await loop.run_in_executor(None, partial(executor.shutdown, wait=True, cancel_futures=True))
+        await loop.run_in_executor(None, self.service.close)
+
+    async def __aenter__(self) -> "AsyncBankService":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    # Storage-bound operations.
+    admin_exists = _offload("admin_exists", "io")
+    customer_exists = _offload("customer_exists", "io")
+    delete_admin = _offload("delete_admin", "io")
+    delete_customer = _offload("delete_customer", "io")
+    get_balance = _offload("get_balance", "io")
+    get_customer_summary = _offload("get_customer_summary", "io")
+    get_transactions = _offload("get_transactions", "io")
+    deposit = _offload("deposit", "io")
+    withdraw = _offload("withdraw", "io")
+    post_batch = _offload("post_batch", "io")
+    search_customers = _offload("search_customers", "io")
+    get_balance_on = _offload("get_balance_on", "io")
+    get_balance_history = _offload("get_balance_history", "io")
+    get_period_totals = _offload("get_period_totals", "io")
+    rebuild_snapshots = _offload("rebuild_snapshots", "io")
+
+    # Argon2-bound operations.
+    create_admin = _offload("create_admin", "hash")
+    authenticate_admin = _offload("authenticate_admin", "hash")
+    require_admin_auth = _offload("require_admin_auth", "hash")
+    create_customer = _offload("create_customer", "hash")
+    authenticate_customer = _offload("authenticate_customer", "hash")
+    authenticate_customer_with_identifier = _offload("authenticate_customer_with_identifier", "hash")
+    require_customer_auth = _offload("require_customer_auth", "hash")
+    change_pin = _offload("change_pin", "hash")
+    import_customers = _offload("import_customers", "hash")
+    import_admins = _offload("import_admins", "hash")
+    reset_pins = _offload("reset_pins", "hash")
+
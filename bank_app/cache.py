@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Generic, Hashable, TypeVar
+
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class LRUCache(Generic[V]):
+    """Thread-safe, size-bounded LRU cache with an optional per-entry TTL.
+
+    ``hits`` and ``misses`` count lookups so callers can judge whether the cache
+    is earning its keep. Expired entries count as misses.
+
+    To cache a value read from a backing store without racing a writer, take
+    ``generation()`` before the read and pass it to ``put``: if the key was
+    invalidated in between, the value may be stale and is not stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: float | None = None):
+        if maxsize < 1:
+            raise ValueError("Cache size must be at least 1.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[V, float | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation; _invalidated records the last bump per key. Keys forgotten
+        # to bound its size fall back to _floor, which refuses every read that started before it.
+        self._generation = 0
+        self._invalidated: dict[Hashable, int] = {}
+        self._floor = 0
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is not _MISSING:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def put(self, key: Hashable, value: V, generation: int | None = None) -> bool:
+        """Store ``value``; with ``generation``, only if ``key`` was not invalidated since. Returns whether stored."""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if generation is not None and self._invalidated.get(key, self._floor) > generation:
+                return False
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+            return True
+
+    def invalidate(self, *keys: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            if len(self._invalidated) + len(keys) > self.maxsize:
+                self._invalidated.clear()
+                self._floor = self._generation
+            for key in keys:
+                self._entries.pop(key, None)
+                self._invalidated[key] = self._generation
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+            self._invalidated.clear()
+            self._floor = self._generation
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+            }
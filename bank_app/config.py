@@ -4,22 +4,126 @@ import os
 from pathlib import Path
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
-DATA_DIR = ROOT_DIR / "data"
-DATA_DIR.mkdir(parents=True, exist_ok=True)
+DATA_DIR = ROOT_DIR / "data"  # created by Storage when the database is first opened
 
 DB_PATH = Path(os.getenv("BANKAPP_DB_PATH", DATA_DIR / "bank.db"))
+DB_POOL_SIZE = int(os.getenv("BANKAPP_DB_POOL_SIZE", "5"))
+DB_POOL_TIMEOUT = float(os.getenv("BANKAPP_DB_POOL_TIMEOUT", "30"))
 
-DATE_FORMAT = "%d/%m/%Y"
+# In-process cache of customer rows in front of Storage.get_customer; 0 disables it.
+# Only enable it when this process is the sole writer, or accept up to TTL seconds of staleness.
+CUSTOMER_CACHE_SIZE = int(os.getenv("BANKAPP_CUSTOMER_CACHE_SIZE", "0"))
+CUSTOMER_CACHE_TTL = float(os.getenv("BANKAPP_CUSTOMER_CACHE_TTL", "30"))
+
+# Connection profiles applied to every pooled SQLite connection.
+# "compatible" keeps the rollback journal for databases on network shares, where WAL is unsafe.
+SQLITE_PROFILES = {
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+        "cache_size": -16384,  # negative values are KiB
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+    "throughput": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 10000,
+        "cache_size": -65536,
+        "mmap_size": 268435456,  # 256 MiB
+        "temp_store": "MEMORY",
+    },
+    "compatible": {
+        "journal_mode": "DELETE",
+        "synchronous": "FULL",
+        "busy_timeout": 5000,
+        "cache_size": -2000,
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+    },
+}
+SQLITE_PROFILE = os.getenv("BANKAPP_SQLITE_PROFILE", "durable")
+
+DATE_FORMAT = "%d/%m/%Y"  # user-facing input/display only; stored timestamps are ISO-8601
+TIMESTAMP_MIGRATION_BATCH = 5000
 
 MIN_BALANCE = 10000
 MAX_TRANSACTION = 25000
 
-ARGON2_TIME_COST = 3
-ARGON2_MEMORY_COST = 65536  # 64 MiB
-ARGON2_PARALLELISM = 2
+ACCOUNT_TYPES = ("Savings", "Current")
+TX_TYPES = ("deposit", "withdraw", "interest")
+# Ledger amounts are stored unsigned; these types take money out of the account.
+DEBIT_TX_TYPES = ("withdraw",)
+STATEMENT_PAGE_SIZE = 10
+MAX_STATEMENT_PAGE_SIZE = 100
+DIRECTORY_PAGE_SIZE = 100
+MAX_DIRECTORY_PAGE_SIZE = 500
+
+# Monthly interest on Savings accounts (bank_app.interest), in basis points per year: 350 = 3.5% p.a.
+SAVINGS_INTEREST_BPS = int(os.getenv("BANKAPP_SAVINGS_INTEREST_BPS", "350"))
+INTEREST_CHUNK_SIZE = int(os.getenv("BANKAPP_INTEREST_CHUNK_SIZE", "5000"))
+
+# End-of-day reports (bank_app.reports): rows per NumPy chunk and the balance distribution's bin edges.
+REPORT_CHUNK_SIZE = int(os.getenv("BANKAPP_REPORT_CHUNK_SIZE", "50000"))
+REPORT_BALANCE_BINS = (0, MIN_BALANCE, 50_000, 100_000, 500_000, 1_000_000, 10_000_000)
+
+# Argon2id cost presets; memory_cost is in KiB and is held by every concurrent hash or verify.
+# "low-memory" is the OWASP minimum for Argon2id, for teller machines that swap under 64 MiB per login.
+ARGON2_PROFILES = {
+    "standard": {"time_cost": 3, "memory_cost": 65536, "parallelism": 2},
+    "low-memory": {"time_cost": 2, "memory_cost": 19456, "parallelism": 1},
+    "high": {"time_cost": 4, "memory_cost": 131072, "parallelism": 4},
+}
+ARGON2_PROFILE = os.getenv("BANKAPP_ARGON2_PROFILE", "standard")
+# Per-parameter overrides applied on top of the profile (scripts/calibrate_argon2.py prints these).
+ARGON2_OVERRIDES = {
+    key: int(os.environ[f"BANKAPP_ARGON2_{key.upper()}"])
+    for key in ("time_cost", "memory_cost", "parallelism")
+    if os.getenv(f"BANKAPP_ARGON2_{key.upper()}")
+}
 ARGON2_HASH_LEN = 32
 ARGON2_SALT_LEN = 16
 
+# Threads that run Argon2-bound service calls off the caller's thread;
+# each concurrent hash holds the Argon2 profile's memory_cost.
+CREDENTIAL_WORKERS = int(os.getenv("BANKAPP_CREDENTIAL_WORKERS", "2"))
+# Processes used for bulk hashing (imports, PIN resets); 0 means one per available core.
+HASH_WORKERS = int(os.getenv("BANKAPP_HASH_WORKERS", "0"))
+
+# Optional single-writer mode: deposits/withdrawals queue to one thread that commits them in groups.
+# A group takes whatever is queued (up to LEDGER_GROUP_SIZE); LEDGER_GROUP_WAIT_MS > 0 also waits for stragglers.
+LEDGER_WRITER = os.getenv("BANKAPP_LEDGER_WRITER", "0") == "1"
+LEDGER_GROUP_SIZE = int(os.getenv("BANKAPP_LEDGER_GROUP_SIZE", "256"))
+LEDGER_GROUP_WAIT_MS = float(os.getenv("BANKAPP_LEDGER_GROUP_WAIT_MS", "0"))
+
+# AsyncBankService executor sizes: storage calls and Argon2 calls get separate lanes.
+ASYNC_IO_WORKERS = int(os.getenv("BANKAPP_ASYNC_IO_WORKERS", "4"))
+ASYNC_HASH_WORKERS = int(os.getenv("BANKAPP_ASYNC_HASH_WORKERS", str(CREDENTIAL_WORKERS)))
+
+# Headless JSON API (python -m bank_app serve); it refuses to start without a token.
+API_HOST = os.getenv("BANKAPP_API_HOST", "127.0.0.1")
+API_PORT = int(os.getenv("BANKAPP_API_PORT", "8080"))
+API_WORKERS = int(os.getenv("BANKAPP_API_WORKERS", "8"))
+API_TOKEN = os.getenv("BANKAPP_API_TOKEN", "")
+API_MAX_BODY = 1024 * 1024
+# Seconds a connection may sit idle mid-request before its worker gives up on it.
+API_REQUEST_TIMEOUT = float(os.getenv("BANKAPP_API_REQUEST_TIMEOUT", "30"))
+# Lifetime of the session tokens the login routes issue; account and admin routes require one.
+API_SESSION_TTL = float(os.getenv("BANKAPP_API_SESSION_TTL", "900"))
+
+# Latency histograms and error counters (bank_app.metrics); off by default, and nearly free while off.
+# With METRICS_FILE set, Prometheus text is rewritten there every METRICS_INTERVAL seconds.
+METRICS_ENABLED = os.getenv("BANKAPP_METRICS", "0") == "1"
+METRICS_FILE = os.getenv("BANKAPP_METRICS_FILE") or None
+METRICS_INTERVAL = float(os.getenv("BANKAPP_METRICS_INTERVAL", "15"))
+
+# Opt-in SQL profiler (bank_app.profiler): statements taking at least SQL_SLOW_MS are appended,
+# with their EXPLAIN QUERY PLAN, to SQL_SLOW_LOG as JSON lines.
+SQL_PROFILE = os.getenv("BANKAPP_SQL_PROFILE", "0") == "1"
+SQL_SLOW_MS = float(os.getenv("BANKAPP_SQL_SLOW_MS", "50"))
+SQL_SLOW_LOG = Path(os.getenv("BANKAPP_SQL_SLOW_LOG", DATA_DIR / "slow_queries.log"))
+
 PROTECTED_ADMIN_IDS = {"aayush"}
 
 BOOTSTRAP_ADMIN_ID = os.getenv("BANKAPP_BOOTSTRAP_ADMIN_ID")
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Callable
+
+from .config import INTEREST_CHUNK_SIZE, SAVINGS_INTEREST_BPS
+from .storage import Storage
+
+_PERIOD = re.compile(r"\d{4}-(0[1-9]|1[0-2])")
+
+
+@dataclass(frozen=True)
+class InterestRun:
+    period: str
+    rate_bps: int
+    accounts: int
+    total: int
+    elapsed: float
+
+
+def period_end(period: str) -> date:
+    """Last day of a ``YYYY-MM`` period."""
+    year, month = map(int, period.split("-"))
+    first_of_next = date(year + month // 12, month % 12 + 1, 1)
+    return first_of_next - timedelta(days=1)
+
+
+def validate_period(period: str, today: date | None = None) -> str:
+    """Check ``period`` is a YYYY-MM month that has already ended; interest is paid on its closing balances."""
+    period = (period or "").strip()
+    if not _PERIOD.fullmatch(period):
+        raise ValueError("Interest period must look like YYYY-MM.")
+    if period_end(period) >= (today or date.today()):
+        raise ValueError(f"Interest for {period} can only be accrued once the month has ended.")
+    return period
+
+
+def accrue_interest(
+    storage: Storage,
+    period: str,
+    rate_bps: int = SAVINGS_INTEREST_BPS,
+    chunk_size: int = INTEREST_CHUNK_SIZE,
+    progress: Callable[[int, int], None] | None = None,
+) -> InterestRun:
+    """Post one month of interest to every Savings account, ``chunk_size`` accounts per transaction.
+
+    Interest is paid on each account's closing balance on the period's last day,
+    taken from the daily balance snapshots. Safe to re-run: a finished period is
+    a no-op, and an interrupted one resumes after the last committed chunk.
+    ``progress`` receives the running account count and interest total after
+    each chunk.
+    """
+    period = validate_period(period)
+    if rate_bps < 0:
+        raise ValueError("Interest rate cannot be negative.")
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be at least 1.")
+    end = period_end(period)
+    start = time.perf_counter()
+    run = storage.start_interest_run(period, rate_bps)
+    while run["completed_at"] is None:
+        run = storage.accrue_interest_chunk(period, end, chunk_size)
+        if progress is not None:
+            progress(run["accounts"], run["total"])
+    return InterestRun(
+        period=period,
+        rate_bps=run["rate_bps"],
+        accounts=run["accounts"],
+        total=run["total"],
+        elapsed=time.perf_counter() - start,
+    )
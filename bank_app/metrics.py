@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable, Iterator
+
+from .config import METRICS_ENABLED, METRICS_FILE, METRICS_INTERVAL
+
+# Upper bounds in seconds: from fast indexed SQL (sub-millisecond) up to slow Argon2 profiles.
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, math.inf)
+
+METRIC_HELP = {
+    "bank_service_call_seconds": ("histogram", "Latency of BankService methods."),
+    "bank_service_errors_total": ("counter", "Exceptions raised by BankService methods, by error type."),
+    "bank_argon2_seconds": ("histogram", "Time spent hashing or verifying with Argon2."),
+    "bank_sql_seconds": ("histogram", "Time a pooled connection is held for one transaction."),
+    "bank_pool_wait_seconds": ("histogram", "Time spent waiting for a pooled SQLite connection."),
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    __slots__ = ("bounds", "counts", "count", "sum")
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        total = 0
+        pairs = []
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(bound)
+
+
+def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (f'{key}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+               for key, value in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+class MetricsRegistry:
+    """In-process latency histograms and counters, exportable as Prometheus text or JSON.
+
+    Instrumented code checks ``enabled`` before reading the clock, so a disabled
+    registry costs one attribute lookup per call site.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._histograms: dict[tuple[str, Labels], Histogram] = {}
+        self._counters: dict[tuple[str, Labels], float] = {}
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    def increment(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def timer(self, name: str, **labels: str):
+        """Context manager that observes the elapsed time of its block (a no-op when disabled)."""
+        if not self.enabled:
+            return nullcontext()
+        return self._timed(name, labels)
+
+    @contextmanager
+    def _timed(self, name: str, labels: dict[str, str]) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            histograms = {key: (h.count, h.sum, h.cumulative()) for key, h in self._histograms.items()}
+            counters = dict(self._counters)
+        result: dict = {"enabled": self.enabled, "histograms": {}, "counters": {}}
+        for (name, labels), (count, total, buckets) in sorted(histograms.items()):
+            result["histograms"].setdefault(name, []).append({
+                "labels": dict(labels),
+                "count": count,
+                "sum": total,
+                "mean": total / count if count else 0.0,
+                "buckets": {_format_bound(bound): cumulative for bound, cumulative in buckets},
+            })
+        for (name, labels), value in sorted(counters.items()):
+            result["counters"].setdefault(name, []).append({"labels": dict(labels), "value": value})
+        return result
+
+    def to_prometheus(self) -> str:
+        with self._lock:
+            histograms = {key: (h.count, h.sum, h.cumulative()) for key, h in self._histograms.items()}
+            counters = dict(self._counters)
+        lines: list[str] = []
+        described: set[str] = set()
+
+        def describe(name: str, kind: str) -> None:
+            if name not in described:
+                described.add(name)
+                lines.append(f"# HELP {name} {METRIC_HELP.get(name, (kind, name))[1]}")
+                lines.append(f"# TYPE {name} {kind}")
+
+        for (name, labels), (count, total, buckets) in sorted(histograms.items()):
+            describe(name, "histogram")
+            for bound, cumulative in buckets:
+                lines.append(f"{name}_bucket{_format_labels(labels, ('le', _format_bound(bound)))} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        for (name, labels), value in sorted(counters.items()):
+            describe(name, "counter")
+            lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Path) -> None:
+        """Write the Prometheus text atomically, for a node_exporter textfile collector."""
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(self.to_prometheus(), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def write_json(self, path: Path) -> None:
+        path = Path(path)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.snapshot(), indent=2), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def start_file_export(self, path: Path, interval: float) -> Callable[[], None]:
+        """Rewrite ``path`` (Prometheus text) every ``interval`` seconds.
+
+        Returns a function that stops the exporter after one final write.
+        """
+        done = threading.Event()
+
+        def run() -> None:
+            while not done.wait(interval):
+                self.write_prometheus(path)
+            self.write_prometheus(path)
+
+        thread = threading.Thread(target=run, name="bank-metrics-export", daemon=True)
+        thread.start()
+
+        def stop() -> None:
+            done.set()
+            thread.join()
+
+        return stop
+
+
+metrics = MetricsRegistry(enabled=METRICS_ENABLED)
+
+
+def start_configured_export() -> Callable[[], None] | None:
+    """Start the BANKAPP_METRICS_FILE exporter if metrics are on and a file is configured."""
+    if not (metrics.enabled and METRICS_FILE):
+        return None
+    return metrics.start_file_export(Path(METRICS_FILE), METRICS_INTERVAL)
+
+
+def _timed_method(func):
+    method = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not metrics.enabled:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        except Exception as exc:
+            metrics.increment("bank_service_errors_total", method=method, error=type(exc).__name__)
+            raise
+        finally:
+            metrics.observe("bank_service_call_seconds", time.perf_counter() - start, method=method)
+
+    return wrapper
+
+
+def instrument(*skip: str):
+    """Class decorator: time every public method (except ``skip``) into bank_service_call_seconds."""
+
+    def decorate(cls):
+        for name, attr in list(vars(cls).items()):
+            if name.startswith("_") or name in skip or not inspect.isfunction(attr):
+                continue
+            setattr(cls, name, _timed_method(attr))
+        return cls
+
+    return decorate
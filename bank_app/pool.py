@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Mapping
+
+from .config import DB_POOL_SIZE, DB_POOL_TIMEOUT, SQLITE_PROFILE, SQLITE_PROFILES
+from .metrics import metrics
+from .profiler import ProfilingConnection, SQLProfiler
+
+_CHOICE_PRAGMAS = {
+    "journal_mode": {"DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"},
+    "synchronous": {"OFF", "NORMAL", "FULL", "EXTRA"},
+    "temp_store": {"DEFAULT", "FILE", "MEMORY"},
+}
+_INT_PRAGMAS = {"busy_timeout", "cache_size", "mmap_size"}
+
+
+def resolve_profile(profile: str | Mapping[str, object]) -> dict[str, object]:
+    """Return validated PRAGMA settings for a preset name or an explicit mapping."""
+    if isinstance(profile, str):
+        try:
+            profile = SQLITE_PROFILES[profile]
+        except KeyError:
+            raise ValueError(f"Unknown SQLite profile: {profile!r}.") from None
+
+    resolved: dict[str, object] = {}
+    for key, value in profile.items():
+        if key in _CHOICE_PRAGMAS:
+            value = str(value).upper()
+            if value not in _CHOICE_PRAGMAS[key]:
+                raise ValueError(f"Invalid value for {key}: {value!r}.")
+        elif key in _INT_PRAGMAS:
+            value = int(value)
+        else:
+            raise ValueError(f"Unsupported SQLite setting: {key!r}.")
+        resolved[key] = value
+    return resolved
+
+
+class ConnectionPool:
+    """Bounded pool of reusable SQLite connections.
+
+    Connections are opened lazily up to ``size`` and handed out one caller at a
+    time, so they can safely cross threads (``check_same_thread=False``). Callers
+    waiting for a connection are woken both when one is released and when a
+    broken one is discarded, since that frees room to open a replacement.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        size: int = DB_POOL_SIZE,
+        timeout: float = DB_POOL_TIMEOUT,
+        profile: str | Mapping[str, object] = SQLITE_PROFILE,
+        profiler: SQLProfiler | None = None,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1.")
+        self.db_path = Path(db_path)
+        self.size = size
+        self.timeout = timeout
+        self.profile = resolve_profile(profile)
+        self.profiler = profiler
+        # Most recently released last, so the warmest connection is reused first.
+        self._idle: list[sqlite3.Connection] = []
+        self._available = threading.Condition(threading.Lock())
+        self._created = 0
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def open_connections(self) -> int:
+        return self._created
+
+    def _open(self) -> sqlite3.Connection:
+        busy_timeout = int(self.profile.get("busy_timeout", 5000))
+        if self.profiler is None:
+            conn = sqlite3.connect(self.db_path, timeout=busy_timeout / 1000, check_same_thread=False)
+        else:
+            conn = sqlite3.connect(
+                self.db_path,
+                timeout=busy_timeout / 1000,
+                check_same_thread=False,
+                factory=ProfilingConnection,
+            )
+            conn.profiler = self.profiler
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA foreign_keys = ON")
+        # busy_timeout goes first so a journal mode switch can wait out other writers.
+        for key in sorted(self.profile, key=lambda name: name != "busy_timeout"):
+            conn.execute(f"PRAGMA {key} = {self.profile[key]}")
+        return conn
+
+    def _discard(self, conn: sqlite3.Connection) -> None:
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @staticmethod
+    def _is_healthy(conn: sqlite3.Connection) -> bool:
+        try:
+            conn.execute("SELECT 1").fetchone()
+        except sqlite3.Error:
+            return False
+        return True
+
+    def acquire(self) -> sqlite3.Connection:
+        deadline = time.monotonic() + self.timeout
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("Timed out waiting for a database connection.")
+                self._available.wait(remaining)
+        try:
+            return self._open()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+
+    def release(self, conn: sqlite3.Connection, healthy: bool = True) -> None:
+        if isinstance(conn, ProfilingConnection):
+            conn.flush_profile()
+        if healthy:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+            except sqlite3.Error:
+                healthy = False
+        if self._closed or not healthy:
+            self._discard(conn)
+            return
+        with self._available:
+            self._idle.append(conn)
+            self._available.notify()
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        with metrics.timer("bank_pool_wait_seconds"):
+            conn = self.acquire()
+        try:
+            yield conn
+        except sqlite3.Error:
+            # A failed statement may have left the handle unusable; only keep it if it still answers.
+            self.release(conn, healthy=self._is_healthy(conn))
+            raise
+        except BaseException:
+            self.release(conn)
+            raise
+        else:
+            self.release(conn)
+
+    def health_check(self) -> int:
+        """Ping every idle connection, dropping broken ones. Returns the number kept."""
+        with self._available:
+            checked, self._idle = self._idle, []
+        healthy = 0
+        for conn in checked:
+            ok = self._is_healthy(conn)
+            if ok:
+                healthy += 1
+            self.release(conn, healthy=ok)
+        return healthy
+
+    def close(self) -> None:
+        """Close idle connections now; checked-out ones are closed when released."""
+        with self._available:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            # Waiters give up with RuntimeError rather than sitting out their timeout.
+            self._available.notify_all()
+        for conn in idle:
+            self._discard(conn)
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+
+from .config import SQL_SLOW_LOG, SQL_SLOW_MS
+
+# Tables large enough that a full scan on a request path is a regression.
+FULL_SCAN_TABLES = ("customers", "transactions")
+# "SCAN customers", "SCAN customers USING INDEX ..." and the pre-3.36 "SCAN TABLE customers" form.
+_FULL_SCAN = re.compile(rf"SCAN (?:TABLE )?(?:{'|'.join(FULL_SCAN_TABLES)})\b")
+_EXPLAINABLE = ("SELECT", "INSERT", "UPDATE", "DELETE", "REPLACE", "WITH")
+
+
+def normalize_sql(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+@dataclass(frozen=True)
+class StatementStats:
+    sql: str
+    calls: int
+    total_ms: float
+    max_ms: float
+    rows: int
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    sql: str
+    elapsed_ms: float
+    rows: int
+    plan: tuple[str, ...]
+    at: float
+
+    @property
+    def full_scans(self) -> tuple[str, ...]:
+        """Plan steps that scan a FULL_SCAN_TABLES table instead of searching an index."""
+        return tuple(step for step in self.plan if _FULL_SCAN.match(step))
+
+
+class SQLProfiler:
+    """Per-statement timings for every connection opened with it, plus a slow-query log.
+
+    Statements that take at least ``slow_ms`` (including fetching their rows) are
+    appended to ``log_path`` as JSON lines together with their EXPLAIN QUERY PLAN,
+    which is captured once per distinct statement. Parameter values are never
+    logged, since they include PIN hashes. ``slow_ms=0`` records the plan of every
+    statement, which is how tests check that request paths avoid full scans.
+    """
+
+    def __init__(self, slow_ms: float = SQL_SLOW_MS, log_path: Path | None = SQL_SLOW_LOG, max_slow: int = 1000):
+        self.slow_ms = slow_ms
+        self.log_path = Path(log_path) if log_path is not None else None
+        self._lock = threading.Lock()
+        self._stats: dict[str, list] = {}
+        self._plans: dict[str, tuple[str, ...]] = {}
+        self.slow_queries: deque[SlowQuery] = deque(maxlen=max_slow)
+
+    def record(self, conn: sqlite3.Connection, sql: str, params, elapsed: float, rows: int) -> None:
+        key = normalize_sql(sql)
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                entry = self._stats[key] = [0, 0.0, 0.0, 0]
+            entry[0] += 1
+            entry[1] += elapsed_ms
+            entry[2] = max(entry[2], elapsed_ms)
+            entry[3] += rows
+        if elapsed_ms >= self.slow_ms:
+            self._log_slow(conn, key, sql, params, elapsed_ms, rows)
+
+    def _plan(self, conn: sqlite3.Connection, key: str, sql: str, params) -> tuple[str, ...]:
+        with self._lock:
+            plan = self._plans.get(key)
+        if plan is not None:
+            return plan
+        plan = ()
+        if params is not None and key.split(" ", 1)[0].upper() in _EXPLAINABLE:
+            try:
+                # The base class execute, so the EXPLAIN itself is not profiled.
+                rows = sqlite3.Connection.execute(conn, f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+                plan = tuple(row[3] for row in rows)
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            self._plans[key] = plan
+        return plan
+
+    def _log_slow(self, conn, key: str, sql: str, params, elapsed_ms: float, rows: int) -> None:
+        query = SlowQuery(sql=key, elapsed_ms=elapsed_ms, rows=rows, plan=self._plan(conn, key, sql, params),
+                          at=time.time())
+        with self._lock:
+            self.slow_queries.append(query)
+            if self.log_path is not None:
+                self.log_path.parent.mkdir(parents=True, exist_ok=True)
+                with self.log_path.open("a", encoding="utf-8") as log:
+                    log.write(json.dumps({
+                        "at": query.at,
+                        "elapsed_ms": round(elapsed_ms, 3),
+                        "rows": rows,
+                        "sql": key,
+                        "plan": list(query.plan),
+                        "full_scans": list(query.full_scans),
+                    }) + "\n")
+
+    def stats(self) -> list[StatementStats]:
+        """Aggregated timings per distinct statement, most total time first."""
+        with self._lock:
+            items = [StatementStats(sql, *entry) for sql, entry in self._stats.items()]
+        return sorted(items, key=lambda item: item.total_ms, reverse=True)
+
+    def full_scans(self) -> list[SlowQuery]:
+        with self._lock:
+            return [query for query in self.slow_queries if query.full_scans]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._plans.clear()
+            self.slow_queries.clear()
+
+    def report(self, limit: int = 20) -> str:
+        lines = [f"{'calls':>8} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'rows':>9}  statement"]
+        for item in self.stats()[:limit]:
+            sql = item.sql if len(item.sql) <= 80 else item.sql[:77] + "..."
+            lines.append(
+                f"{item.calls:>8} {item.total_ms:>10.2f} {item.mean_ms:>9.3f} {item.max_ms:>9.3f} {item.rows:>9}  {sql}"
+            )
+        return "\n".join(lines)
+
+
+class ProfilingCursor(sqlite3.Cursor):
+    """Cursor that times execution plus row fetching and reports to the connection's profiler.
+
+    A statement's record is closed when its rows run out, when the cursor is
+    reused or closed, or when the connection goes back to the pool.
+    """
+
+    connection: "ProfilingConnection"
+
+    def __init__(self, conn: "ProfilingConnection"):
+        super().__init__(conn)
+        self._pending: list | None = None
+
+    def _finish(self) -> None:
+        if self._pending is not None:
+            sql, params, elapsed, rows = self._pending
+            self._pending = None
+            self.connection.profiler.record(self.connection, sql, params, elapsed, rows)
+
+    def _fetched(self, elapsed: float, rows: int, exhausted: bool) -> None:
+        if self._pending is not None:
+            self._pending[2] += elapsed
+            self._pending[3] += rows
+            if exhausted:
+                self._finish()
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        start = time.perf_counter()
+        super().execute(sql, parameters)
+        elapsed = time.perf_counter() - start
+        self._pending = [sql, parameters, elapsed, 0]
+        if self.description is None:
+            self._pending[3] = max(self.rowcount, 0)
+            self._finish()
+        else:
+            self.connection._open_cursors.add(self)
+        return self
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        start = time.perf_counter()
+        super().executemany(sql, seq_of_parameters)
+        # No single parameter set to EXPLAIN with, so no plan either.
+        self.connection.profiler.record(
+            self.connection, sql, None, time.perf_counter() - start, max(self.rowcount, 0)
+        )
+        return self
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(time.perf_counter() - start, row is not None, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        start = time.perf_counter()
+        rows = super().fetchmany(self.arraysize if size is None else size)
+        self._fetched(time.perf_counter() - start, len(rows), len(rows) < (self.arraysize if size is None else size))
+        return rows
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(time.perf_counter() - start, len(rows), True)
+        return rows
+
+    def __next__(self):
+        start = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(time.perf_counter() - start, 0, True)
+            raise
+        self._fetched(time.perf_counter() - start, 1, False)
+        return row
+
+    def close(self) -> None:
+        self._finish()
+        super().close()
+
+
+class ProfilingConnection(sqlite3.Connection):
+    """sqlite3 connection whose shortcut execute methods run on a ProfilingCursor."""
+
+    profiler: SQLProfiler
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._open_cursors: set[ProfilingCursor] = set()
+
+    def execute(self, sql, parameters=()):
+        return self.cursor(ProfilingCursor).execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor(ProfilingCursor).executemany(sql, seq_of_parameters)
+
+    def executescript(self, sql_script):
+        start = time.perf_counter()
+        cursor = super().executescript(sql_script)
+        self.profiler.record(self, sql_script, None, time.perf_counter() - start, 0)
+        return cursor
+
+    def flush_profile(self) -> None:
+        """Close the records of statements whose rows were never read to the end."""
+        cursors, self._open_cursors = self._open_cursors, set()
+        for cursor in cursors:
+            cursor._finish()
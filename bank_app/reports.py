@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import csv
+import json
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Iterator
+
+# Optional dependency: only reporting needs NumPy, the app and API do not import this module.
+import numpy as np
+
+from .config import ACCOUNT_TYPES, DEBIT_TX_TYPES, MIN_BALANCE, REPORT_BALANCE_BINS, REPORT_CHUNK_SIZE, TX_TYPES
+from .storage import Storage
+
+# Rows whose text value is not in the known list get the last code and are reported as "other".
+OTHER = "other"
+
+
+def _code_sql(column: str, values: tuple[str, ...]) -> str:
+    cases = " ".join(f"WHEN ? THEN {code}" for code in range(len(values)))
+    return f"CASE {column} {cases} ELSE {len(values)} END"
+
+
+def _labels(values: tuple[str, ...]) -> list[str]:
+    return [*values, OTHER]
+
+
+def iter_chunks(storage: Storage, sql: str, params: tuple, chunk_size: int) -> Iterator[np.ndarray]:
+    """Yield the result of an all-integer query as 2-D int64 arrays of at most ``chunk_size`` rows."""
+    with storage.connect() as conn:
+        cursor = conn.execute(sql, params)
+        while rows := cursor.fetchmany(chunk_size):
+            yield np.array(rows, dtype=np.int64)
+
+
+def _balance_report(storage: Storage, chunk_size: int, bins: tuple[int, ...]) -> dict:
+    n_types = len(ACCOUNT_TYPES) + 1
+    counts = np.zeros(n_types, dtype=np.int64)
+    totals = np.zeros(n_types, dtype=np.int64)
+    below_minimum = np.zeros(n_types, dtype=np.int64)
+    edges = np.array([-np.inf, *bins, np.inf])
+    histogram = np.zeros(len(edges) - 1, dtype=np.int64)
+    lowest, highest = None, None
+
+    sql = f"SELECT balance, {_code_sql('account_type', ACCOUNT_TYPES)} FROM customers"
+    for chunk in iter_chunks(storage, sql, ACCOUNT_TYPES, chunk_size):
+        balances, types = chunk[:, 0], chunk[:, 1]
+        counts += np.bincount(types, minlength=n_types)
+        # np.add.at sums in int64; bincount's weights go through float64 and drop units above 2**53.
+        np.add.at(totals, types, balances)
+        below_minimum += np.bincount(types[balances < MIN_BALANCE], minlength=n_types)
+        histogram += np.histogram(balances, bins=edges)[0]
+        lowest = int(balances.min()) if lowest is None else min(lowest, int(balances.min()))
+        highest = int(balances.max()) if highest is None else max(highest, int(balances.max()))
+
+    by_type = [
+        {
+            "account_type": label,
+            "accounts": int(counts[code]),
+            "total_balance": int(totals[code]),
+            "below_minimum": int(below_minimum[code]),
+        }
+        for code, label in enumerate(_labels(ACCOUNT_TYPES))
+        if counts[code]
+    ]
+    labels = [f"< {bins[0]}", *(f"{low}-{high - 1}" for low, high in zip(bins, bins[1:])), f">= {bins[-1]}"]
+    accounts = int(counts.sum())
+    return {
+        "by_account_type": by_type,
+        "accounts": accounts,
+        "total_balance": int(totals.sum()),
+        "below_minimum": int(below_minimum.sum()),
+        "min_balance": lowest,
+        "max_balance": highest,
+        "mean_balance": float(totals.sum() / accounts) if accounts else None,
+        "distribution": [{"range": label, "accounts": int(count)} for label, count in zip(labels, histogram)],
+    }
+
+
+def _transaction_report(storage: Storage, start: str, end: str, chunk_size: int) -> list[dict]:
+    n_tx, n_acct = len(TX_TYPES) + 1, len(ACCOUNT_TYPES) + 1
+    counts = np.zeros(n_tx * n_acct, dtype=np.int64)
+    amounts = np.zeros(n_tx * n_acct, dtype=np.int64)
+    sql = f"""
+        SELECT transactions.amount,
+               {_code_sql('transactions.tx_type', TX_TYPES)},
+               {_code_sql('customers.account_type', ACCOUNT_TYPES)}
+        FROM transactions JOIN customers ON customers.account_number = transactions.account_number
+        WHERE transactions.created_at >= ? AND transactions.created_at < ?
+    """
+    for chunk in iter_chunks(storage, sql, (*TX_TYPES, *ACCOUNT_TYPES, start, end), chunk_size):
+        cells = chunk[:, 1] * n_acct + chunk[:, 2]
+        counts += np.bincount(cells, minlength=n_tx * n_acct)
+        np.add.at(amounts, cells, chunk[:, 0])
+
+    return [
+        {
+            "tx_type": tx_label,
+            "account_type": acct_label,
+            "count": int(counts[tx_code * n_acct + acct_code]),
+            "amount": int(amounts[tx_code * n_acct + acct_code]),
+        }
+        for tx_code, tx_label in enumerate(_labels(TX_TYPES))
+        for acct_code, acct_label in enumerate(_labels(ACCOUNT_TYPES))
+        if counts[tx_code * n_acct + acct_code]
+    ]
+
+
+def _top_movers(storage: Storage, start: str, end: str, chunk_size: int, top: int) -> list[dict]:
+    """Accounts with the largest absolute net movement, keeping only ``top`` candidates between chunks."""
+    debit_types = ", ".join("?" * len(DEBIT_TX_TYPES))
+    # SQLite groups per account; each group travels as the customer's integer rowid and is named at the end.
+    sql = f"""
+        SELECT (SELECT rowid FROM customers WHERE customers.account_number = transactions.account_number),
+               sum(CASE WHEN tx_type IN ({debit_types}) THEN -amount ELSE amount END),
+               sum(amount),
+               count(*)
+        FROM transactions
+        WHERE created_at >= ? AND created_at < ?
+        GROUP BY account_number
+    """
+    best = np.empty((0, 4), dtype=np.int64)
+    for chunk in iter_chunks(storage, sql, (*DEBIT_TX_TYPES, start, end), chunk_size):
+        candidates = np.concatenate([best, chunk])
+        if len(candidates) > top:
+            candidates = candidates[np.argpartition(-np.abs(candidates[:, 1]), top - 1)[:top]]
+        best = candidates
+    if not len(best):
+        return []
+    best = best[np.lexsort((best[:, 0], -np.abs(best[:, 1])))]
+    with storage.connect() as conn:
+        names = dict(conn.execute(
+            f"SELECT rowid, account_number FROM customers WHERE rowid IN ({', '.join('?' * len(best))})",
+            [int(rowid) for rowid in best[:, 0]],
+        ).fetchall())
+    return [
+        {
+            "account_number": names[int(rowid)],
+            "net_change": int(net),
+            "turnover": int(turnover),
+            "transactions": int(count),
+        }
+        for rowid, net, turnover, count in best
+    ]
+
+
+def build_daily_report(
+    storage: Storage,
+    day: date,
+    chunk_size: int = REPORT_CHUNK_SIZE,
+    top: int = 10,
+    balance_bins: tuple[int, ...] = REPORT_BALANCE_BINS,
+) -> dict:
+    """End-of-day report: ledger totals for ``day`` and the current balance book.
+
+    Rows are streamed ``chunk_size`` at a time as all-integer columns (text
+    categories are encoded to small codes in the query), so each chunk is one
+    int64 array and every aggregate is a vectorized bincount, histogram or
+    partition; memory stays proportional to the chunk size. Balances are read as
+    they stand when the report runs, so run it after the day closes.
+    """
+    if chunk_size < 1 or top < 1:
+        raise ValueError("chunk_size and top must be at least 1.")
+    start, end = day.isoformat(), (day + timedelta(days=1)).isoformat()
+    return {
+        "date": start,
+        "transactions": _transaction_report(storage, start, end, chunk_size),
+        "top_movers": _top_movers(storage, start, end, chunk_size, top),
+        "balances": _balance_report(storage, chunk_size, balance_bins),
+    }
+
+
+def write_json(report: dict, path: Path) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+def write_csv(report: dict, directory: Path) -> list[Path]:
+    """Write one CSV per report table into ``directory``; returns the paths written."""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    tables = {
+        "transactions": report["transactions"],
+        "top_movers": report["top_movers"],
+        "balances_by_type": report["balances"]["by_account_type"],
+        "balance_distribution": report["balances"]["distribution"],
+    }
+    written = []
+    for name, rows in tables.items():
+        path = directory / f"{report['date']}-{name}.csv"
+        with path.open("w", newline="", encoding="utf-8") as handle:
+            if rows:
+                writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows(rows)
+        written.append(path)
+    return written
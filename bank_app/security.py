@@ -1,33 +1,79 @@
 from __future__ import annotations
 
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable, Mapping
+
 from argon2 import PasswordHasher, Type
 from argon2 import exceptions as argon2_exceptions
 
 from .config import (
     ARGON2_HASH_LEN,
-    ARGON2_MEMORY_COST,
-    ARGON2_PARALLELISM,
+    ARGON2_OVERRIDES,
+    ARGON2_PROFILE,
+    ARGON2_PROFILES,
     ARGON2_SALT_LEN,
-    ARGON2_TIME_COST,
+    HASH_WORKERS,
 )
+from .metrics import metrics
 
-_hasher = PasswordHasher(
-    time_cost=ARGON2_TIME_COST,
-    memory_cost=ARGON2_MEMORY_COST,
-    parallelism=ARGON2_PARALLELISM,
-    hash_len=ARGON2_HASH_LEN,
-    salt_len=ARGON2_SALT_LEN,
-    type=Type.ID,
-)
+_ARGON2_PARAMETERS = ("time_cost", "memory_cost", "parallelism")
+
+
+def resolve_argon2_profile(
+    profile: str | Mapping[str, int],
+    overrides: Mapping[str, int] | None = None,
+) -> dict[str, int]:
+    """Return validated Argon2 cost parameters for a preset name or explicit mapping, plus overrides."""
+    if isinstance(profile, str):
+        try:
+            profile = ARGON2_PROFILES[profile]
+        except KeyError:
+            raise ValueError(f"Unknown Argon2 profile: {profile!r}.") from None
+
+    resolved = {key: int(value) for key, value in {**profile, **(overrides or {})}.items()}
+    unknown = set(resolved) - set(_ARGON2_PARAMETERS)
+    if unknown:
+        raise ValueError(f"Unsupported Argon2 setting: {sorted(unknown)[0]!r}.")
+    missing = set(_ARGON2_PARAMETERS) - set(resolved)
+    if missing:
+        raise ValueError(f"Missing Argon2 setting: {sorted(missing)[0]!r}.")
+    if resolved["time_cost"] < 1 or resolved["parallelism"] < 1:
+        raise ValueError("Argon2 time_cost and parallelism must be at least 1.")
+    if resolved["memory_cost"] < 8 * resolved["parallelism"]:
+        raise ValueError("Argon2 memory_cost must be at least 8 KiB per lane.")
+    return resolved
+
+
+def build_hasher(
+    profile: str | Mapping[str, int] = ARGON2_PROFILE,
+    overrides: Mapping[str, int] | None = None,
+) -> PasswordHasher:
+    params = resolve_argon2_profile(profile, overrides)
+    return PasswordHasher(
+        **params,
+        hash_len=ARGON2_HASH_LEN,
+        salt_len=ARGON2_SALT_LEN,
+        type=Type.ID,
+    )
+
+
+# Hashes made under an older profile still verify; verify_and_update re-hashes them on the next good login.
+_hasher = build_hasher(ARGON2_PROFILE, ARGON2_OVERRIDES)
 
 
 def hash_secret(secret: str) -> str:
-    return _hasher.hash(secret)
+    with metrics.timer("bank_argon2_seconds", op="hash"):
+        return _hasher.hash(secret)
 
 
 def verify_and_update(stored_hash: str, secret: str) -> tuple[bool, str | None]:
     try:
-        valid = _hasher.verify(stored_hash, secret)
+        with metrics.timer("bank_argon2_seconds", op="verify"):
+            valid = _hasher.verify(stored_hash, secret)
     except argon2_exceptions.VerifyMismatchError:
         return False, None
     except argon2_exceptions.VerificationError:
@@ -37,6 +83,73 @@ def verify_and_update(stored_hash: str, secret: str) -> tuple[bool, str | None]:
         return False, None
 
     if _hasher.check_needs_rehash(stored_hash):
-        return True, _hasher.hash(secret)
+        return True, hash_secret(secret)
 
     return True, None
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+@dataclass(frozen=True)
+class HashBatch:
+    hashes: list[str]
+    elapsed: float
+
+    @property
+    def hashes_per_second(self) -> float:
+        if not self.hashes or self.elapsed <= 0:
+            return 0.0
+        return len(self.hashes) / self.elapsed
+
+
+class BatchHasher:
+    """Hash many secrets in parallel on a process pool sized to the available cores.
+
+    Argon2 is CPU- and memory-bound, so bulk jobs (imports, PIN resets) spread
+    records over processes instead of hashing one at a time. Reuse one instance
+    for a whole job; worker processes start on first use.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS):
+        self.workers = workers if workers > 0 else available_cores()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def hash_many(self, secrets: Iterable[str]) -> HashBatch:
+        secrets = list(secrets)
+        start = time.perf_counter()
+        if self.workers == 1 or len(secrets) < 2:
+            hashes = [hash_secret(secret) for secret in secrets]
+        else:
+            if self._executor is None:
+                # spawn keeps workers clean of the parent's threads and open connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            chunksize = max(1, len(secrets) // (self.workers * 4))
+            hashes = list(self._executor.map(hash_secret, secrets, chunksize=chunksize))
+            if metrics.enabled:
+                # Worker processes keep their own registries, so record the batch's wall time here.
+                metrics.observe("bank_argon2_seconds", time.perf_counter() - start, op="hash_batch")
+        return HashBatch(hashes=hashes, elapsed=time.perf_counter() - start)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self) -> "BatchHasher":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def hash_secrets(secrets: Iterable[str], workers: int = HASH_WORKERS) -> HashBatch:
+    with BatchHasher(workers) as hasher:
+        return hasher.hash_many(secrets)
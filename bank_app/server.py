@@ -0,0 +1,418 @@
+from __future__ import annotations
+
+import argparse
+import hmac
+import json
+import logging
+import re
+import secrets
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+from .config import (
+    API_HOST,
+    API_MAX_BODY,
+    API_PORT,
+    API_REQUEST_TIMEOUT,
+    API_SESSION_TTL,
+    API_TOKEN,
+    API_WORKERS,
+    DB_PATH,
+)
+from .errors import AuthError, BusinessRuleError, ConflictError, NotFoundError, ServiceError, ValidationError
+from .metrics import metrics, start_configured_export
+from .services import CUSTOMER_FIELDS, BankService
+from .storage import Storage
+
+# Most specific first: ServiceError is the catch-all for anything the service rejects.
+ERROR_STATUS = (
+    (ValidationError, HTTPStatus.BAD_REQUEST),
+    (AuthError, HTTPStatus.UNAUTHORIZED),
+    (NotFoundError, HTTPStatus.NOT_FOUND),
+    (ConflictError, HTTPStatus.CONFLICT),
+    (BusinessRuleError, HTTPStatus.UNPROCESSABLE_ENTITY),
+    (ServiceError, HTTPStatus.BAD_REQUEST),
+)
+
+Response = tuple[HTTPStatus, object]
+
+logger = logging.getLogger(__name__)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+SESSION_HEADER = "X-Session-Token"
+
+# Who may call a route, on top of the API token. None: the API token alone. SESSION: any login.
+# ADMIN: an admin login. OWNER: the login of the customer whose account is in the path. ACCOUNT: OWNER or ADMIN.
+SESSION, ADMIN, OWNER, ACCOUNT = "session", "admin", "owner", "account"
+
+
+@dataclass(frozen=True)
+class Session:
+    role: str  # "admin" or "customer"
+    subject: str  # admin ID or account number
+    expires_at: float
+
+
+class SessionStore:
+    """Login sessions issued by the API, keyed by an unguessable token and held in memory.
+
+    Sessions end after ``ttl`` seconds, on logout, and when the server restarts.
+    """
+
+    def __init__(self, ttl: float = API_SESSION_TTL):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._sessions: dict[str, Session] = {}
+
+    def issue(self, role: str, subject: str) -> str:
+        token = secrets.token_urlsafe(32)
+        now = time.monotonic()
+        with self._lock:
+            # Sweep expired sessions here so the table cannot grow without bound.
+            for expired in [key for key, session in self._sessions.items() if session.expires_at <= now]:
+                del self._sessions[expired]
+            self._sessions[token] = Session(role, subject, now + self.ttl)
+        return token
+
+    def get(self, token: str | None) -> Session | None:
+        if not token:
+            return None
+        with self._lock:
+            session = self._sessions.get(token)
+            if session is not None and session.expires_at <= time.monotonic():
+                del self._sessions[token]
+                session = None
+        return session
+
+    def revoke(self, session: Session) -> None:
+        with self._lock:
+            for token in [key for key, value in self._sessions.items() if value is session]:
+                del self._sessions[token]
+
+    def revoke_subject(self, role: str, subject: str, keep: Session | None = None) -> None:
+        """End every session of one admin or customer, except ``keep``."""
+        with self._lock:
+            for token in [key for key, value in self._sessions.items()
+                          if value.role == role and value.subject == subject and value is not keep]:
+                del self._sessions[token]
+
+
+class BankAPI:
+    """Maps JSON requests onto BankService calls, independent of the HTTP plumbing.
+
+    Every request must carry ``Authorization: Bearer <token>``; the token identifies
+    the calling terminal or integration. Routes that read or move a customer's
+    money, or manage accounts, also need the ``X-Session-Token`` issued by a login
+    route, mirroring the logins the UI asks for: a customer session only reaches
+    its own account. Argon2-bound calls go through ``service.submit`` so
+    concurrent hashes stay capped at the credential worker count, however many
+    requests are in flight.
+    """
+
+    def __init__(self, service: BankService, token: str, sessions: SessionStore | None = None):
+        if not token:
+            raise ValueError("An API token is required.")
+        self.service = service
+        self.sessions = sessions or SessionStore()
+        self._token = token.encode()
+        account = r"/customers/(?P<account>[^/]+)"
+        self._routes: list[tuple[str, re.Pattern, str | None, Callable[..., Response]]] = [
+            ("GET", re.compile(r"/health"), None, self.health),
+            ("GET", re.compile(r"/metrics"), None, self.metrics),
+            ("POST", re.compile(r"/admins/login"), None, self.admin_login),
+            ("POST", re.compile(r"/customers/login"), None, self.customer_login),
+            ("POST", re.compile(r"/logout"), SESSION, self.logout),
+            ("POST", re.compile(r"/customers"), ADMIN, self.create_customer),
+            ("GET", re.compile(account), ACCOUNT, self.customer_summary),
+            ("DELETE", re.compile(account), ADMIN, self.delete_customer),
+            ("GET", re.compile(account + r"/balance"), ACCOUNT, self.balance),
+            ("POST", re.compile(account + r"/deposit"), OWNER, self.deposit),
+            ("POST", re.compile(account + r"/withdraw"), OWNER, self.withdraw),
+            ("POST", re.compile(account + r"/pin"), OWNER, self.change_pin),
+            ("GET", re.compile(account + r"/transactions"), ACCOUNT, self.transactions),
+            ("POST", re.compile(r"/transactions/batch"), ADMIN, self.post_batch),
+        ]
+
+    def authorized(self, header: str | None) -> bool:
+        scheme, _, token = (header or "").partition(" ")
+        return scheme.lower() == "bearer" and hmac.compare_digest(token.strip().encode(), self._token)
+
+    @staticmethod
+    def permits(access: str, caller: Session, account: str | None) -> bool:
+        if access == SESSION:
+            return True
+        if caller.role == "admin":
+            return access in (ADMIN, ACCOUNT)
+        return access in (OWNER, ACCOUNT) and caller.subject == account
+
+    def dispatch(
+        self,
+        method: str,
+        target: str,
+        authorization: str | None,
+        body: bytes,
+        session_token: str | None = None,
+    ) -> Response:
+        if not self.authorized(authorization):
+            return HTTPStatus.UNAUTHORIZED, {"error": "Missing or invalid API token."}
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        allowed = False
+        for route_method, pattern, access, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match is None:
+                continue
+            if route_method != method:
+                allowed = True
+                continue
+            caller = None
+            if access is not None:
+                caller = self.sessions.get(session_token)
+                if caller is None:
+                    return HTTPStatus.UNAUTHORIZED, {"error": f"Log in first and send the {SESSION_HEADER} header."}
+                if not self.permits(access, caller, match.groupdict().get("account")):
+                    return HTTPStatus.FORBIDDEN, {"error": "This login may not use this endpoint."}
+            try:
+                payload = json.loads(body) if body else {}
+            except (UnicodeDecodeError, json.JSONDecodeError):
+                return HTTPStatus.BAD_REQUEST, {"error": "Request body must be JSON."}
+            if not isinstance(payload, dict):
+                return HTTPStatus.BAD_REQUEST, {"error": "Request body must be a JSON object."}
+            query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            try:
+                return handler(payload=payload, query=query, caller=caller, **match.groupdict())
+            except ServiceError as exc:
+                status = next(status for error, status in ERROR_STATUS if isinstance(exc, error))
+                return status, {"error": str(exc)}
+            except Exception:
+                # A locked database, an exhausted pool or a bug: the client still gets a reply.
+                logger.exception("%s %s failed", method, path)
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "Internal server error."}
+        if allowed:
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "Method not allowed."}
+        return HTTPStatus.NOT_FOUND, {"error": "No such endpoint."}
+
+    def _credential_call(self, operation: Callable, *args, **kwargs):
+        return self.service.submit(operation, *args, **kwargs).result()
+
+    @staticmethod
+    def _field(payload: dict, name: str) -> str:
+        value = payload.get(name)
+        return "" if value is None else str(value)
+
+    def health(self, payload, query, caller) -> Response:
+        return HTTPStatus.OK, {"status": "ok"}
+
+    def metrics(self, payload, query, caller) -> Response:
+        # Prometheus text by default; ?format=json returns the same data as a snapshot.
+        if query.get("format") == "json":
+            return HTTPStatus.OK, metrics.snapshot()
+        return HTTPStatus.OK, metrics.to_prometheus()
+
+    def admin_login(self, payload, query, caller) -> Response:
+        admin_id = self._field(payload, "admin_id")
+        self._credential_call(self.service.require_admin_auth, admin_id, self._field(payload, "password"))
+        return HTTPStatus.OK, self._session_payload("admin", admin_id, admin_id=admin_id)
+
+    def customer_login(self, payload, query, caller) -> Response:
+        account_number = self._credential_call(
+            self.service.authenticate_customer_with_identifier,
+            self._field(payload, "identifier"),
+            self._field(payload, "pin"),
+        )
+        if account_number is None:
+            raise AuthError("Invalid customer credentials.")
+        return HTTPStatus.OK, self._session_payload("customer", account_number, account_number=account_number)
+
+    def _session_payload(self, role: str, subject: str, **identity) -> dict:
+        return {**identity, "session": self.sessions.issue(role, subject), "expires_in": self.sessions.ttl}
+
+    def logout(self, payload, query, caller) -> Response:
+        self.sessions.revoke(caller)
+        return HTTPStatus.NO_CONTENT, None
+
+    def create_customer(self, payload, query, caller) -> Response:
+        fields = {name: self._field(payload, name) for name in CUSTOMER_FIELDS}
+        self._credential_call(self.service.create_customer, **fields)
+        return HTTPStatus.CREATED, self.service.get_customer_summary(fields["account_number"])
+
+    def customer_summary(self, payload, query, caller, account) -> Response:
+        return HTTPStatus.OK, self.service.get_customer_summary(account)
+
+    def delete_customer(self, payload, query, caller, account) -> Response:
+        self.service.delete_customer(account)
+        self.sessions.revoke_subject("customer", account)
+        return HTTPStatus.NO_CONTENT, None
+
+    def balance(self, payload, query, caller, account) -> Response:
+        return HTTPStatus.OK, {"account_number": account, "balance": self.service.get_balance(account)}
+
+    def deposit(self, payload, query, caller, account) -> Response:
+        balance = self.service.deposit(account, self._field(payload, "amount"))
+        return HTTPStatus.OK, {"account_number": account, "balance": balance}
+
+    def withdraw(self, payload, query, caller, account) -> Response:
+        balance = self.service.withdraw(account, self._field(payload, "amount"))
+        return HTTPStatus.OK, {"account_number": account, "balance": balance}
+
+    def change_pin(self, payload, query, caller, account) -> Response:
+        self._credential_call(self.service.change_pin, account, self._field(payload, "pin"))
+        # Sessions opened with the old PIN end here; the one that changed it carries on.
+        self.sessions.revoke_subject("customer", account, keep=caller)
+        return HTTPStatus.NO_CONTENT, None
+
+    def transactions(self, payload, query, caller, account) -> Response:
+        try:
+            limit = int(query["limit"]) if "limit" in query else None
+            before_id = int(query["before_id"]) if "before_id" in query else None
+        except ValueError:
+            raise ValidationError("limit and before_id must be integers.") from None
+        options = {key: query[key] for key in ("tx_type", "start_date", "end_date") if key in query}
+        if limit is not None:
+            options["limit"] = limit
+        return HTTPStatus.OK, self.service.get_transactions(account, before_id=before_id, **options)
+
+    def post_batch(self, payload, query, caller) -> Response:
+        entries = payload.get("entries")
+        if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+            raise ValidationError("entries must be a list of objects.")
+        atomic = payload.get("atomic", True)
+        if not isinstance(atomic, bool):
+            raise ValidationError("atomic must be true or false.")
+        return HTTPStatus.OK, self.service.post_batch(entries, atomic=atomic)
+
+
+class BankRequestHandler(BaseHTTPRequestHandler):
+    server: "BankHTTPServer"
+    server_version = "BankApp"
+
+    def setup(self) -> None:
+        # Applied to the socket, so a client that stalls mid-request cannot hold a worker forever.
+        self.timeout = self.server.request_timeout
+        super().setup()
+
+    def _handle(self) -> None:
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            self._send(HTTPStatus.BAD_REQUEST, {"error": "Invalid Content-Length."})
+            return
+        if length > API_MAX_BODY:
+            self.close_connection = True
+            self._send(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": "Request body too large."})
+            return
+        try:
+            body = self.rfile.read(length) if length else b""
+        except TimeoutError:
+            self.close_connection = True
+            self._send(HTTPStatus.REQUEST_TIMEOUT, {"error": "Timed out reading the request body."})
+            return
+        authorization = self.headers.get("Authorization")
+        session_token = self.headers.get(SESSION_HEADER)
+        self._send(*self.server.api.dispatch(self.command, self.path, authorization, body, session_token))
+
+    def _send(self, status: HTTPStatus, payload: object) -> None:
+        # A str payload is plain text (the Prometheus exposition); anything else is JSON.
+        if isinstance(payload, str):
+            data, content_type = payload.encode(), PROMETHEUS_CONTENT_TYPE
+        else:
+            data, content_type = b"" if payload is None else json.dumps(payload).encode(), "application/json"
+        self.send_response(status)
+        if payload is not None:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle
+
+
+class BankHTTPServer(HTTPServer):
+    """HTTP server that handles each connection on a fixed-size worker pool.
+
+    Unlike ThreadingHTTPServer, the number of request threads is bounded; the
+    database pool is sized to match so every worker can hold a connection, and a
+    client that goes quiet for ``request_timeout`` seconds is dropped so it cannot
+    keep one of those workers.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        api: BankAPI,
+        workers: int = API_WORKERS,
+        request_timeout: float = API_REQUEST_TIMEOUT,
+    ):
+        super().__init__(address, BankRequestHandler)
+        self.api = api
+        self.request_timeout = request_timeout
+        self._workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bank-api")
+
+    def process_request(self, request, client_address) -> None:
+        self._workers.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._workers.shutdown(wait=True)
+
+
+def create_server(
+    service: BankService,
+    token: str,
+    host: str = API_HOST,
+    port: int = API_PORT,
+    workers: int = API_WORKERS,
+    request_timeout: float = API_REQUEST_TIMEOUT,
+) -> BankHTTPServer:
+    return BankHTTPServer((host, port), BankAPI(service, token), workers, request_timeout)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m bank_app serve",
+        description="Serve BankService as JSON over HTTP.",
+    )
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS, help="request threads and pooled connections")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="SQLite database file")
+    args = parser.parse_args(argv)
+    if not API_TOKEN:
+        parser.error("set BANKAPP_API_TOKEN to the bearer token clients must send")
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    service = BankService(Storage(args.db, pool_size=args.workers))
+    server = create_server(service, API_TOKEN, args.host, args.port, args.workers)
+    stop_export = start_configured_export()
+    print(f"Serving on http://{args.host}:{server.server_port} with {args.workers} workers", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+        if stop_export is not None:
+            stop_export()
@@ -1,19 +1,30 @@
 from __future__ import annotations
 
-from datetime import date
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+from typing import Callable, Iterable, Mapping, TypeVar
 
 from .config import (
     BOOTSTRAP_ADMIN_ID,
     BOOTSTRAP_ADMIN_PASSWORD,
-    DATE_FORMAT,
+    CREDENTIAL_WORKERS,
+    DIRECTORY_PAGE_SIZE,
+    LEDGER_WRITER,
+    MAX_DIRECTORY_PAGE_SIZE,
+    MAX_STATEMENT_PAGE_SIZE,
     MAX_TRANSACTION,
     MIN_BALANCE,
     PROTECTED_ADMIN_IDS,
+    STATEMENT_PAGE_SIZE,
 )
-from .errors import AuthError, BusinessRuleError, ConflictError, NotFoundError, ValidationError
-from .security import hash_secret, verify_and_update
-from .storage import Storage
+from .errors import AuthError, BusinessRuleError, ConflictError, NotFoundError, ServiceError, ValidationError
+from .ledger import LedgerWriter
+from .metrics import instrument
+from .security import BatchHasher, hash_secret, verify_and_update
+from .storage import DIRECTORY_FIELDS, Storage, now_timestamp
 from .validation import (
+    parse_date,
     require_non_empty,
     validate_account_number,
     validate_account_type,
@@ -23,6 +34,24 @@ from .validation import (
     validate_mobile,
     validate_pin,
     validate_password,
+    validate_tx_type,
+)
+
+
+T = TypeVar("T")
+
+# Field names accepted by create_customer and by each record passed to import_customers.
+CUSTOMER_FIELDS = (
+    "account_number",
+    "name",
+    "account_type",
+    "date_of_birth",
+    "mobile",
+    "gender",
+    "nationality",
+    "kyc_document",
+    "pin",
+    "initial_balance",
 )
 
 
@@ -33,16 +62,50 @@ def _normalize_gender(gender: str) -> str:
     return gender
 
 
+@instrument("submit", "close")
 class BankService:
-    def __init__(self, storage: Storage):
+    def __init__(
+        self,
+        storage: Storage,
+        credential_workers: int = CREDENTIAL_WORKERS,
+        ledger_writer: bool = LEDGER_WRITER,
+    ):
         self.storage = storage
+        self._credential_workers = credential_workers
+        self._credential_executor: ThreadPoolExecutor | None = None
+        self._executor_lock = threading.Lock()
         self.storage.init_db()
         self._bootstrap_admin()
+        # Started after init_db so the writer thread never races schema migrations.
+        self.ledger: LedgerWriter | None = LedgerWriter(storage) if ledger_writer else None
 
     @classmethod
     def create_default(cls, db_path) -> "BankService":
         return cls(Storage(db_path))
 
+    def submit(self, operation: Callable[..., T], *args, **kwargs) -> Future[T]:
+        """Run a credential (Argon2-bound) call on the service's worker threads.
+
+        Interactive callers use this to keep their own thread free while a hash
+        or verify runs; errors surface from ``Future.result()`` unchanged.
+        """
+        with self._executor_lock:
+            if self._credential_executor is None:
+                self._credential_executor = ThreadPoolExecutor(
+                    max_workers=self._credential_workers,
+                    thread_name_prefix="bank-credentials",
+                )
+            return self._credential_executor.submit(operation, *args, **kwargs)
+
+    def close(self) -> None:
+        with self._executor_lock:
+            if self._credential_executor is not None:
+                self._credential_executor.shutdown(wait=True, cancel_futures=True)
+                self._credential_executor = None
+        if self.ledger is not None:
+            self.ledger.close()
+        self.storage.close()
+
     def _bootstrap_admin(self) -> None:
         if self.storage.admin_exists():
             return
@@ -84,31 +147,30 @@ class BankService:
         account_number = validate_account_number(account_number)
         return self.storage.customer_exists(account_number)
 
-    def _get_customer_account_number_for_identifier(self, identifier: str) -> str | None:
+    def _resolve_customer_identifier(self, identifier: str) -> tuple[str, str] | None:
+        """Resolve an account number, mobile or name to ``(account_number, pin_hash)``.
+
+        Precedence is account number, then mobile, then case-insensitive name; the
+        first tier with a match wins. Identifiers that fail a tier's validation skip
+        that tier. All tiers are checked in a single query.
+        """
         identifier = require_non_empty(identifier, "Identifier")
-        account_candidate = None
         try:
             account_candidate = validate_account_number(identifier)
         except ValidationError:
             account_candidate = None
-        if account_candidate and self.storage.get_customer(account_candidate):
-            return account_candidate
-
-        mobile_candidate = None
         try:
             mobile_candidate = validate_mobile(identifier)
         except ValidationError:
             mobile_candidate = None
-        if mobile_candidate:
-            customer = self.storage.get_customer_by_mobile(mobile_candidate)
-            if customer is not None:
-                return customer["account_number"]
-
-        customer = self.storage.get_customer_by_name(identifier)
-        if customer is not None:
-            return customer["account_number"]
+        row = self.storage.resolve_customer(account_candidate, mobile_candidate, identifier)
+        if row is None:
+            return None
+        return row["account_number"], row["pin_hash"]
 
-        return None
+    def _get_customer_account_number_for_identifier(self, identifier: str) -> str | None:
+        resolved = self._resolve_customer_identifier(identifier)
+        return resolved[0] if resolved else None
 
     def create_customer(
         self,
@@ -123,36 +185,173 @@ class BankService:
         pin: str,
         initial_balance: str,
     ) -> None:
-        account_number = validate_account_number(account_number)
-        name = require_non_empty(name, "Name")
-        account_type = validate_account_type(account_type)
-        date_of_birth = validate_date_of_birth(date_of_birth)
-        mobile = validate_mobile(mobile)
-        gender = _normalize_gender(gender)
-        nationality = require_non_empty(nationality, "Nationality")
-        kyc_document = require_non_empty(kyc_document, "KYC document")
-        pin = validate_pin(pin)
-        balance = validate_amount(initial_balance)
-
-        if self.storage.customer_exists(account_number):
+        customer = self._validate_customer(
+            {
+                "account_number": account_number,
+                "name": name,
+                "account_type": account_type,
+                "date_of_birth": date_of_birth,
+                "mobile": mobile,
+                "gender": gender,
+                "nationality": nationality,
+                "kyc_document": kyc_document,
+                "pin": pin,
+                "initial_balance": initial_balance,
+            }
+        )
+        if self.storage.customer_exists(customer["account_number"]):
             raise ConflictError("Account number is already allocated.")
+        self._check_initial_balance(customer["balance"])
+
+        pin = customer.pop("pin")
+        self.storage.create_customer(pin_hash=hash_secret(pin), created_at=now_timestamp(), **customer)
+
+    @staticmethod
+    def _validate_customer(record: Mapping[str, str]) -> dict:
+        """Validate a new-customer record; returns storage-ready fields plus the plain ``pin``."""
+        return {
+            "account_number": validate_account_number(record.get("account_number")),
+            "name": require_non_empty(record.get("name"), "Name"),
+            "account_type": validate_account_type(record.get("account_type")),
+            "date_of_birth": validate_date_of_birth(record.get("date_of_birth")),
+            "mobile": validate_mobile(record.get("mobile")),
+            "gender": _normalize_gender(record.get("gender")),
+            "nationality": require_non_empty(record.get("nationality"), "Nationality"),
+            "kyc_document": require_non_empty(record.get("kyc_document"), "KYC document"),
+            "pin": validate_pin(record.get("pin")),
+            "balance": validate_amount(record.get("initial_balance")),
+        }
+
+    @staticmethod
+    def _check_initial_balance(balance: int) -> None:
         if balance < MIN_BALANCE:
             raise BusinessRuleError(f"Initial balance must be at least {MIN_BALANCE}.")
 
-        today = date.today().strftime(DATE_FORMAT)
-        self.storage.create_customer(
-            account_number=account_number,
-            pin_hash=hash_secret(pin),
-            balance=balance,
-            created_at=today,
-            name=name,
-            account_type=account_type,
-            date_of_birth=date_of_birth,
-            mobile=mobile,
-            gender=gender,
-            nationality=nationality,
-            kyc_document=kyc_document,
+    def _hash_many(self, secrets: list[str], hasher: BatchHasher | None):
+        if hasher is not None:
+            return hasher.hash_many(secrets)
+        with BatchHasher() as temporary:
+            return temporary.hash_many(secrets)
+
+    def import_customers(
+        self,
+        records: Iterable[Mapping[str, str]],
+        hasher: BatchHasher | None = None,
+        dry_run: bool = False,
+    ) -> dict:
+        """Validate, hash and insert many customers at once.
+
+        PINs are hashed in parallel on ``hasher`` (a temporary pool when omitted) and
+        all accepted rows go in with one transaction. Invalid or duplicate records
+        are skipped, never raised; each skip is reported with its reason. With
+        ``dry_run`` nothing is hashed or written and ``imported`` lists the records
+        that would have been.
+        """
+        accepted: list[dict] = []
+        skipped: list[tuple[str, str]] = []
+        seen: set[str] = set()
+        for record in records:
+            label = str(record.get("account_number") or "").strip()
+            try:
+                customer = self._validate_customer(record)
+                self._check_initial_balance(customer["balance"])
+                if customer["account_number"] in seen:
+                    raise ConflictError("Account number appears more than once in the batch.")
+            except ServiceError as exc:
+                skipped.append((label, str(exc)))
+                continue
+            seen.add(customer["account_number"])
+            accepted.append(customer)
+
+        taken = self.storage.existing_accounts([customer["account_number"] for customer in accepted])
+        skipped.extend(
+            (customer["account_number"], "Account number is already allocated.")
+            for customer in accepted
+            if customer["account_number"] in taken
         )
+        accepted = [customer for customer in accepted if customer["account_number"] not in taken]
+        if dry_run:
+            imported = [customer["account_number"] for customer in accepted]
+            return {"imported": imported, "skipped": skipped, "hashes_per_second": 0.0}
+
+        batch = self._hash_many([customer.pop("pin") for customer in accepted], hasher)
+        created_at = now_timestamp()
+        for customer, pin_hash in zip(accepted, batch.hashes):
+            customer["pin_hash"] = pin_hash
+            customer["created_at"] = created_at
+        raced = set(self.storage.create_customers(accepted))
+        skipped.extend((account_number, "Account number is already allocated.") for account_number in sorted(raced))
+        imported = [customer["account_number"] for customer in accepted if customer["account_number"] not in raced]
+        return {
+            "imported": imported,
+            "skipped": skipped,
+            "hashes_per_second": batch.hashes_per_second,
+        }
+
+    def import_admins(
+        self,
+        records: Iterable[tuple[str, str]],
+        hasher: BatchHasher | None = None,
+        dry_run: bool = False,
+    ) -> dict:
+        """Bulk counterpart of create_admin; same reporting shape and dry-run as import_customers."""
+        accepted: list[tuple[str, str]] = []
+        skipped: list[tuple[str, str]] = []
+        seen: set[str] = set()
+        for admin_id, password in records:
+            label = str(admin_id or "").strip()
+            try:
+                admin_id = validate_admin_id(admin_id)
+                password = validate_password(password, "Password")
+                if admin_id in seen:
+                    raise ConflictError("Admin ID appears more than once in the batch.")
+            except ServiceError as exc:
+                skipped.append((label, str(exc)))
+                continue
+            seen.add(admin_id)
+            accepted.append((admin_id, password))
+
+        if dry_run:
+            taken = self.storage.existing_admins([admin_id for admin_id, _ in accepted])
+            skipped.extend((admin_id, "Admin ID is already in use.") for admin_id, _ in accepted if admin_id in taken)
+            imported = [admin_id for admin_id, _ in accepted if admin_id not in taken]
+            return {"imported": imported, "skipped": skipped, "hashes_per_second": 0.0}
+
+        batch = self._hash_many([password for _, password in accepted], hasher)
+        rows = [(admin_id, password_hash) for (admin_id, _), password_hash in zip(accepted, batch.hashes)]
+        taken = set(self.storage.create_admins(rows))
+        skipped.extend((admin_id, "Admin ID is already in use.") for admin_id, _ in accepted if admin_id in taken)
+        return {
+            "imported": [admin_id for admin_id, _ in accepted if admin_id not in taken],
+            "skipped": skipped,
+            "hashes_per_second": batch.hashes_per_second,
+        }
+
+    def reset_pins(self, pins: Mapping[str, str], hasher: BatchHasher | None = None) -> dict:
+        """Set new PINs for many accounts, hashing them in parallel."""
+        accepted: list[tuple[str, str]] = []
+        skipped: list[tuple[str, str]] = []
+        for account_number, pin in pins.items():
+            try:
+                accepted.append((validate_account_number(account_number), validate_pin(pin)))
+            except ServiceError as exc:
+                skipped.append((str(account_number), str(exc)))
+
+        known = self.storage.existing_accounts([account_number for account_number, _ in accepted])
+        skipped.extend(
+            (account_number, "Account not found.") for account_number, _ in accepted if account_number not in known
+        )
+        accepted = [(account_number, pin) for account_number, pin in accepted if account_number in known]
+
+        batch = self._hash_many([pin for _, pin in accepted], hasher)
+        self.storage.update_customer_pins(
+            [(account_number, pin_hash) for (account_number, _), pin_hash in zip(accepted, batch.hashes)]
+        )
+        return {
+            "updated": [account_number for account_number, _ in accepted],
+            "skipped": skipped,
+            "hashes_per_second": batch.hashes_per_second,
+        }
 
     def authenticate_customer(self, account_number: str, pin: str) -> bool:
         account_number = validate_account_number(account_number)
@@ -160,16 +359,21 @@ class BankService:
         customer = self.storage.get_customer(account_number)
         if customer is None:
             return False
-        valid, new_hash = verify_and_update(customer["pin_hash"], pin)
+        return self._verify_customer_pin(account_number, customer["pin_hash"], pin)
+
+    def _verify_customer_pin(self, account_number: str, pin_hash: str, pin: str) -> bool:
+        valid, new_hash = verify_and_update(pin_hash, pin)
         if valid and new_hash:
             self.storage.update_customer_pin(account_number, new_hash)
         return valid
 
     def authenticate_customer_with_identifier(self, identifier: str, pin: str) -> str | None:
-        account_number = self._get_customer_account_number_for_identifier(identifier)
-        if account_number is None:
+        pin = require_non_empty(pin, "PIN")
+        resolved = self._resolve_customer_identifier(identifier)
+        if resolved is None:
             return None
-        if self.authenticate_customer(account_number, pin):
+        account_number, pin_hash = resolved
+        if self._verify_customer_pin(account_number, pin_hash, pin):
             return account_number
         return None
 
@@ -211,35 +415,265 @@ class BankService:
             "kyc_document": customer["kyc_document"],
         }
 
+    def search_customers(
+        self,
+        query: str = "",
+        field: str = "name",
+        limit: int = DIRECTORY_PAGE_SIZE,
+        after: tuple[str, str] | list[str] | None = None,
+        before: tuple[str, str] | list[str] | None = None,
+    ) -> dict:
+        """Return one page of the customer directory, ordered by ``field``.
+
+        ``query`` is a prefix of ``field`` (``name``, case-insensitive; ``mobile``;
+        or ``account_number``). Every item carries a ``cursor``; pass the last
+        item's as ``after`` for the next page or the first item's as ``before`` for
+        the previous one. ``has_more`` says whether more rows exist in that direction.
+        """
+        if field not in DIRECTORY_FIELDS:
+            raise ValidationError(f"Search field must be one of: {', '.join(DIRECTORY_FIELDS)}.")
+        if not 1 <= limit <= MAX_DIRECTORY_PAGE_SIZE:
+            raise ValidationError(f"Page size must be between 1 and {MAX_DIRECTORY_PAGE_SIZE}.")
+        if after is not None and before is not None:
+            raise ValidationError("Page forwards or backwards, not both.")
+        cursors = []
+        for cursor in (after, before):
+            if cursor is not None:
+                if len(cursor) != 2:
+                    raise ValidationError("Cursor must be a [value, account_number] pair.")
+                cursor = (str(cursor[0]), str(cursor[1]))
+            cursors.append(cursor)
+        rows = self.storage.search_customers(field, (query or "").strip(), limit + 1, *cursors)
+        has_more = len(rows) > limit
+        if has_more:
+            # The extra row sits beyond the page: at the end going forwards, at the start going backwards.
+            rows = rows[1:] if before is not None else rows[:limit]
+        return {
+            "items": [
+                {
+                    "account_number": row["account_number"],
+                    "name": row["name"],
+                    "mobile": row["mobile"],
+                    "account_type": row["account_type"],
+                    "balance": int(row["balance"]),
+                    "cursor": [row[field], row["account_number"]],
+                }
+                for row in rows
+            ],
+            "has_more": has_more,
+        }
+
+    def get_transactions(
+        self,
+        account_number: str,
+        limit: int = STATEMENT_PAGE_SIZE,
+        before_id: int | None = None,
+        tx_type: str | None = None,
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> dict:
+        """Return one page of the account's ledger, newest first.
+
+        Pass the returned ``next_before_id`` back as ``before_id`` to fetch the
+        next (older) page; it is ``None`` once the ledger is exhausted.
+        """
+        account_number = validate_account_number(account_number)
+        if not 1 <= limit <= MAX_STATEMENT_PAGE_SIZE:
+            raise ValidationError(f"Page size must be between 1 and {MAX_STATEMENT_PAGE_SIZE}.")
+        if tx_type is not None:
+            tx_type = validate_tx_type(tx_type)
+        start = parse_date(start_date, "Start date").value if start_date else None
+        end = parse_date(end_date, "End date").value if end_date else None
+        if start and end and start > end:
+            raise ValidationError("Start date must not be after end date.")
+
+        rows = self.storage.list_transactions(
+            account_number,
+            limit + 1,
+            before_id=before_id,
+            tx_type=tx_type,
+            start_date=start,
+            end_date=end,
+        )
+        if not rows and not self.storage.customer_exists(account_number):
+            raise NotFoundError("Account not found.")
+        items = [
+            {
+                "id": row["id"],
+                "amount": int(row["amount"]),
+                "tx_type": row["tx_type"],
+                "balance_after": int(row["balance_after"]),
+                "created_at": row["created_at"],
+            }
+            for row in rows[:limit]
+        ]
+        next_before_id = items[-1]["id"] if len(rows) > limit else None
+        return {"items": items, "next_before_id": next_before_id}
+
+    def _change_balance(
+        self,
+        account_number: str,
+        delta: int,
+        tx_type: str,
+        min_balance: int | None = None,
+    ) -> int | None:
+        if self.ledger is not None:
+            return self.ledger.submit(account_number, delta, tx_type, min_balance).result()
+        return self.storage.update_balance_with_transaction(account_number, delta, tx_type, min_balance)
+
     def deposit(self, account_number: str, amount: str) -> int:
         account_number = validate_account_number(account_number)
         amount_value = validate_amount(amount)
         if amount_value > MAX_TRANSACTION:
             raise BusinessRuleError("Limit exceeded.")
-        if not self.storage.customer_exists(account_number):
-            raise NotFoundError("Account not found.")
-        new_balance = self.storage.update_balance_with_transaction(
-            account_number, amount_value, "deposit"
-        )
-        return new_balance
+        try:
+            return self._change_balance(account_number, amount_value, "deposit")
+        except ValueError as exc:
+            raise NotFoundError("Account not found.") from exc
 
     def withdraw(self, account_number: str, amount: str) -> int:
         account_number = validate_account_number(account_number)
         amount_value = validate_amount(amount)
         if amount_value > MAX_TRANSACTION:
             raise BusinessRuleError("Limit exceeded.")
-        customer = self.storage.get_customer(account_number)
-        if customer is None:
-            raise NotFoundError("Account not found.")
-        current_balance = int(customer["balance"])
-        new_balance = current_balance - amount_value
-        if new_balance < MIN_BALANCE:
+        try:
+            new_balance = self._change_balance(account_number, -amount_value, "withdraw", min_balance=MIN_BALANCE)
+        except ValueError as exc:
+            raise NotFoundError("Account not found.") from exc
+        if new_balance is None:
             raise BusinessRuleError("Minimum balance requirement not met.")
-        new_balance = self.storage.update_balance_with_transaction(
-            account_number, -amount_value, "withdraw"
-        )
         return new_balance
 
+    def post_batch(self, entries: Iterable[Mapping[str, str]], atomic: bool = True) -> dict:
+        """Post many deposits/withdrawals in a single transaction.
+
+        Each entry is a mapping with ``account_number``, ``tx_type`` (``deposit`` or
+        ``withdraw``) and ``amount``; the same rules as deposit/withdraw apply per
+        entry. Every entry gets a result with ``status`` ``applied``, ``failed``
+        (with ``error``) or ``skipped`` (valid, but an atomic batch was rolled back).
+        With ``atomic=False`` the valid entries are committed and failures reported.
+        """
+        results: list[dict] = []
+        postings: list[tuple[str, int, str]] = []
+        posted: list[dict] = []
+        for index, entry in enumerate(entries):
+            result = {
+                "index": index,
+                "account_number": str(entry.get("account_number") or "").strip(),
+                "tx_type": entry.get("tx_type"),
+                "amount": entry.get("amount"),
+                "status": "failed",
+                "balance_after": None,
+                "error": None,
+            }
+            results.append(result)
+            try:
+                account_number = validate_account_number(entry.get("account_number"))
+                tx_type = validate_tx_type(entry.get("tx_type"))
+                if tx_type not in {"deposit", "withdraw"}:
+                    raise ValidationError("Only deposits and withdrawals can be posted.")
+                amount = entry.get("amount")
+                # Only a missing amount is empty; JSON 0, 0.0 and false are amounts, and wrong ones.
+                amount_value = validate_amount("" if amount is None else str(amount))
+                if amount_value == 0:
+                    raise ValidationError("Amount must be a positive whole number.")
+                if amount_value > MAX_TRANSACTION:
+                    raise BusinessRuleError("Limit exceeded.")
+            except ServiceError as exc:
+                result["error"] = str(exc)
+                continue
+            result.update(account_number=account_number, tx_type=tx_type, amount=amount_value)
+            postings.append((account_number, amount_value if tx_type == "deposit" else -amount_value, tx_type))
+            posted.append(result)
+
+        invalid = len(posted) < len(results)
+        if postings and not (atomic and invalid):
+            outcomes = self.storage.post_transactions(postings, min_balance=MIN_BALANCE, atomic=atomic)
+        else:
+            outcomes = [("ok", None)] * len(postings)
+        failed = invalid or any(status != "ok" for status, _ in outcomes)
+        committed = bool(postings) and not (atomic and failed)
+
+        for result, (status, balance_after) in zip(posted, outcomes):
+            if status == "not_found":
+                result["error"] = "Account not found."
+            elif status == "min_balance":
+                result["error"] = "Minimum balance requirement not met."
+            elif committed:
+                result.update(status="applied", balance_after=balance_after)
+            else:
+                result["status"] = "skipped"
+        return {
+            "committed": committed,
+            "applied": sum(1 for result in results if result["status"] == "applied"),
+            "failed": sum(1 for result in results if result["status"] == "failed"),
+            "results": results,
+        }
+
+    @staticmethod
+    def _date_range(start_date: str, end_date: str):
+        start = parse_date(start_date, "Start date").value
+        end = parse_date(end_date, "End date").value
+        if start > end:
+            raise ValidationError("Start date must not be after end date.")
+        return start, end
+
+    def get_balance_on(self, account_number: str, on_date: str) -> dict:
+        """Closing balance on a past date, read from the daily snapshots (``None`` before the account opened)."""
+        account_number = validate_account_number(account_number)
+        day = parse_date(on_date, "Date").value
+        if not self.storage.customer_exists(account_number):
+            raise NotFoundError("Account not found.")
+        return {
+            "account_number": account_number,
+            "date": day.isoformat(),
+            "balance": self.storage.balance_on(account_number, day),
+        }
+
+    def get_balance_history(self, account_number: str, start_date: str, end_date: str) -> dict:
+        """Closing balance before ``start_date`` plus one item per day in the range on which it changed."""
+        account_number = validate_account_number(account_number)
+        start, end = self._date_range(start_date, end_date)
+        if not self.storage.customer_exists(account_number):
+            raise NotFoundError("Account not found.")
+        return {
+            "account_number": account_number,
+            "opening_balance": self.storage.balance_on(account_number, start - timedelta(days=1)),
+            "items": [
+                {"date": row["day"], "closing_balance": int(row["closing_balance"])}
+                for row in self.storage.list_daily_balances(account_number, start, end)
+            ],
+        }
+
+    def get_period_totals(self, start_date: str, end_date: str) -> dict:
+        """Bank-wide report for a period: balances held at either end, money in and out, and per-day rows."""
+        start, end = self._date_range(start_date, end_date)
+        days = [
+            {
+                "date": row["day"],
+                "credits": int(row["credits"]),
+                "debits": int(row["debits"]),
+                "tx_count": int(row["tx_count"]),
+                "closing_total": int(row["closing_balance"]),
+            }
+            for row in self.storage.list_daily_totals(start, end)
+        ]
+        opening_total = self.storage.total_on(start - timedelta(days=1))
+        return {
+            "start_date": start.isoformat(),
+            "end_date": end.isoformat(),
+            "opening_total": opening_total,
+            "closing_total": days[-1]["closing_total"] if days else opening_total,
+            "credits": sum(day["credits"] for day in days),
+            "debits": sum(day["debits"] for day in days),
+            "tx_count": sum(day["tx_count"] for day in days),
+            "days": days,
+        }
+
+    def rebuild_snapshots(self) -> int:
+        """Recompute the daily snapshots from the ledger; returns the number of account-day rows."""
+        return self.storage.rebuild_snapshots()
+
     def require_admin_auth(self, admin_id: str, password: str) -> None:
         if not self.authenticate_admin(admin_id, password):
             raise AuthError("Invalid admin credentials.")
@@ -1,10 +1,24 @@
 from __future__ import annotations
 
 import sqlite3
-from datetime import datetime
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from typing import Callable, Iterator, Mapping
 
-from .config import DATE_FORMAT
+from .cache import LRUCache
+from .config import (
+    CUSTOMER_CACHE_SIZE,
+    CUSTOMER_CACHE_TTL,
+    DB_POOL_SIZE,
+    DEBIT_TX_TYPES,
+    SQL_PROFILE,
+    SQLITE_PROFILE,
+    TIMESTAMP_MIGRATION_BATCH,
+)
+from .metrics import metrics
+from .pool import ConnectionPool
+from .profiler import SQLProfiler
 
 SCHEMA = """
 CREATE TABLE IF NOT EXISTS admins (
@@ -39,21 +53,285 @@ CREATE TABLE IF NOT EXISTS transactions (
 );
 """
 
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_customers_mobile ON customers(mobile);
+CREATE INDEX IF NOT EXISTS idx_customers_name_nocase ON customers(name COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_transactions_account_id ON transactions(account_number, id);
+"""
+
+# The directory pages through customers in (field, account_number) order, so each searchable field gets an
+# index ending in account_number. The mobile and name indexes are rebuilt in that shape; equality lookups on
+# their leading column keep working.
+_DIRECTORY_INDEXES = """
+DROP INDEX IF EXISTS idx_customers_mobile;
+CREATE INDEX idx_customers_mobile ON customers(mobile, account_number);
+DROP INDEX IF EXISTS idx_customers_name_nocase;
+CREATE INDEX idx_customers_name_nocase ON customers(name COLLATE NOCASE, account_number);
+"""
+
+# Closing balances per account and day, and bank-wide totals per day, kept up to date by every write that
+# moves money so historical balances and period reports never replay the ledger. `day` is YYYY-MM-DD.
+_SNAPSHOTS = """
+CREATE TABLE IF NOT EXISTS daily_balances (
+    account_number TEXT NOT NULL,
+    day TEXT NOT NULL,
+    closing_balance INTEGER NOT NULL,
+    PRIMARY KEY (account_number, day),
+    FOREIGN KEY(account_number) REFERENCES customers(account_number) ON DELETE CASCADE
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS daily_totals (
+    day TEXT PRIMARY KEY,
+    credits INTEGER NOT NULL,
+    debits INTEGER NOT NULL,
+    tx_count INTEGER NOT NULL,
+    closing_balance INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# One row per interest period (YYYY-MM). last_account is the checkpoint: every Savings account up to it
+# has been credited, and it advances in the same transaction as the postings it covers.
+_INTEREST_RUNS = """
+CREATE TABLE IF NOT EXISTS interest_runs (
+    period TEXT PRIMARY KEY,
+    rate_bps INTEGER NOT NULL,
+    last_account TEXT NOT NULL,
+    accounts INTEGER NOT NULL,
+    total INTEGER NOT NULL,
+    started_at TEXT NOT NULL,
+    completed_at TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_customers_type_account ON customers(account_type, account_number);
+"""
+
+# End-of-day reports and period queries select one day of the ledger by created_at.
+_LEDGER_DAY_INDEX = """
+CREATE INDEX IF NOT EXISTS idx_transactions_created_at ON transactions(created_at);
+"""
+
+# Rows written before timestamps moved to ISO-8601 hold a bare DD/MM/YYYY date.
+_LEGACY_DATE_GLOB = "[0-9][0-9]/[0-9][0-9]/[0-9][0-9][0-9][0-9]"
+_LEGACY_TO_ISO = (
+    "substr(created_at, 7, 4) || '-' || substr(created_at, 4, 2) || '-' || substr(created_at, 1, 2)"
+    " || 'T00:00:00.000000'"
+)
+
+
+# Schema migrations, applied in order; PRAGMA user_version records how many have run.
+# A string is a DDL script run in one transaction together with the version bump (statements are split on
+# ';', so keep semicolons out of literals). A callable receives the Storage and manages its own transactions;
+# it must be safe to re-run, since an interrupted run is retried on the next start.
+# Only ever append: released databases already carry the earlier version numbers.
+MIGRATIONS: tuple[str | Callable[["Storage"], object], ...] = (
+    SCHEMA,  # 1: base tables; IF NOT EXISTS lets unversioned databases adopt it
+    _INDEXES,  # 2: login and statement indexes
+    lambda storage: storage.migrate_legacy_timestamps(),  # 3: DD/MM/YYYY created_at -> ISO-8601
+    _DIRECTORY_INDEXES,  # 4: (field, account_number) indexes for the customer directory
+    _SNAPSHOTS,  # 5: daily balance and totals snapshot tables
+    lambda storage: storage.rebuild_snapshots(),  # 6: fill the snapshots from the existing ledger
+    _INTEREST_RUNS,  # 7: interest accrual checkpoints
+    _LEDGER_DAY_INDEX,  # 8: created_at index for per-day ledger reads
+)
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+# Sort key per directory field; name sorts and matches case-insensitively like the name login.
+DIRECTORY_FIELDS = {
+    "account_number": "account_number",
+    "mobile": "mobile",
+    "name": "name COLLATE NOCASE",
+}
+DIRECTORY_COLUMNS = ("account_number", "name", "mobile", "account_type", "balance")
+
+
+def _prefix_bounds(prefix: str) -> tuple[str, str]:
+    """Half-open [low, high) range holding every string that starts with ``prefix``.
+
+    A range keeps the search on the field's index, which LIKE 'prefix%' would not.
+    """
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+def now_timestamp() -> str:
+    """Current local time as sortable ISO-8601 text with microseconds."""
+    return datetime.now().isoformat(timespec="microseconds")
+
+
+CUSTOMER_COLUMNS = (
+    "account_number",
+    "pin_hash",
+    "balance",
+    "created_at",
+    "name",
+    "account_type",
+    "date_of_birth",
+    "mobile",
+    "gender",
+    "nationality",
+    "kyc_document",
+)
+_INSERT_CUSTOMER_SQL = (
+    f"INSERT INTO customers ({', '.join(CUSTOMER_COLUMNS)}) VALUES ({', '.join('?' * len(CUSTOMER_COLUMNS))})"
+)
+# Stay well below SQLite's bound-parameter limit when expanding IN (...) lists.
+_IN_CHUNK = 500
+
+CUSTOMER_BY_MOBILE_SQL = "SELECT * FROM customers WHERE mobile = ?"
+CUSTOMER_BY_NAME_SQL = "SELECT * FROM customers WHERE name = ? COLLATE NOCASE LIMIT 1"
+
+# One round trip for customer login: each branch is a primary-key or index lookup, and the
+# rank column encodes precedence (account number, then mobile, then name). A NULL parameter
+# disables its branch. Ties within a rank go to the lowest account number.
+RESOLVE_CUSTOMER_SQL = """
+SELECT account_number, pin_hash FROM (
+    SELECT 1 AS rank, account_number, pin_hash FROM customers WHERE account_number = :account_number
+    UNION ALL
+    SELECT 2, account_number, pin_hash FROM customers WHERE mobile = :mobile
+    UNION ALL
+    SELECT 3, account_number, pin_hash FROM customers WHERE name = :name COLLATE NOCASE
+)
+ORDER BY rank, account_number
+LIMIT 1
+"""
+
+# The next chunk of an interest run. Walks (account_type, account_number) from the checkpoint
+# along idx_customers_type_account, so each chunk is an index seek rather than a scan or sort.
+# Interest is paid on the balance at the close of the period, read from the daily_balances
+# snapshot (a primary-key seek per account), not on the balance when the run happens to go.
+# Accounts opened after the period have no snapshot by then and earn nothing.
+INTEREST_CHUNK_SQL = """
+SELECT account_number, balance,
+       max(coalesce((
+           SELECT closing_balance FROM daily_balances
+           WHERE daily_balances.account_number = customers.account_number AND day <= :period_end
+           ORDER BY day DESC
+           LIMIT 1
+       ), 0), 0) * :rate_bps / 120000 AS interest
+FROM customers
+WHERE account_type = :account_type AND account_number > :after
+ORDER BY account_number
+LIMIT :limit
+"""
+
+
+_UPSERT_DAILY_BALANCE_SQL = """
+INSERT INTO daily_balances (account_number, day, closing_balance) VALUES (?, ?, ?)
+ON CONFLICT(account_number, day) DO UPDATE SET closing_balance = excluded.closing_balance
+"""
+# A day's first row starts from the closing total of the latest earlier day.
+_UPSERT_DAILY_TOTALS_SQL = """
+INSERT INTO daily_totals (day, credits, debits, tx_count, closing_balance)
+VALUES (?1, ?2, ?3, ?4, ?5 + coalesce(
+    (SELECT closing_balance FROM daily_totals WHERE day < ?1 ORDER BY day DESC LIMIT 1), 0
+))
+ON CONFLICT(day) DO UPDATE SET
+    credits = credits + excluded.credits,
+    debits = debits + excluded.debits,
+    tx_count = tx_count + excluded.tx_count,
+    closing_balance = closing_balance + ?5
+"""
+
 
 class Storage:
-    def __init__(self, db_path: Path):
+    def __init__(
+        self,
+        db_path: Path,
+        pool_size: int = DB_POOL_SIZE,
+        profile: str | Mapping[str, object] = SQLITE_PROFILE,
+        customer_cache_size: int = CUSTOMER_CACHE_SIZE,
+        customer_cache_ttl: float | None = CUSTOMER_CACHE_TTL,
+        profiler: SQLProfiler | None = None,
+    ):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        # BANKAPP_SQL_PROFILE=1 profiles every Storage; otherwise pass a profiler to profile this one.
+        self.profiler = profiler if profiler is not None or not SQL_PROFILE else SQLProfiler()
+        self.pool = ConnectionPool(self.db_path, size=pool_size, profile=profile, profiler=self.profiler)
+        self.customer_cache: LRUCache[sqlite3.Row] | None = (
+            LRUCache(customer_cache_size, customer_cache_ttl) if customer_cache_size > 0 else None
+        )
+
+    @contextmanager
+    def connect(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection for one transaction (commit on success, rollback on error)."""
+        with self.pool.connection() as conn:
+            with metrics.timer("bank_sql_seconds"), conn:
+                yield conn
+
+    def close(self) -> None:
+        self.pool.close()
 
-    def connect(self) -> sqlite3.Connection:
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+    def _invalidate_customers(self, *account_numbers: str) -> None:
+        # Called after the write has committed. A reader that selected the old row before the commit
+        # still holds an older cache generation, so get_customer's put is refused instead of re-caching it.
+        if self.customer_cache is not None:
+            self.customer_cache.invalidate(*account_numbers)
+
+    def schema_version(self) -> int:
+        with self.connect() as conn:
+            return conn.execute("PRAGMA user_version").fetchone()[0]
 
     def init_db(self) -> None:
+        """Bring the schema up to date; a current database costs one PRAGMA read and no DDL."""
+        if self.schema_version() != len(MIGRATIONS):
+            self.migrate()
+
+    def migrate(self, migrations: tuple[str | Callable[["Storage"], object], ...] | None = None) -> int:
+        """Apply every migration newer than the database's user_version. Returns the new version."""
+        migrations = MIGRATIONS if migrations is None else migrations
+        version = self.schema_version()
+        if version > len(migrations):
+            raise RuntimeError(
+                f"Database schema version {version} is newer than this application supports ({len(migrations)})."
+            )
+        for target in range(version + 1, len(migrations) + 1):
+            step = migrations[target - 1]
+            if callable(step):
+                step(self)
+            with self.connect() as conn:
+                conn.execute("BEGIN IMMEDIATE")
+                # Another process may have applied this step while we waited for the write lock.
+                if conn.execute("PRAGMA user_version").fetchone()[0] >= target:
+                    continue
+                if not callable(step):
+                    for statement in step.split(";"):
+                        if statement.strip():
+                            conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {target}")
+        return len(migrations)
+
+    def migrate_legacy_timestamps(self, batch_size: int = TIMESTAMP_MIGRATION_BATCH) -> int:
+        """Rewrite DD/MM/YYYY created_at values as ISO-8601, one rowid range per transaction.
+
+        Short transactions keep the database usable by other clients while a large
+        ledger is converted, and an interrupted run simply resumes on the next start.
+        """
+        converted = 0
+        for table in ("admins", "customers", "transactions"):
+            with self.connect() as conn:
+                probe = conn.execute(
+                    f"SELECT min(rowid) AS lo, max(rowid) AS hi FROM {table} WHERE created_at GLOB ?",
+                    (_LEGACY_DATE_GLOB,),
+                ).fetchone()
+            if probe["lo"] is None:
+                continue
+            for start in range(probe["lo"], probe["hi"] + 1, batch_size):
+                with self.connect() as conn:
+                    cur = conn.execute(
+                        f"""
+                        UPDATE {table} SET created_at = {_LEGACY_TO_ISO}
+                        WHERE rowid >= ? AND rowid < ? AND created_at GLOB ?
+                        """,
+                        (start, start + batch_size, _LEGACY_DATE_GLOB),
+                    )
+                    converted += cur.rowcount
+        return converted
+
+    def explain_query_plan(self, sql: str, params: tuple | Mapping[str, object] = ()) -> list[str]:
         with self.connect() as conn:
-            conn.executescript(SCHEMA)
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+            return [row["detail"] for row in rows]
 
     def admin_exists(self, username: str | None = None) -> bool:
         with self.connect() as conn:
@@ -70,7 +348,7 @@ class Storage:
         with self.connect() as conn:
             conn.execute(
                 "INSERT INTO admins (username, password_hash, created_at) VALUES (?, ?, ?)",
-                (username, password_hash, datetime.now().strftime(DATE_FORMAT)),
+                (username, password_hash, now_timestamp()),
             )
 
     def get_admin_hash(self, username: str) -> str | None:
@@ -137,46 +415,192 @@ class Storage:
                     kyc_document,
                 ),
             )
+            self._record_snapshot(conn, created_at[:10], [(account_number, balance)], balance, backdated=True)
+
+    @staticmethod
+    def _existing_keys(conn: sqlite3.Connection, table: str, column: str, keys: list[str]) -> set[str]:
+        found: set[str] = set()
+        for start in range(0, len(keys), _IN_CHUNK):
+            chunk = keys[start:start + _IN_CHUNK]
+            rows = conn.execute(
+                f"SELECT {column} FROM {table} WHERE {column} IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update(row[0] for row in rows)
+        return found
+
+    def existing_accounts(self, account_numbers: list[str]) -> set[str]:
+        with self.connect() as conn:
+            return self._existing_keys(conn, "customers", "account_number", account_numbers)
+
+    def existing_admins(self, usernames: list[str]) -> set[str]:
+        with self.connect() as conn:
+            return self._existing_keys(conn, "admins", "username", usernames)
+
+    def create_customers(self, rows: list[dict]) -> list[str]:
+        """Insert many customers in one transaction.
+
+        Rows whose account number is already taken are left out; their account
+        numbers are returned so the caller can report them.
+        """
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            accounts = [row["account_number"] for row in rows]
+            taken = self._existing_keys(conn, "customers", "account_number", accounts)
+            inserted = [row for row in rows if row["account_number"] not in taken]
+            conn.executemany(
+                _INSERT_CUSTOMER_SQL,
+                [tuple(row[column] for column in CUSTOMER_COLUMNS) for row in inserted],
+            )
+            by_day: dict[str, list[tuple[str, int]]] = {}
+            for row in inserted:
+                by_day.setdefault(row["created_at"][:10], []).append((row["account_number"], row["balance"]))
+            for day, opening in by_day.items():
+                self._record_snapshot(conn, day, opening, sum(balance for _, balance in opening), backdated=True)
+        return [row["account_number"] for row in rows if row["account_number"] in taken]
+
+    def create_admins(self, rows: list[tuple[str, str]]) -> list[str]:
+        """Insert many (username, password_hash) pairs in one transaction; returns usernames already taken."""
+        created_at = now_timestamp()
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            taken = self._existing_keys(conn, "admins", "username", [username for username, _ in rows])
+            conn.executemany(
+                "INSERT INTO admins (username, password_hash, created_at) VALUES (?, ?, ?)",
+                [
+                    (username, password_hash, created_at)
+                    for username, password_hash in rows
+                    if username not in taken
+                ],
+            )
+        return [username for username, _ in rows if username in taken]
+
+    def update_customer_pins(self, rows: list[tuple[str, str]]) -> None:
+        """Apply many (account_number, pin_hash) updates in one transaction."""
+        with self.connect() as conn:
+            conn.executemany(
+                "UPDATE customers SET pin_hash = ? WHERE account_number = ?",
+                [(pin_hash, account_number) for account_number, pin_hash in rows],
+            )
+        self._invalidate_customers(*(account_number for account_number, _ in rows))
 
     def get_customer(self, account_number: str) -> sqlite3.Row | None:
+        generation = None
+        if self.customer_cache is not None:
+            cached = self.customer_cache.get(account_number)
+            if cached is not None:
+                return cached
+            generation = self.customer_cache.generation()
         with self.connect() as conn:
-            return conn.execute(
+            row = conn.execute(
                 "SELECT * FROM customers WHERE account_number = ?",
                 (account_number,),
             ).fetchone()
+        if row is not None and self.customer_cache is not None:
+            self.customer_cache.put(account_number, row, generation)
+        return row
 
     def get_customer_by_mobile(self, mobile: str) -> sqlite3.Row | None:
         with self.connect() as conn:
-            return conn.execute(
-                "SELECT * FROM customers WHERE mobile = ?",
-                (mobile,),
-            ).fetchone()
+            return conn.execute(CUSTOMER_BY_MOBILE_SQL, (mobile,)).fetchone()
 
     def get_customer_by_name(self, name: str) -> sqlite3.Row | None:
+        with self.connect() as conn:
+            return conn.execute(CUSTOMER_BY_NAME_SQL, (name,)).fetchone()
+
+    def resolve_customer(
+        self,
+        account_number: str | None,
+        mobile: str | None,
+        name: str | None,
+    ) -> sqlite3.Row | None:
+        """Return ``(account_number, pin_hash)`` for the best match, by RESOLVE_CUSTOMER_SQL precedence."""
         with self.connect() as conn:
             return conn.execute(
-                "SELECT * FROM customers WHERE name = ? COLLATE NOCASE LIMIT 1",
-                (name,),
+                RESOLVE_CUSTOMER_SQL,
+                {"account_number": account_number, "mobile": mobile, "name": name},
             ).fetchone()
 
+    def search_customers(
+        self,
+        field: str = "name",
+        prefix: str = "",
+        limit: int = 50,
+        after: tuple[str, str] | None = None,
+        before: tuple[str, str] | None = None,
+    ) -> list[sqlite3.Row]:
+        """One page of customers whose ``field`` starts with ``prefix``, in (field, account_number) order.
+
+        Keyset pagination: ``after`` / ``before`` are the (field value, account number)
+        of the last / first row already shown. With ``before`` the page just above it
+        is returned, still in ascending order. Every page is a range scan on the
+        field's index, so its cost does not grow with how deep the caller has scrolled.
+        """
+        sort_key = DIRECTORY_FIELDS[field]
+        clauses: list[str] = []
+        params: list[str | int] = []
+        if prefix:
+            if field == "name":
+                prefix = prefix.lower()
+            low, high = _prefix_bounds(prefix)
+            clauses.append(f"{sort_key} >= ? AND {sort_key} < ?")
+            params += [low, high]
+        for cursor, op in ((after, ">"), (before, "<")):
+            if cursor is None:
+                continue
+            value, account_number = cursor
+            if field == "account_number":
+                clauses.append(f"account_number {op} ?")
+                params.append(account_number)
+            else:
+                # Spelled out rather than as a row value so the leading term stays an index range.
+                clauses.append(f"{sort_key} {op}= ? AND ({sort_key} {op} ? OR account_number {op} ?)")
+                params += [value, value, account_number]
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        direction = "DESC" if before is not None and after is None else "ASC"
+        order = [f"{sort_key} {direction}"]
+        if field != "account_number":
+            order.append(f"account_number {direction}")
+        with self.connect() as conn:
+            rows = conn.execute(
+                f"SELECT {', '.join(DIRECTORY_COLUMNS)} FROM customers {where} ORDER BY {', '.join(order)} LIMIT ?",
+                (*params, limit),
+            ).fetchall()
+        return rows[::-1] if direction == "DESC" else rows
+
     def update_customer_pin(self, account_number: str, pin_hash: str) -> None:
         with self.connect() as conn:
             conn.execute(
                 "UPDATE customers SET pin_hash = ? WHERE account_number = ?",
                 (pin_hash, account_number),
             )
+        self._invalidate_customers(account_number)
 
     def update_balance(self, account_number: str, new_balance: int) -> None:
         with self.connect() as conn:
-            conn.execute(
-                "UPDATE customers SET balance = ? WHERE account_number = ?",
-                (new_balance, account_number),
-            )
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT balance FROM customers WHERE account_number = ?", (account_number,)).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE customers SET balance = ? WHERE account_number = ?",
+                    (new_balance, account_number),
+                )
+                self._record_snapshot(
+                    conn, now_timestamp()[:10], [(account_number, new_balance)], new_balance - int(row[0])
+                )
+        self._invalidate_customers(account_number)
 
     def delete_customer(self, account_number: str) -> int:
         with self.connect() as conn:
-            cur = conn.execute("DELETE FROM customers WHERE account_number = ?", (account_number,))
-            return cur.rowcount
+            # The account's own snapshots go with it (ON DELETE CASCADE); the bank total loses its balance.
+            rows = conn.execute(
+                "DELETE FROM customers WHERE account_number = ? RETURNING balance",
+                (account_number,),
+            ).fetchall()
+            if rows:
+                self._record_snapshot(conn, now_timestamp()[:10], [], -int(rows[0][0]))
+        self._invalidate_customers(account_number)
+        return len(rows)
 
     def add_transaction(self, account_number: str, amount: int, tx_type: str, balance_after: int) -> None:
         with self.connect() as conn:
@@ -185,7 +609,86 @@ class Storage:
                 INSERT INTO transactions (account_number, amount, tx_type, balance_after, created_at)
                 VALUES (?, ?, ?, ?, ?)
                 """,
-                (account_number, amount, tx_type, balance_after, datetime.now().strftime(DATE_FORMAT)),
+                (account_number, amount, tx_type, balance_after, now_timestamp()),
+            )
+
+    @staticmethod
+    def _apply_balance_change(
+        conn: sqlite3.Connection,
+        account_number: str,
+        delta: int,
+        tx_type: str,
+        min_balance: int | None,
+    ) -> int | None:
+        # The guard lives in the UPDATE itself, so concurrent writers can never both pass it.
+        if min_balance is None:
+            rows = conn.execute(
+                "UPDATE customers SET balance = balance + ? WHERE account_number = ? RETURNING balance",
+                (delta, account_number),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                """
+                UPDATE customers SET balance = balance + ?
+                WHERE account_number = ? AND balance + ? >= ?
+                RETURNING balance
+                """,
+                (delta, account_number, delta, min_balance),
+            ).fetchall()
+        if not rows:
+            exists = conn.execute(
+                "SELECT 1 FROM customers WHERE account_number = ?",
+                (account_number,),
+            ).fetchone()
+            if exists is None:
+                raise ValueError("Account not found")
+            return None
+        new_balance = int(rows[0][0])
+        created_at = now_timestamp()
+        conn.execute(
+            """
+            INSERT INTO transactions (account_number, amount, tx_type, balance_after, created_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            (account_number, abs(delta), tx_type, new_balance, created_at),
+        )
+        Storage._record_snapshot(
+            conn,
+            created_at[:10],
+            [(account_number, new_balance)],
+            delta,
+            credits=max(delta, 0),
+            debits=max(-delta, 0),
+            tx_count=1,
+        )
+        return new_balance
+
+    @staticmethod
+    def _record_snapshot(
+        conn: sqlite3.Connection,
+        day: str,
+        closing_balances: list[tuple[str, int]],
+        net_change: int,
+        credits: int = 0,
+        debits: int = 0,
+        tx_count: int = 0,
+        backdated: bool = False,
+    ) -> None:
+        """Fold one write into the snapshots, inside the caller's transaction.
+
+        ``closing_balances`` are the touched accounts' balances after the write and
+        ``net_change`` is how much the bank-wide total moved. Writes stamped with a
+        caller-supplied time pass ``backdated`` so later days' totals move too.
+        """
+        conn.executemany(
+            _UPSERT_DAILY_BALANCE_SQL,
+            [(account_number, day, balance) for account_number, balance in closing_balances],
+        )
+        conn.execute(_UPSERT_DAILY_TOTALS_SQL, (day, credits, debits, tx_count, net_change))
+        if backdated:
+            conn.execute(
+                "UPDATE daily_totals SET closing_balance = closing_balance + ? WHERE day > ?",
+                (net_change, day),
             )
 
     def update_balance_with_transaction(
@@ -193,24 +696,353 @@ class Storage:
         account_number: str,
         delta: int,
         tx_type: str,
-    ) -> int:
+        min_balance: int | None = None,
+    ) -> int | None:
+        """Apply ``delta`` and record it in the ledger in one write transaction.
+
+        Returns the new balance, or ``None`` (nothing written) when the result would
+        fall below ``min_balance``. Raises ValueError if the account does not exist.
+        """
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            new_balance = self._apply_balance_change(conn, account_number, delta, tx_type, min_balance)
+        self._invalidate_customers(account_number)
+        return new_balance
+
+    def apply_balance_changes(
+        self,
+        changes: list[tuple[str, int, str, int | None]],
+    ) -> list[int | None | ValueError]:
+        """Apply independent (account_number, delta, tx_type, min_balance) changes in one transaction.
+
+        This is a group commit: each change behaves exactly like its own
+        update_balance_with_transaction call, and the outcome list holds the new
+        balance, ``None`` for a failed min-balance guard, or the ValueError for a
+        missing account. One change failing does not affect the others.
+        """
+        outcomes: list[int | None | ValueError] = []
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for account_number, delta, tx_type, min_balance in changes:
+                try:
+                    outcomes.append(self._apply_balance_change(conn, account_number, delta, tx_type, min_balance))
+                except ValueError as exc:
+                    outcomes.append(exc)
+        self._invalidate_customers(*{account_number for account_number, *_ in changes})
+        return outcomes
+
+    def post_transactions(
+        self,
+        postings: list[tuple[str, int, str]],
+        min_balance: int | None = None,
+        atomic: bool = True,
+    ) -> list[tuple[str, int | None]]:
+        """Apply many (account_number, delta, tx_type) postings in one write transaction.
+
+        Postings are applied in order, so several entries for one account see each
+        other's effect. Each gets an outcome: ``("ok", balance_after)``,
+        ``("not_found", None)`` or ``("min_balance", None)`` for a withdrawal that
+        would drop below ``min_balance``. With ``atomic`` any failure rolls the whole
+        batch back; otherwise the successful postings are committed.
+        """
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            balances: dict[str, int] = {}
+            accounts = list({account_number for account_number, _, _ in postings})
+            for start in range(0, len(accounts), _IN_CHUNK):
+                chunk = accounts[start:start + _IN_CHUNK]
+                rows = conn.execute(
+                    f"SELECT account_number, balance FROM customers "
+                    f"WHERE account_number IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+                balances.update((row[0], int(row[1])) for row in rows)
+
+            outcomes: list[tuple[str, int | None]] = []
+            ledger: list[tuple[str, int, str, int, str]] = []
+            credits = debits = 0
+            created_at = now_timestamp()
+            for account_number, delta, tx_type in postings:
+                if account_number not in balances:
+                    outcomes.append(("not_found", None))
+                    continue
+                new_balance = balances[account_number] + delta
+                if min_balance is not None and delta < 0 and new_balance < min_balance:
+                    outcomes.append(("min_balance", None))
+                    continue
+                balances[account_number] = new_balance
+                ledger.append((account_number, abs(delta), tx_type, new_balance, created_at))
+                credits += max(delta, 0)
+                debits += max(-delta, 0)
+                outcomes.append(("ok", new_balance))
+
+            if atomic and any(status != "ok" for status, _ in outcomes):
+                conn.rollback()
+                return outcomes
+            # The write lock has been held since BEGIN IMMEDIATE, so absolute balances are safe to store.
+            touched = {account_number for account_number, *_ in ledger}
+            conn.executemany(
+                "UPDATE customers SET balance = ? WHERE account_number = ?",
+                [(balances[account_number], account_number) for account_number in touched],
+            )
+            conn.executemany(
+                """
+                INSERT INTO transactions (account_number, amount, tx_type, balance_after, created_at)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                ledger,
+            )
+            if ledger:
+                self._record_snapshot(
+                    conn,
+                    created_at[:10],
+                    [(account_number, balances[account_number]) for account_number in touched],
+                    credits - debits,
+                    credits=credits,
+                    debits=debits,
+                    tx_count=len(ledger),
+                )
+        self._invalidate_customers(*touched)
+        return outcomes
+
+    def list_transactions(
+        self,
+        account_number: str,
+        limit: int,
+        before_id: int | None = None,
+        tx_type: str | None = None,
+        start_date: date | None = None,
+        end_date: date | None = None,
+    ) -> list[sqlite3.Row]:
+        """Return up to ``limit`` ledger rows, newest first, strictly older than ``before_id``."""
+        clauses = ["account_number = ?"]
+        params: list[object] = [account_number]
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        if tx_type is not None:
+            clauses.append("tx_type = ?")
+            params.append(tx_type)
+        if start_date is not None:
+            clauses.append("created_at >= ?")
+            params.append(start_date.isoformat())
+        if end_date is not None:
+            clauses.append("created_at < ?")
+            params.append((end_date + timedelta(days=1)).isoformat())
+        params.append(limit)
+        with self.connect() as conn:
+            return conn.execute(
+                f"""
+                SELECT id, account_number, amount, tx_type, balance_after, created_at
+                FROM transactions
+                WHERE {" AND ".join(clauses)}
+                ORDER BY id DESC
+                LIMIT ?
+                """,
+                params,
+            ).fetchall()
+
+    def balance_on(self, account_number: str, day: date) -> int | None:
+        """Closing balance of the account on ``day``; ``None`` if it had not been opened by then."""
         with self.connect() as conn:
             row = conn.execute(
-                "SELECT balance FROM customers WHERE account_number = ?",
-                (account_number,),
+                """
+                SELECT closing_balance FROM daily_balances
+                WHERE account_number = ? AND day <= ?
+                ORDER BY day DESC
+                LIMIT 1
+                """,
+                (account_number, day.isoformat()),
             ).fetchone()
-            if row is None:
-                raise ValueError("Account not found")
-            new_balance = int(row["balance"]) + delta
+        return None if row is None else int(row[0])
+
+    def list_daily_balances(self, account_number: str, start: date, end: date) -> list[sqlite3.Row]:
+        """Closing balances for the days in [start, end] on which the account's balance changed."""
+        with self.connect() as conn:
+            return conn.execute(
+                """
+                SELECT day, closing_balance FROM daily_balances
+                WHERE account_number = ? AND day BETWEEN ? AND ?
+                ORDER BY day
+                """,
+                (account_number, start.isoformat(), end.isoformat()),
+            ).fetchall()
+
+    def total_on(self, day: date) -> int:
+        """Sum of all balances held at the close of ``day``."""
+        with self.connect() as conn:
+            row = conn.execute(
+                "SELECT closing_balance FROM daily_totals WHERE day <= ? ORDER BY day DESC LIMIT 1",
+                (day.isoformat(),),
+            ).fetchone()
+        return 0 if row is None else int(row[0])
+
+    def list_daily_totals(self, start: date, end: date) -> list[sqlite3.Row]:
+        with self.connect() as conn:
+            return conn.execute(
+                """
+                SELECT day, credits, debits, tx_count, closing_balance FROM daily_totals
+                WHERE day BETWEEN ? AND ?
+                ORDER BY day
+                """,
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+
+    def rebuild_snapshots(self) -> int:
+        """Recompute both snapshot tables from customers and the ledger. Returns the daily_balances row count.
+
+        History of deleted accounts cannot be restated: their ledger rows are gone,
+        so the rebuilt bank-wide totals only cover accounts that still exist.
+        """
+        debit_types = ", ".join("?" * len(DEBIT_TX_TYPES))
+        signed_amount = f"CASE WHEN tx_type IN ({debit_types}) THEN -amount ELSE amount END"
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM daily_balances")
+            conn.execute("DELETE FROM daily_totals")
+            # A day's closing balance is the balance after that day's last entry.
             conn.execute(
-                "UPDATE customers SET balance = ? WHERE account_number = ?",
-                (new_balance, account_number),
+                """
+                INSERT INTO daily_balances (account_number, day, closing_balance)
+                SELECT account_number, day, balance_after FROM (
+                    SELECT account_number, substr(created_at, 1, 10) AS day, balance_after,
+                           row_number() OVER (
+                               PARTITION BY account_number, substr(created_at, 1, 10) ORDER BY id DESC
+                           ) AS position
+                    FROM transactions
+                )
+                WHERE position = 1
+                """
             )
+            # The opening balance on the day the account was created, unless an entry that day already set it.
+            conn.execute(
+                f"""
+                INSERT OR IGNORE INTO daily_balances (account_number, day, closing_balance)
+                SELECT account_number, substr(created_at, 1, 10), coalesce(
+                    (
+                        SELECT balance_after - ({signed_amount}) FROM transactions
+                        WHERE transactions.account_number = customers.account_number
+                        ORDER BY id
+                        LIMIT 1
+                    ),
+                    balance
+                )
+                FROM customers
+                """,
+                DEBIT_TX_TYPES,
+            )
+            conn.execute(
+                f"""
+                WITH changes AS (
+                    SELECT day, closing_balance - coalesce(
+                        lag(closing_balance) OVER (PARTITION BY account_number ORDER BY day), 0
+                    ) AS change
+                    FROM daily_balances
+                ),
+                net AS (
+                    SELECT day, sum(change) AS change FROM changes GROUP BY day
+                ),
+                flows AS (
+                    SELECT substr(created_at, 1, 10) AS day,
+                           sum(max({signed_amount}, 0)) AS credits,
+                           sum(max(-({signed_amount}), 0)) AS debits,
+                           count(*) AS tx_count
+                    FROM transactions
+                    GROUP BY day
+                )
+                INSERT INTO daily_totals (day, credits, debits, tx_count, closing_balance)
+                SELECT net.day, coalesce(flows.credits, 0), coalesce(flows.debits, 0), coalesce(flows.tx_count, 0),
+                       sum(net.change) OVER (ORDER BY net.day)
+                FROM net LEFT JOIN flows ON flows.day = net.day
+                """,
+                DEBIT_TX_TYPES * 2,
+            )
+            return conn.execute("SELECT count(*) FROM daily_balances").fetchone()[0]
+
+    def start_interest_run(self, period: str, rate_bps: int) -> sqlite3.Row:
+        """Return the period's run row, creating it on the first call.
+
+        A period is accrued at one rate only; asking for another rate raises ValueError.
+        """
+        with self.connect() as conn:
             conn.execute(
+                """
+                INSERT OR IGNORE INTO interest_runs (period, rate_bps, last_account, accounts, total, started_at)
+                VALUES (?, ?, '', 0, 0, ?)
+                """,
+                (period, rate_bps, now_timestamp()),
+            )
+            run = conn.execute("SELECT * FROM interest_runs WHERE period = ?", (period,)).fetchone()
+        if run["rate_bps"] != rate_bps:
+            raise ValueError(f"Interest for {period} was started at {run['rate_bps']} bps, not {rate_bps}.")
+        return run
+
+    def accrue_interest_chunk(
+        self,
+        period: str,
+        period_end: date,
+        chunk_size: int,
+        account_type: str = "Savings",
+    ) -> sqlite3.Row:
+        """Credit the next ``chunk_size`` accounts of the period's run in one transaction; returns the run row.
+
+        The checkpoint is read and advanced under the write lock, so an interrupted
+        or concurrent run never credits an account twice for the same period.
+        Monthly interest is the closing balance on ``period_end`` times
+        ``rate_bps / 120000``, rounded down; accounts that would earn nothing are
+        passed over without a ledger entry.
+        """
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            run = conn.execute("SELECT * FROM interest_runs WHERE period = ?", (period,)).fetchone()
+            if run is None:
+                raise ValueError(f"No interest run for {period}.")
+            if run["completed_at"] is not None:
+                return run
+            rows = conn.execute(
+                INTEREST_CHUNK_SQL,
+                {
+                    "period_end": period_end.isoformat(),
+                    "rate_bps": run["rate_bps"],
+                    "account_type": account_type,
+                    "after": run["last_account"],
+                    "limit": chunk_size,
+                },
+            ).fetchall()
+            if not rows:
+                conn.execute("UPDATE interest_runs SET completed_at = ? WHERE period = ?", (now_timestamp(), period))
+                return conn.execute("SELECT * FROM interest_runs WHERE period = ?", (period,)).fetchone()
+
+            credited = [(row[0], int(row[1]) + int(row[2]), int(row[2])) for row in rows if row[2] > 0]
+            created_at = now_timestamp()
+            conn.executemany(
+                "UPDATE customers SET balance = ? WHERE account_number = ?",
+                [(balance, account_number) for account_number, balance, _ in credited],
+            )
+            conn.executemany(
                 """
                 INSERT INTO transactions (account_number, amount, tx_type, balance_after, created_at)
-                VALUES (?, ?, ?, ?, ?)
+                VALUES (?, ?, 'interest', ?, ?)
+                """,
+                [(account_number, interest, balance, created_at) for account_number, balance, interest in credited],
+            )
+            total = sum(interest for *_, interest in credited)
+            if credited:
+                self._record_snapshot(
+                    conn,
+                    created_at[:10],
+                    [(account_number, balance) for account_number, balance, _ in credited],
+                    total,
+                    credits=total,
+                    tx_count=len(credited),
+                )
+            conn.execute(
+                """
+                UPDATE interest_runs SET last_account = ?, accounts = accounts + ?, total = total + ?
+                WHERE period = ?
                 """,
-                (account_number, abs(delta), tx_type, new_balance, datetime.now().strftime(DATE_FORMAT)),
+                (rows[-1][0], len(credited), total, period),
             )
-            return new_balance
+            run = conn.execute("SELECT * FROM interest_runs WHERE period = ?", (period,)).fetchone()
+        self._invalidate_customers(*(account_number for account_number, *_ in credited))
+        return run
@@ -1,16 +1,38 @@
 # USER NAME & PASSWORD: In DATABASE
 
+from datetime import datetime
 from pathlib import Path
+import threading
+import time
 import tkinter as tk
 from tkinter import *
+from tkinter import ttk
 
-from bank_app.config import DB_PATH, MAX_TRANSACTION
+from bank_app.config import DATE_FORMAT, DB_PATH, DIRECTORY_PAGE_SIZE, MAX_TRANSACTION
 from bank_app.errors import BusinessRuleError, ConflictError, NotFoundError, ValidationError
+from bank_app.metrics import metrics, start_configured_export
 from bank_app.services import BankService
 from bank_app.validation import parse_date, validate_mobile
 
+_IMPORT_STARTED = time.perf_counter()
 ASSETS_DIR = Path(__file__).resolve().parent.parent / "images"
-service = BankService.create_default(DB_PATH)
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_service() -> BankService:
+    """Return the shared BankService, opening the database and bootstrapping on first use.
+
+    Nothing touches the database at import time; run_app warms the service up on a
+    background thread once the welcome screen is drawn, and callers that get here
+    first wait for that to finish.
+    """
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = BankService.create_default(DB_PATH)
+        return _service
 
 
 def asset_path(filename: str) -> str:
@@ -49,7 +71,7 @@ def _safe_customer_message(message: str) -> None:
 # Backend python functions code starts:
 def is_valid(customer_account_number):
     try:
-        return not service.customer_exists(customer_account_number)
+        return not get_service().customer_exists(customer_account_number)
     except ValidationError:
         return False
 
@@ -74,9 +96,17 @@ def is_valid_mobile(mobile_number):
         return False
 
 
+def format_display_date(timestamp):
+    # stored timestamps are ISO-8601; the UI keeps showing DD/MM/YYYY
+    try:
+        return datetime.fromisoformat(timestamp).strftime(DATE_FORMAT)
+    except (TypeError, ValueError):
+        return timestamp
+
+
 def display_account_summary(identity, choice):  # choice 1 for full summary; choice 2 for only account balance.
     try:
-        summary = service.get_customer_summary(identity)
+        summary = get_service().get_customer_summary(identity)
     except NotFoundError:
         print("\n# No account associated with the entered account number exists! #")
         return ""
@@ -85,7 +115,7 @@ def display_account_summary(identity, choice):  # choice 1 for full summary; cho
         output_message = (
             f"Account number : {summary['account_number']}\n"
             f"Current balance : {summary['balance']}\n"
-            f"Date of account creation : {summary['created_at']}\n"
+            f"Date of account creation : {format_display_date(summary['created_at'])}\n"
             f"Name of account holder : {summary['name']}\n"
             f"Type of account : {summary['account_type']}\n"
             f"Date of Birth : {summary['date_of_birth']}\n"
@@ -102,7 +132,7 @@ def display_account_summary(identity, choice):  # choice 1 for full summary; cho
 
 def delete_customer_account(identity, choice):  # choice 1 for admin, choice 2 for customer
     try:
-        service.delete_customer(identity)
+        get_service().delete_customer(identity)
     except NotFoundError:
         output_message = "Account not found !"
         if choice == 1:
@@ -118,7 +148,7 @@ def delete_customer_account(identity, choice):  # choice 1 for admin, choice 2 f
 
 def delete_admin_account(identity):
     try:
-        service.delete_admin(identity, current_admin_id=admin_idNO)
+        get_service().delete_admin(identity, current_admin_id=admin_idNO)
     except NotFoundError:
         output_message = "Account not found :("
         _safe_admin_message(output_message)
@@ -137,14 +167,13 @@ def delete_admin_account(identity):
 
 def change_PIN(identity, new_PIN):
     try:
-        service.change_pin(identity, new_PIN)
+        get_service().change_pin(identity, new_PIN)
     except (NotFoundError, ValidationError) as exc:
-        output_message = str(exc)
-        _safe_customer_message(output_message)
-        print(output_message)
-        return
+        return str(exc)
+    return "PIN changed successfully."
 
-    output_message = "PIN changed successfully."
+
+def report_customer_message(output_message):
     _safe_customer_message(output_message)
     print(output_message)
 
@@ -159,8 +188,8 @@ def transaction(identity, amount, choice):  # choice 1 for deposit; choice 2 for
     amount_str = _coerce_amount(amount)
     try:
         if choice == 1:
-            return service.deposit(identity, amount_str)
-        return service.withdraw(identity, amount_str)
+            return get_service().deposit(identity, amount_str)
+        return get_service().withdraw(identity, amount_str)
     except BusinessRuleError as exc:
         if "Minimum balance" in str(exc):
             return -1
@@ -175,25 +204,111 @@ def check_credentials(identity, password, choice, admin_access):
     try:
         if choice == 1:
             if password == "DO_NOT_CHECK_ADMIN":
-                return service.admin_exists(identity)
-            return service.authenticate_admin(identity, password)
+                return get_service().admin_exists(identity)
+            return get_service().authenticate_admin(identity, password)
         if password == "DO_NOT_CHECK":
-            return service.customer_exists(identity)
-        return service.authenticate_customer(identity, password)
+            return get_service().customer_exists(identity)
+        return get_service().authenticate_customer(identity, password)
     except ValidationError:
         return False
 
 
 def authenticate_customer_identifier(identity, password):
     try:
-        return service.authenticate_customer_with_identifier(identity, password)
+        return get_service().authenticate_customer_with_identifier(identity, password)
     except ValidationError:
         return None
 
 
+def load_statement_page(identity, before_id=None):
+    try:
+        return get_service().get_transactions(identity, before_id=before_id)
+    except (NotFoundError, ValidationError) as exc:
+        print(str(exc))
+        return None
+
+
+def load_directory_page(query, field, after=None, before=None):
+    try:
+        return get_service().search_customers(query, field, DIRECTORY_PAGE_SIZE, after=after, before=before)
+    except ValidationError as exc:
+        print(str(exc))
+        return None
+
+
+def format_statement_line(item):
+    created = format_display_date(item["created_at"])
+    return f"{created:<12}{item['tx_type']:<10}{item['amount']:>10}{item['balance_after']:>12}"
+
+
 # Backend python functions code ends.
 
 # Tkinter GUI code starts :  
+class BackgroundTask:
+    """Run a blocking service call on the service's worker threads and report back via after().
+
+    While it runs the window shows a busy cursor, the given widgets are disabled and, for
+    cancellable tasks, a Cancel button is offered. Cancelling stops the call if it has not
+    started yet; otherwise its result is ignored.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, window, operation, args=(), on_success=None, on_error=None, busy_widgets=(),
+                 cancellable=True):
+        self.window = window
+        self.on_success = on_success
+        self.on_error = on_error
+        self.busy_widgets = busy_widgets
+        self.cancelled = False
+        self._future = get_service().submit(operation, *args)
+
+        self._indicator = tk.Frame(window, background="#f2f3f4")
+        self._indicator.place(relx=1.0, rely=1.0, anchor="se")
+        tk.Label(self._indicator, background="#f2f3f4", foreground="#00254a",
+                 font="-family {Segoe UI} -size 9", text="Please wait...").pack(side="left", padx=4)
+        if cancellable:
+            tk.Button(self._indicator, background="#d3d8dc", borderwidth="0", font="-family {Segoe UI} -size 8",
+                      text="Cancel", command=self.cancel).pack(side="left", padx=4, pady=2)
+        self._set_busy(True)
+        window.after(self.POLL_MS, self._poll)
+
+    def _set_busy(self, busy):
+        try:
+            self.window.configure(cursor="watch" if busy else "arrow")
+            for widget in self.busy_widgets:
+                widget.configure(state="disabled" if busy else "normal")
+            if not busy:
+                self._indicator.destroy()
+        except TclError:
+            pass  # the window was closed while the task was running
+
+    def cancel(self):
+        self.cancelled = True
+        self._future.cancel()
+        self._set_busy(False)
+
+    def _poll(self):
+        if self.cancelled:
+            return
+        if not self._future.done():
+            try:
+                self.window.after(self.POLL_MS, self._poll)
+            except TclError:
+                pass
+            return
+        self._set_busy(False)
+        try:
+            result = self._future.result()
+        except Exception as exc:
+            if self.on_error is None:
+                raise
+            self.on_error(exc)
+            return
+        if self.on_success is not None:
+            self.on_success(result)
+
+
 class welcomeScreen:
     def __init__(self, window=None):
         self.master = window
@@ -382,7 +497,7 @@ class adminLogin:
         global admin_img
         admin_img = tk.PhotoImage(file=asset_path("adminLogin1.png"))
 
-        if not service.admin_exists():
+        if not get_service().admin_exists():
             # small spacer to create ~10px gap before the setup message
             self.SetupSpacer = tk.Label(Canvas1, background="#ffffff", text="")
             self.SetupSpacer.place(relx=0.135, rely=0.86, height=10, width=360)
@@ -438,7 +553,11 @@ class adminLogin:
     def login(self, admin_id, admin_password):
         global admin_idNO
         admin_idNO = admin_id
-        if check_credentials(admin_id, admin_password, 1, True):
+        BackgroundTask(self.master, check_credentials, (admin_id, admin_password, 1, True),
+                       on_success=self._on_login, busy_widgets=(self.Button, self.Button_back))
+
+    def _on_login(self, valid):
+        if valid:
             self.master.withdraw()
             adminMenu(Toplevel(self.master))
         else:
@@ -540,7 +659,10 @@ class CustomerLogin:
         settingIMG.configure(image=customer_img)
 
     def login(self, identifier, customer_PIN):
-        account_number = authenticate_customer_identifier(identifier, customer_PIN)
+        BackgroundTask(self.master, authenticate_customer_identifier, (identifier, customer_PIN),
+                       on_success=self._on_login, busy_widgets=(self.Button, self.Button_back))
+
+    def _on_login(self, account_number):
         if account_number:
             global customer_accNO
             customer_accNO = account_number
@@ -608,6 +730,13 @@ class adminMenu:
                                  text="Check account summary", command=self.showAccountSummary)
         self.Button6.place(relx=0.04, rely=0.683, height=34, width=181, bordermode='ignore')
 
+        self.Button7 = tk.Button(self.Labelframe1, activebackground="#ececec", activeforeground="#000000",
+                                 background="#00254a", foreground="#fffffe", borderwidth="0",
+                                 disabledforeground="#a3a3a3", font="-family {Segoe UI} -size 11",
+                                 highlightbackground="#d9d9d9", highlightcolor="black", pady="0",
+                                 text="Customer directory", command=self.showDirectory)
+        self.Button7.place(relx=0.353, rely=0.439, height=34, width=181, bordermode='ignore')
+
         global Frame1
         Frame1 = tk.Frame(window, relief='groove', borderwidth="2", background="#fffffe")
         Frame1.place(relx=0.081, rely=0.547, relheight=0.415, relwidth=0.848)
@@ -627,6 +756,9 @@ class adminMenu:
     def showAccountSummary(self):
         checkAccountSummary(Toplevel(self.master))
 
+    def showDirectory(self):
+        customerDirectory(Toplevel(self.master))
+
     def printAccountSummary(identity):
         # clearing the frame
         for widget in Frame1.winfo_children():
@@ -868,28 +1000,29 @@ class createCustomerAccount:
             Error.setMessage(self, message_shown="PIN mismatch!")
             return
 
-        try:
-            service.create_customer(
-                customer_account_number,
-                name,
-                account_type,
-                date_of_birth,
-                mobile_number,
-                gender,
-                nationality,
-                KYC_document,
-                PIN,
-                initial_balance,
-            )
-        except ConflictError:
+        # creating an account hashes the PIN, so run it off the Tk thread; it cannot be cancelled once queued
+        BackgroundTask(
+            self.master,
+            get_service().create_customer,
+            (customer_account_number, name, account_type, date_of_birth, mobile_number, gender, nationality,
+             KYC_document, PIN, initial_balance),
+            on_success=self._on_created,
+            on_error=self._on_create_failed,
+            busy_widgets=(self.Button1, self.Button2),
+            cancellable=False,
+        )
+
+    def _on_create_failed(self, exc):
+        if isinstance(exc, ConflictError):
             Error(Toplevel(self.master))
             Error.setMessage(self, message_shown="Account number already exists!")
-            return
-        except (ValidationError, BusinessRuleError) as exc:
+        elif isinstance(exc, (ValidationError, BusinessRuleError)):
             Error(Toplevel(self.master))
             Error.setMessage(self, message_shown=str(exc))
-            return
+        else:
+            raise exc
 
+    def _on_created(self, _result):
         output_message = "Customer account created successfully!"
         print(output_message)
         adminMenu.printMessage_outside(output_message)
@@ -955,17 +1088,21 @@ class createAdmin:
             Error.setMessage(self, message_shown="Password Mismatch!")
             return
 
-        try:
-            service.create_admin(identity, password)
-        except ConflictError:
+        BackgroundTask(self.master, get_service().create_admin, (identity, password), on_success=self._on_created,
+                       on_error=self._on_create_failed, busy_widgets=(self.Button1, self.Button2),
+                       cancellable=False)
+
+    def _on_create_failed(self, exc):
+        if isinstance(exc, ConflictError):
             Error(Toplevel(self.master))
             Error.setMessage(self, message_shown="ID is unavailable!")
-            return
-        except ValidationError as exc:
+        elif isinstance(exc, ValidationError):
             Error(Toplevel(self.master))
             Error.setMessage(self, message_shown=str(exc))
-            return
+        else:
+            raise exc
 
+    def _on_created(self, _result):
         output_message = "Admin account created successfully!"
         _safe_admin_message(output_message)
         print(output_message)
@@ -1089,6 +1226,13 @@ class customerMenu:
                                  text='''Check your balance''', command=self.checkBalance)
         self.Button6.place(relx=0.04, rely=0.683, height=34, width=181, bordermode='ignore')
 
+        self.Button7 = tk.Button(self.Labelframe1, command=self.selectMiniStatement, activebackground="#ececec",
+                                 activeforeground="#000000", background="#39a9fc", borderwidth="0",
+                                 disabledforeground="#a3a3a3", font="-family {Segoe UI} -size 11", foreground="#fffffe",
+                                 highlightbackground="#d9d9d9", highlightcolor="black", pady="0",
+                                 text='''Mini statement''')
+        self.Button7.place(relx=0.353, rely=0.439, height=34, width=181, bordermode='ignore')
+
         global Frame1_1_2
         Frame1_1_2 = tk.Frame(window, relief='groove', borderwidth="2", background="#fffffe")
         Frame1_1_2.place(relx=0.081, rely=0.547, relheight=0.415, relwidth=0.848)
@@ -1106,6 +1250,9 @@ class customerMenu:
         self.master.withdraw()
         closeAccount(Toplevel(self.master))
 
+    def selectMiniStatement(self):
+        miniStatement(Toplevel(self.master))
+
     def exit(self):
         self.master.withdraw()
         CustomerLogin(Toplevel(self.master))
@@ -1301,8 +1448,9 @@ class changePIN:
 
     def submit(self, new_PIN, confirm_new_PIN):
         if new_PIN == confirm_new_PIN and str(new_PIN).__len__() == 4 and new_PIN.isnumeric():
-            change_PIN(customer_accNO, new_PIN)
-            self.master.withdraw()
+            # change_PIN only touches the service; the message is shown back on the Tk thread
+            BackgroundTask(self.master, change_PIN, (customer_accNO, new_PIN), on_success=self._on_changed,
+                           busy_widgets=(self.Button1, self.Button2), cancellable=False)
         else:
             Error(Toplevel(self.master))
             if new_PIN != confirm_new_PIN:
@@ -1313,6 +1461,63 @@ class changePIN:
                 Error.setMessage(self, message_shown="Invalid PIN!")
             return
 
+    def _on_changed(self, message):
+        report_customer_message(message)
+        self.master.withdraw()
+
+    def back(self):
+        self.master.withdraw()
+
+
+class miniStatement:
+    def __init__(self, window=None):
+        self.master = window
+        center_window(window, 520, 330)
+        window.minsize(120, 1)
+        window.maxsize(1370, 749)
+        window.resizable(0, 0)
+        window.title("Mini statement")
+        window.configure(background="#f2f3f4")
+        self._next_before_id = None
+
+        self.Label1 = tk.Label(window, background="#f2f3f4", disabledforeground="#a3a3a3", foreground="#000000",
+                               font="TkFixedFont", anchor="w",
+                               text=f"{'Date':<12}{'Type':<10}{'Amount':>10}{'Balance':>12}")
+        self.Label1.place(relx=0.04, rely=0.03, height=21, relwidth=0.92)
+
+        self.Listbox1 = tk.Listbox(window, background="#ffffff", borderwidth="1", font="TkFixedFont",
+                                   foreground="#000000", activestyle="none")
+        self.Listbox1.place(relx=0.04, rely=0.1, relheight=0.68, relwidth=0.92)
+
+        self.Button1 = tk.Button(window, activebackground="#ececec", activeforeground="#000000", background="#004080",
+                                 disabledforeground="#a3a3a3", foreground="#ffffff", borderwidth="0",
+                                 highlightbackground="#d9d9d9",
+                                 highlightcolor="black", pady="0", text="Back", command=self.back)
+        self.Button1.place(relx=0.214, rely=0.85, height=24, width=67)
+
+        self.Button2 = tk.Button(window, activebackground="#ececec", activeforeground="#000000", background="#004080",
+                                 disabledforeground="#a3a3a3", foreground="#ffffff", borderwidth="0",
+                                 highlightbackground="#d9d9d9",
+                                 highlightcolor="black", pady="0", text="Load older", command=self.load_more)
+        self.Button2.place(relx=0.614, rely=0.85, height=24, width=87)
+
+        self.load_more()
+
+    def load_more(self):
+        # fetch one page at a time; the service hands back the cursor for the next (older) page
+        page = load_statement_page(customer_accNO, self._next_before_id)
+        if page is None:
+            Error(Toplevel(self.master))
+            Error.setMessage(self, message_shown="Could not load statement!")
+            return
+        if not page["items"] and self.Listbox1.size() == 0:
+            self.Listbox1.insert(END, "No transactions yet.")
+        for item in page["items"]:
+            self.Listbox1.insert(END, format_statement_line(item))
+        self._next_before_id = page["next_before_id"]
+        if self._next_before_id is None:
+            self.Button2.configure(state="disabled")
+
     def back(self):
         self.master.withdraw()
 
@@ -1366,6 +1571,178 @@ class closeAccount:
         customerMenu(Toplevel(self.master))
 
 
+class customerDirectory:
+    """Searchable list of all customers that only ever holds a few pages of rows.
+
+    Pages are fetched as the user scrolls towards either end of the list; once more
+    than MAX_PAGES are loaded the page furthest from the view is dropped, so memory
+    stays flat however far the user scrolls through a large customer base.
+    """
+
+    MAX_PAGES = 5
+    SEARCH_DELAY_MS = 250
+    FIELDS = {"Name": "name", "Mobile": "mobile", "Account no.": "account_number"}
+    COLUMNS = (("account_number", "Account no.", 110), ("name", "Name", 200), ("mobile", "Mobile", 120),
+               ("account_type", "Type", 80), ("balance", "Balance", 90))
+
+    def __init__(self, window=None):
+        self.master = window
+        center_window(window, 660, 430)
+        window.minsize(120, 1)
+        window.maxsize(1370, 749)
+        window.resizable(0, 0)
+        window.title("Customer directory")
+        window.configure(background="#f2f3f4")
+        self._pages = []
+        self._at_start = True
+        self._at_end = True
+        self._loading = False
+        self._search_job = None
+
+        self.Label1 = tk.Label(window, background="#f2f3f4", foreground="#000000", text="Search :")
+        self.Label1.place(relx=0.03, rely=0.035, height=21, width=60)
+
+        self.query = StringVar(window)
+        self.query.trace_add("write", self.schedule_search)
+        self.Entry1 = tk.Entry(window, background="#cae4ff", disabledforeground="#a3a3a3", font="TkFixedFont",
+                               foreground="#000000", insertbackground="black", textvariable=self.query)
+        self.Entry1.place(relx=0.13, rely=0.035, height=20, relwidth=0.45)
+
+        self.field = StringVar(window, value="Name")
+        self.OptionMenu1 = tk.OptionMenu(window, self.field, *self.FIELDS, command=lambda _: self.reload())
+        self.OptionMenu1.configure(background="#d3d8dc", borderwidth="0", highlightthickness="0")
+        self.OptionMenu1.place(relx=0.6, rely=0.03, height=26, width=120)
+
+        self.Treeview1 = ttk.Treeview(window, columns=[name for name, _, _ in self.COLUMNS], show="headings",
+                                      selectmode="browse")
+        for name, heading, width in self.COLUMNS:
+            self.Treeview1.heading(name, text=heading)
+            self.Treeview1.column(name, width=width, anchor="e" if name == "balance" else "w")
+        self.Treeview1.place(relx=0.03, rely=0.11, relheight=0.72, relwidth=0.915)
+        self.Treeview1.bind("<Double-1>", self.show_summary)
+
+        self.Scrollbar1 = ttk.Scrollbar(window, orient="vertical", command=self.Treeview1.yview)
+        self.Scrollbar1.place(relx=0.945, rely=0.11, relheight=0.72, width=16)
+        self.Treeview1.configure(yscrollcommand=self.on_scroll)
+
+        self.Label2 = tk.Label(window, background="#f2f3f4", foreground="#00254a", anchor="w",
+                               text="Double-click a customer to show their summary.")
+        self.Label2.place(relx=0.03, rely=0.85, height=21, relwidth=0.6)
+
+        self.Button1 = tk.Button(window, activebackground="#ececec", activeforeground="#000000", background="#004080",
+                                 disabledforeground="#a3a3a3", foreground="#ffffff", borderwidth="0",
+                                 highlightbackground="#d9d9d9",
+                                 highlightcolor="black", pady="0", text="Back", command=self.back)
+        self.Button1.place(relx=0.82, rely=0.9, height=24, width=67)
+
+        self.reload()
+
+    def schedule_search(self, *_):
+        # wait for a pause in typing instead of querying on every keystroke
+        if self._search_job is not None:
+            self.master.after_cancel(self._search_job)
+        self._search_job = self.master.after(self.SEARCH_DELAY_MS, self.reload)
+
+    def _fetch(self, after=None, before=None):
+        page = load_directory_page(self.query.get(), self.FIELDS[self.field.get()], after=after, before=before)
+        if page is None:
+            Error(Toplevel(self.master))
+            Error.setMessage(self, message_shown="Could not load customers!")
+        return page
+
+    def _insert(self, items, index):
+        for offset, item in enumerate(items):
+            self.Treeview1.insert("", index if index == END else index + offset, iid=item["account_number"],
+                                  values=[item[name] for name, _, _ in self.COLUMNS])
+
+    def _drop_page(self, position):
+        for item in self._pages.pop(position):
+            self.Treeview1.delete(item["account_number"])
+
+    def _top_row(self):
+        rows = len(self.Treeview1.get_children())
+        return round(self.Treeview1.yview()[0] * rows)
+
+    def _keep_top_row(self, top):
+        rows = len(self.Treeview1.get_children())
+        if rows:
+            self.Treeview1.yview_moveto(max(top, 0) / rows)
+
+    def reload(self):
+        self._search_job = None
+        page = self._fetch()
+        if page is None:
+            return
+        self.Treeview1.delete(*self.Treeview1.get_children())
+        self._pages = [page["items"]] if page["items"] else []
+        self._insert(page["items"], END)
+        self._at_start = True
+        self._at_end = not page["has_more"]
+        self.Label2.configure(text="Double-click a customer to show their summary." if page["items"]
+                              else "No customers found.")
+
+    def on_scroll(self, first, last):
+        self.Scrollbar1.set(first, last)
+        if not self._pages or self._loading:
+            return
+        # load after the scroll has been drawn, never from inside Tk's scroll callback
+        if float(last) >= 0.95 and not self._at_end:
+            self._loading = True
+            self.master.after_idle(self._load, self.load_next)
+        elif float(first) <= 0.05 and not self._at_start:
+            self._loading = True
+            self.master.after_idle(self._load, self.load_previous)
+
+    def _load(self, loader):
+        try:
+            loader()
+        finally:
+            self._loading = False
+
+    def load_next(self):
+        if self._at_end or not self._pages:
+            return
+        page = self._fetch(after=self._pages[-1][-1]["cursor"])
+        if page is None:
+            return
+        self._at_end = not page["has_more"]
+        if not page["items"]:
+            return
+        top = self._top_row()
+        self._insert(page["items"], END)
+        self._pages.append(page["items"])
+        if len(self._pages) > self.MAX_PAGES:
+            dropped = len(self._pages[0])
+            self._drop_page(0)
+            self._at_start = False
+            self._keep_top_row(top - dropped)
+
+    def load_previous(self):
+        if self._at_start or not self._pages:
+            return
+        page = self._fetch(before=self._pages[0][0]["cursor"])
+        if page is None:
+            return
+        self._at_start = not page["has_more"]
+        if not page["items"]:
+            return
+        top = self._top_row()
+        self._insert(page["items"], 0)
+        self._pages.insert(0, page["items"])
+        if len(self._pages) > self.MAX_PAGES:
+            self._drop_page(len(self._pages) - 1)
+            self._at_end = False
+        self._keep_top_row(top + len(page["items"]))
+
+    def show_summary(self, event=None):
+        account_number = self.Treeview1.focus()
+        if account_number:
+            adminMenu.printAccountSummary(account_number)
+
+    def back(self):
+        self.master.withdraw()
+
+
 class checkAccountSummary:
     def __init__(self, window=None):
         self.master = window
@@ -1413,7 +1790,20 @@ class checkAccountSummary:
 def run_app() -> None:
     root = tk.Tk()
     welcomeScreen(root)
-    root.mainloop()
+    root.update_idletasks()
+    if metrics.enabled:
+        metrics.observe("bank_ui_startup_seconds", time.perf_counter() - _IMPORT_STARTED)
+    warm_up = threading.Thread(target=get_service, name="bank-warm-up", daemon=True)
+    warm_up.start()
+    stop_export = start_configured_export()
+    try:
+        root.mainloop()
+    finally:
+        warm_up.join()
+        if _service is not None:
+            _service.close()
+        if stop_export is not None:
+            stop_export()
 
 
 if __name__ == "__main__":
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import date, datetime
 
-from .config import DATE_FORMAT
+from .config import ACCOUNT_TYPES, DATE_FORMAT, TX_TYPES
 from .errors import ValidationError
 
 
@@ -47,7 +47,7 @@ def validate_pin(pin: str) -> str:
 
 def validate_account_type(account_type: str) -> str:
     account_type = require_non_empty(account_type, "Account type")
-    if account_type not in {"Savings", "Current"}:
+    if account_type not in ACCOUNT_TYPES:
         raise ValidationError("Account type must be Savings or Current.")
     return account_type
 
@@ -83,3 +83,10 @@ def validate_amount(amount: str) -> int:
     if not amount.isdigit():
         raise ValidationError("Amount must be a positive whole number.")
     return int(amount)
+
+
+def validate_tx_type(tx_type: str) -> str:
+    tx_type = require_non_empty(tx_type, "Transaction type")
+    if tx_type not in TX_TYPES:
+        raise ValidationError(f"Transaction type must be one of: {', '.join(TX_TYPES)}.")
+    return tx_type
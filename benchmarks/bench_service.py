@@ -0,0 +1,296 @@
+"""Latency and throughput benchmarks for BankService on a seeded SQLite database.
+
+Seeds a synthetic database once per (customers, ledger) size, then times each
+service operation against a fresh copy of it and reports p50/p95/p99 latency
+and ops/sec. Results can be saved as JSON and compared against a baseline run.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import shutil
+import sqlite3
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from bank_app.config import MIN_BALANCE, SQLITE_PROFILE
+from bank_app.profiler import SQLProfiler
+from bank_app.security import hash_secret
+from bank_app.services import BankService
+from bank_app.storage import Storage, now_timestamp
+
+DEFAULT_DATA_DIR = ROOT_DIR / "benchmarks" / "data"
+SEED_CHUNK = 10_000
+BENCH_PIN = "1234"
+OPENING_BALANCE = 1_000_000
+FIRST_ACCOUNT = 10_000_000
+# Operations that hash or verify with Argon2 are orders of magnitude slower than the rest.
+HASHING_OPERATIONS = {"login", "create_customer"}
+OPERATIONS = ("login", "deposit", "withdraw", "summary", "create_customer", "delete_customer")
+
+
+def account_for(index: int) -> str:
+    return str(FIRST_ACCOUNT + index)
+
+
+def seed_database(db_path: Path, customers: int, ledger_per_customer: int, profile: str) -> None:
+    """Create ``customers`` accounts with ``ledger_per_customer`` ledger rows each.
+
+    Every customer shares one precomputed PIN hash, so seeding cost is dominated
+    by SQLite rather than Argon2.
+    """
+    pin_hash = hash_secret(BENCH_PIN)
+    storage = Storage(db_path, profile=profile)
+    storage.init_db()
+    base = datetime.now() - timedelta(days=ledger_per_customer)
+    try:
+        for start in range(0, customers, SEED_CHUNK):
+            indexes = range(start, min(start + SEED_CHUNK, customers))
+            created_at = now_timestamp()
+            storage.create_customers([
+                {
+                    "account_number": account_for(index),
+                    "pin_hash": pin_hash,
+                    "balance": OPENING_BALANCE,
+                    "created_at": created_at,
+                    "name": f"Bench User {index}",
+                    "account_type": "Savings" if index % 2 else "Current",
+                    "date_of_birth": "01/01/1990",
+                    "mobile": f"7{index:09d}",
+                    "gender": "Female" if index % 2 else "Male",
+                    "nationality": "Benchland",
+                    "kyc_document": "Passport",
+                }
+                for index in indexes
+            ])
+            if ledger_per_customer:
+                with storage.connect() as conn:
+                    conn.executemany(
+                        """
+                        INSERT INTO transactions (account_number, amount, tx_type, balance_after, created_at)
+                        VALUES (?, 0, 'deposit', ?, ?)
+                        """,
+                        [
+                            (
+                                account_for(index),
+                                OPENING_BALANCE,
+                                (base + timedelta(days=day)).isoformat(timespec="microseconds"),
+                            )
+                            for index in indexes
+                            for day in range(ledger_per_customer)
+                        ],
+                    )
+            print(f"  seeded {indexes.stop}/{customers} customers", end="\r", flush=True)
+        print()
+        # The raw ledger inserts above bypass the incremental snapshot updates.
+        storage.rebuild_snapshots()
+    finally:
+        storage.close()
+
+
+def remove_database(db_path: Path) -> None:
+    for suffix in ("", "-wal", "-shm"):
+        db_path.with_name(db_path.name + suffix).unlink(missing_ok=True)
+
+
+def prepare_database(
+    data_dir: Path,
+    customers: int,
+    ledger_per_customer: int,
+    profile: str,
+    reseed: bool,
+) -> Path:
+    """Return a fresh working copy of the seeded template, seeding it first if needed."""
+    data_dir.mkdir(parents=True, exist_ok=True)
+    template = data_dir / f"seed-{customers}-{ledger_per_customer}.db"
+    if reseed or not template.exists():
+        remove_database(template)
+        print(f"Seeding {customers} customers x {ledger_per_customer} ledger rows into {template}")
+        started = time.perf_counter()
+        seed_database(template, customers, ledger_per_customer, profile)
+        print(f"Seeded in {time.perf_counter() - started:.1f}s")
+        # Fold any WAL back in so the template is a single self-contained file.
+        with sqlite3.connect(template) as conn:
+            conn.execute("PRAGMA journal_mode = DELETE")
+    working = data_dir / "working.db"
+    remove_database(working)
+    shutil.copyfile(template, working)
+    return working
+
+
+def percentile(sorted_samples: list[float], pct: float) -> float:
+    """Nearest-rank percentile of already-sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, round(pct / 100 * len(sorted_samples)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+def measure(operation: Callable[[int], object], iterations: int) -> dict:
+    samples: list[float] = []
+    started = time.perf_counter()
+    for i in range(iterations):
+        op_started = time.perf_counter()
+        operation(i)
+        samples.append(time.perf_counter() - op_started)
+    elapsed = time.perf_counter() - started
+    samples.sort()
+    return {
+        "iterations": iterations,
+        "ops_per_sec": iterations / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def build_operations(service: BankService, customers: int, seed: int) -> dict[str, Callable[[int], object]]:
+    rng = random.Random(seed)
+    new_account_base = FIRST_ACCOUNT + customers
+
+    def random_account(_: int) -> str:
+        return account_for(rng.randrange(customers))
+
+    def login(i: int) -> object:
+        account = random_account(i)
+        if service.authenticate_customer_with_identifier(account, BENCH_PIN) != account:
+            raise RuntimeError(f"Benchmark login failed for {account}.")
+        return account
+
+    def create_customer(i: int) -> object:
+        return service.create_customer(
+            account_number=str(new_account_base + i),
+            name=f"New Bench User {i}",
+            account_type="Savings",
+            date_of_birth="01/01/1990",
+            mobile=f"8{i:09d}",
+            gender="Female",
+            nationality="Benchland",
+            kyc_document="Passport",
+            pin=BENCH_PIN,
+            initial_balance=str(MIN_BALANCE),
+        )
+
+    return {
+        "login": login,
+        "deposit": lambda i: service.deposit(random_account(i), "100"),
+        "withdraw": lambda i: service.withdraw(random_account(i), "100"),
+        "summary": lambda i: service.get_customer_summary(random_account(i)),
+        "create_customer": create_customer,
+        # Removes the accounts create_customer added, so the customer count stays at the seeded size.
+        "delete_customer": lambda i: service.delete_customer(str(new_account_base + i)),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Return a description of every operation that regressed by more than ``threshold``."""
+    regressions = []
+    for name, current in results["operations"].items():
+        previous = baseline.get("operations", {}).get(name)
+        if previous is None:
+            continue
+        if current["p95_ms"] > previous["p95_ms"] * (1 + threshold):
+            regressions.append(f"{name}: p95 {previous['p95_ms']:.3f}ms -> {current['p95_ms']:.3f}ms")
+        if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {previous['ops_per_sec']:.1f} -> {current['ops_per_sec']:.1f} ops/sec"
+            )
+    return regressions
+
+
+def print_table(results: dict) -> None:
+    print(f"{'operation':<17}{'iters':>7}{'ops/sec':>11}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, row in results["operations"].items():
+        print(f"{name:<17}{row['iterations']:>7}{row['ops_per_sec']:>11.1f}"
+              f"{row['p50_ms']:>10.3f}{row['p95_ms']:>10.3f}{row['p99_ms']:>10.3f}")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark BankService operations on a seeded database.")
+    parser.add_argument("--customers", type=int, default=10_000, help="seeded customers (10k to 1M)")
+    parser.add_argument("--ledger", type=int, default=5, help="seeded ledger rows per customer")
+    parser.add_argument("--iterations", type=int, default=1000, help="iterations per SQLite-bound operation")
+    parser.add_argument("--hash-iterations", type=int, default=20, help="iterations per Argon2-bound operation")
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--profile", default=SQLITE_PROFILE, help="SQLite connection profile")
+    parser.add_argument("--data-dir", type=Path, default=DEFAULT_DATA_DIR, help="where seeded databases live")
+    parser.add_argument("--reseed", action="store_true", help="rebuild the seeded template database")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for account selection")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression as a fraction")
+    parser.add_argument(
+        "--sql-profile",
+        action="store_true",
+        help="profile every statement, print the busiest ones and fail on full scans (slows the run)",
+    )
+    args = parser.parse_args(argv)
+    if args.customers < 1:
+        parser.error("--customers must be at least 1")
+    if "delete_customer" in args.operations and "create_customer" not in args.operations:
+        parser.error("delete_customer removes the accounts create_customer adds; select both")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    db_path = prepare_database(args.data_dir, args.customers, args.ledger, args.profile, args.reseed)
+    # slow_ms=0 captures the plan of every distinct statement the operations run.
+    profiler = SQLProfiler(slow_ms=0, log_path=None) if args.sql_profile else None
+    service = BankService(Storage(db_path, profile=args.profile, profiler=profiler))
+    operations = build_operations(service, args.customers, args.seed)
+    results = {
+        "meta": {
+            "customers": args.customers,
+            "ledger_per_customer": args.ledger,
+            "profile": args.profile,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "timestamp": now_timestamp(),
+        },
+        "operations": {},
+    }
+    try:
+        for name in OPERATIONS:
+            if name not in args.operations:
+                continue
+            iterations = args.hash_iterations if name in HASHING_OPERATIONS else args.iterations
+            if name == "delete_customer":
+                iterations = results["operations"]["create_customer"]["iterations"]
+            results["operations"][name] = measure(operations[name], iterations)
+    finally:
+        service.close()
+
+    print_table(results)
+    if profiler is not None:
+        print()
+        print(profiler.report())
+        scans = profiler.full_scans()
+        for query in scans:
+            print(f"FULL SCAN {'; '.join(query.full_scans)}: {query.sql}")
+        if scans:
+            return 1
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Cold-start benchmark: how long until the UI module is importable and the service is ready.
+
+Each sample runs in a fresh interpreter against a fresh database directory, so it
+measures what a teller sees when launching the app. No display is needed; the Tk
+window itself is not created.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from bench_service import ROOT_DIR, compare, percentile, print_table
+
+PROBE = """
+import json, time
+started = time.perf_counter()
+import bank_app.ui as ui
+imported = time.perf_counter()
+ui.get_service().close()
+ready = time.perf_counter()
+print(json.dumps({"import_ui": imported - started, "first_service": ready - imported}))
+"""
+
+
+def sample(db_dir: Path) -> dict[str, float]:
+    env = {**os.environ, "BANKAPP_DB_PATH": str(db_dir / "bank.db")}
+    completed = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=ROOT_DIR, env=env, check=True, capture_output=True, text=True
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples: list[float]) -> dict:
+    samples = sorted(samples)
+    total = sum(samples)
+    return {
+        "iterations": len(samples),
+        "ops_per_sec": len(samples) / total if total > 0 else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure UI import and first-service cold-start time.")
+    parser.add_argument("--runs", type=int, default=10, help="fresh interpreters to sample")
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--baseline", type=Path, help="JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed regression as a fraction")
+    args = parser.parse_args(argv)
+
+    timings: dict[str, list[float]] = {"import_ui": [], "first_service": []}
+    for _ in range(args.runs):
+        with tempfile.TemporaryDirectory() as db_dir:
+            for name, seconds in sample(Path(db_dir)).items():
+                timings[name].append(seconds)
+    results = {
+        "meta": {"runs": args.runs, "python": platform.python_version()},
+        "operations": {name: summarize(samples) for name, samples in timings.items()},
+    }
+
+    print_table(results)
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"Results written to {args.output}")
+    if args.baseline:
+        regressions = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
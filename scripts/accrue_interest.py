@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from bank_app.config import DB_PATH, INTEREST_CHUNK_SIZE, SAVINGS_INTEREST_BPS
+from bank_app.interest import accrue_interest, validate_period
+from bank_app.storage import Storage
+
+
+def previous_month() -> str:
+    return (date.today().replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Post monthly interest to every Savings account.")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="SQLite database")
+    parser.add_argument("--period", default=previous_month(), help="month to accrue, YYYY-MM (default last month)")
+    parser.add_argument("--rate-bps", type=int, default=SAVINGS_INTEREST_BPS, help="annual rate in basis points")
+    parser.add_argument("--chunk-size", type=int, default=INTEREST_CHUNK_SIZE, help="accounts per transaction")
+    args = parser.parse_args(argv)
+    try:
+        args.period = validate_period(args.period)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.rate_bps < 0:
+        parser.error("--rate-bps cannot be negative")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if not args.db.exists():
+        print(f"No database found at {args.db}")
+        return 1
+    storage = Storage(args.db)
+    try:
+        storage.init_db()
+        run = accrue_interest(
+            storage,
+            args.period,
+            rate_bps=args.rate_bps,
+            chunk_size=args.chunk_size,
+            progress=lambda accounts, total: print(f"  credited {accounts} accounts", end="\r", flush=True),
+        )
+    except ValueError as exc:
+        print(exc)
+        return 1
+    finally:
+        storage.close()
+    print()
+    print(f"Interest for {run.period} at {run.rate_bps} bps: {run.accounts} accounts credited, "
+          f"{run.total} in total ({run.elapsed:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
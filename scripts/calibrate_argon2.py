@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from bank_app.config import ARGON2_PROFILE, ARGON2_PROFILES, CREDENTIAL_WORKERS
+from bank_app.security import build_hasher, resolve_argon2_profile
+
+MIN_MEMORY_KIB = 19456  # OWASP floor for Argon2id; below this, raise time_cost instead
+MAX_TIME_COST = 20
+SAMPLE_SECRET = "calibration-secret"
+
+
+def verify_latency(params: dict[str, int], samples: int) -> float:
+    """Median seconds for one verify with ``params`` on this host."""
+    hasher = build_hasher(params)
+    stored = hasher.hash(SAMPLE_SECRET)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.verify(stored, SAMPLE_SECRET)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def calibrate(
+    target_ms: float,
+    memory_kib: int,
+    parallelism: int,
+    samples: int = 3,
+) -> tuple[dict[str, int], float]:
+    """Pick the highest time_cost whose verify stays within ``target_ms``.
+
+    Memory is fixed by the caller's budget. If even time_cost=1 is too slow,
+    memory is halved (down to MIN_MEMORY_KIB) before giving up.
+    """
+    while True:
+        best: tuple[dict[str, int], float] | None = None
+        for time_cost in range(1, MAX_TIME_COST + 1):
+            params = resolve_argon2_profile(
+                {"time_cost": time_cost, "memory_cost": memory_kib, "parallelism": parallelism}
+            )
+            latency = verify_latency(params, samples)
+            print(f"  t={time_cost} m={memory_kib // 1024} MiB p={parallelism}: {latency * 1000:.1f} ms")
+            if latency * 1000 > target_ms:
+                break
+            best = (params, latency)
+        if best is not None:
+            return best
+        if memory_kib <= MIN_MEMORY_KIB:
+            return params, latency
+        memory_kib = max(MIN_MEMORY_KIB, memory_kib // 2)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Tune Argon2 cost parameters for this host.")
+    parser.add_argument("--target-ms", type=float, default=250.0, help="target verify latency per login")
+    parser.add_argument("--profile", default=ARGON2_PROFILE, choices=sorted(ARGON2_PROFILES),
+                        help="profile whose memory and parallelism are the starting point")
+    parser.add_argument("--memory-budget-mib", type=int,
+                        help="RAM available to concurrent logins; memory per hash is this / --concurrency")
+    parser.add_argument("--concurrency", type=int, default=CREDENTIAL_WORKERS,
+                        help="concurrent hashes to budget for (default: BANKAPP_CREDENTIAL_WORKERS)")
+    parser.add_argument("--samples", type=int, default=3, help="verifies timed per candidate")
+    args = parser.parse_args(argv)
+    if args.target_ms <= 0 or args.samples < 1 or args.concurrency < 1:
+        parser.error("--target-ms, --samples and --concurrency must be positive")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    start = resolve_argon2_profile(args.profile)
+    memory_kib = start["memory_cost"]
+    if args.memory_budget_mib:
+        memory_kib = min(memory_kib, args.memory_budget_mib * 1024 // args.concurrency)
+    memory_kib = max(memory_kib, MIN_MEMORY_KIB)
+
+    print(f"Calibrating for {args.target_ms:.0f} ms per verify, starting from the {args.profile!r} profile")
+    params, latency = calibrate(args.target_ms, memory_kib, start["parallelism"], args.samples)
+    if latency * 1000 > args.target_ms:
+        print(f"Could not reach {args.target_ms:.0f} ms; the cheapest allowed setting takes {latency * 1000:.1f} ms.")
+    else:
+        print(f"Selected {params} at {latency * 1000:.1f} ms per verify.")
+    print("\nSet these environment variables to apply it:")
+    for key, value in params.items():
+        print(f"BANKAPP_ARGON2_{key.upper()}={value}")
+    print("Existing hashes are upgraded to the new parameters at each user's next successful login.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from bank_app.config import DATE_FORMAT, DB_PATH, REPORT_CHUNK_SIZE
+from bank_app.errors import ValidationError
+from bank_app.reports import build_daily_report, write_csv, write_json
+from bank_app.storage import Storage
+from bank_app.validation import parse_date
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build the end-of-day ledger and balance report.")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="SQLite database to report on")
+    parser.add_argument("--date", help=f"day to report ({DATE_FORMAT}, default yesterday)")
+    parser.add_argument("--chunk-size", type=int, default=REPORT_CHUNK_SIZE, help="rows per NumPy chunk")
+    parser.add_argument("--top", type=int, default=10, help="number of top movers")
+    parser.add_argument("--json", type=Path, help="write the report as JSON")
+    parser.add_argument("--csv-dir", type=Path, help="write one CSV per report table into this directory")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1 or args.top < 1:
+        parser.error("--chunk-size and --top must be at least 1")
+    try:
+        args.day = parse_date(args.date, "Date").value if args.date else date.today() - timedelta(days=1)
+    except ValidationError as exc:
+        parser.error(str(exc))
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if not args.db.exists():
+        print(f"No database found at {args.db}")
+        return 1
+    storage = Storage(args.db)
+    try:
+        storage.init_db()
+        start = time.perf_counter()
+        report = build_daily_report(storage, args.day, chunk_size=args.chunk_size, top=args.top)
+        elapsed = time.perf_counter() - start
+    finally:
+        storage.close()
+
+    print(f"Report for {report['date']} built in {elapsed:.2f}s")
+    for row in report["transactions"]:
+        print(f"  {row['tx_type']:<10} {row['account_type']:<8} {row['count']:>9} txns {row['amount']:>15}")
+    balances = report["balances"]
+    print(f"  {balances['accounts']} accounts, {balances['below_minimum']} below the minimum balance")
+    if args.json:
+        write_json(report, args.json)
+        print(f"JSON written to {args.json}")
+    if args.csv_dir:
+        for path in write_csv(report, args.csv_dir):
+            print(f"CSV written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,92 +1,197 @@
 from __future__ import annotations
 
+import argparse
+import json
+import os
+import time
+from collections import Counter
+from itertools import islice
 from pathlib import Path
 import sys
+from typing import Iterable, Iterator
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT_DIR))
 
 from bank_app.config import DB_PATH
-from bank_app.errors import ServiceError
+from bank_app.security import BatchHasher
 from bank_app.services import BankService
 
+DEFAULT_CHUNK_SIZE = 1000
+DEFAULT_CHECKPOINT = Path("migrate_legacy.checkpoint.json")
+INCOMPLETE_RECORD = "Incomplete record."
 
-def parse_records(lines: list[str]) -> list[list[str]]:
-    records: list[list[str]] = []
+
+def iter_records(lines: Iterable[str]) -> Iterator[list[str]]:
+    """Yield '*'-delimited records one at a time from an iterable of lines."""
     current: list[str] = []
     for line in lines:
+        line = line.strip()
+        if not line:
+            continue
         if line == "*":
             if current:
-                records.append(current)
+                yield current
                 current = []
             continue
         current.append(line)
     if current:
-        records.append(current)
-    return records
+        yield current
 
 
-def migrate_admins(service: BankService, path: Path) -> None:
-    if not path.exists():
-        print(f"No admin file found at {path}")
-        return
-    lines = [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
-    for record in parse_records(lines):
-        if len(record) < 2:
-            continue
-        admin_id, password = record[0], record[1]
-        try:
-            service.create_admin(admin_id, password)
-            print(f"Imported admin: {admin_id}")
-        except ServiceError as exc:
-            print(f"Skipped admin {admin_id}: {exc}")
+def customer_from_record(record: list[str]) -> dict | None:
+    if len(record) < 11:
+        return None
+    (
+        account_number,
+        pin,
+        balance,
+        _created_at,
+        name,
+        account_type,
+        date_of_birth,
+        mobile,
+        gender,
+        nationality,
+        kyc_document,
+        *_rest,
+    ) = record
+    return {
+        "account_number": account_number,
+        "name": name,
+        "account_type": account_type,
+        "date_of_birth": date_of_birth,
+        "mobile": mobile,
+        "gender": gender,
+        "nationality": nationality,
+        "kyc_document": kyc_document,
+        "pin": pin,
+        "initial_balance": balance,
+    }
+
+
+def admin_from_record(record: list[str]) -> tuple[str, str] | None:
+    if len(record) < 2:
+        return None
+    return record[0], record[1]
+
+
+def chunked(items: Iterable, size: int) -> Iterator[list]:
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+class Checkpoint:
+    """Records how many records of each source file are committed, so a rerun can resume."""
+
+    def __init__(self, path: Path, enabled: bool = True):
+        self.path = path
+        self.enabled = enabled
+        self._state: dict[str, int] = {}
+        if enabled and path.exists():
+            self._state = json.loads(path.read_text(encoding="utf-8"))
+
+    def done(self, source: Path) -> int:
+        return self._state.get(str(source.resolve()), 0)
 
+    def advance(self, source: Path, records_done: int) -> None:
+        if not self.enabled:
+            return
+        self._state[str(source.resolve())] = records_done
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._state, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.path)
 
-def migrate_customers(service: BankService, path: Path) -> None:
+
+class Report:
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.seen = 0
+        self.imported = 0
+        self.resumed = 0
+        self.skip_reasons: Counter[str] = Counter()
+        self.started = time.perf_counter()
+
+    def add(self, result: dict, incomplete: int) -> None:
+        self.imported += len(result["imported"])
+        self.skip_reasons.update(reason for _, reason in result["skipped"])
+        if incomplete:
+            self.skip_reasons[INCOMPLETE_RECORD] += incomplete
+
+    def print(self, dry_run: bool) -> None:
+        elapsed = time.perf_counter() - self.started
+        rate = self.seen / elapsed if elapsed > 0 else 0.0
+        verb = "Would import" if dry_run else "Imported"
+        print(f"{self.kind.capitalize()}s: {self.seen} read, {verb.lower()} {self.imported}, "
+              f"skipped {sum(self.skip_reasons.values())}, resumed past {self.resumed}")
+        print(f"  {rate:.1f} rows/sec over {elapsed:.1f}s")
+        for reason, count in self.skip_reasons.most_common():
+            print(f"  skipped {count}: {reason}")
+
+
+def migrate_file(
+    service: BankService,
+    path: Path,
+    kind: str,
+    hasher: BatchHasher,
+    checkpoint: Checkpoint,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    dry_run: bool = False,
+) -> Report | None:
+    """Stream ``path`` through the bulk import in chunks, committing one chunk per transaction."""
     if not path.exists():
-        print(f"No customer file found at {path}")
-        return
-    lines = [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
-    for record in parse_records(lines):
-        if len(record) < 11:
-            continue
-        (
-            account_number,
-            pin,
-            balance,
-            _created_at,
-            name,
-            account_type,
-            date_of_birth,
-            mobile,
-            gender,
-            nationality,
-            kyc_document,
-            *_rest,
-        ) = record
-        try:
-            service.create_customer(
-                account_number=account_number,
-                name=name,
-                account_type=account_type,
-                date_of_birth=date_of_birth,
-                mobile=mobile,
-                gender=gender,
-                nationality=nationality,
-                kyc_document=kyc_document,
-                pin=pin,
-                initial_balance=balance,
-            )
-            print(f"Imported customer: {account_number}")
-        except ServiceError as exc:
-            print(f"Skipped customer {account_number}: {exc}")
-
-
-def main() -> None:
-    service = BankService.create_default(DB_PATH)
-    migrate_admins(service, Path("database/Admin/adminDatabase.txt"))
-    migrate_customers(service, Path("database/Customer/customerDatabase.txt"))
-    print("Migration complete.")
+        print(f"No {kind} file found at {path}")
+        return None
+    convert = customer_from_record if kind == "customer" else admin_from_record
+    importer = service.import_customers if kind == "customer" else service.import_admins
+    report = Report(kind)
+    done = checkpoint.done(path)
+
+    with path.open(encoding="utf-8") as handle:
+        records = iter_records(handle)
+        report.resumed = sum(1 for _ in islice(records, done))
+        for chunk in chunked(records, chunk_size):
+            converted = [convert(record) for record in chunk]
+            valid = [item for item in converted if item is not None]
+            result = importer(valid, hasher=hasher, dry_run=dry_run)
+            report.seen += len(chunk)
+            report.add(result, incomplete=len(converted) - len(valid))
+            checkpoint.advance(path, done + report.seen)
+    return report
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import legacy flat-file admins and customers into SQLite.")
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="target SQLite database")
+    parser.add_argument("--admins", type=Path, default=Path("database/Admin/adminDatabase.txt"))
+    parser.add_argument("--customers", type=Path, default=Path("database/Customer/customerDatabase.txt"))
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="records per transaction")
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT, help="resume state file")
+    parser.add_argument("--restart", action="store_true", help="ignore any existing checkpoint")
+    parser.add_argument("--workers", type=int, default=0, help="hashing processes (0 = one per core)")
+    parser.add_argument("--dry-run", action="store_true", help="validate only; nothing is hashed or written")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    return args
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    if args.restart and args.checkpoint.exists() and not args.dry_run:
+        args.checkpoint.unlink()
+    checkpoint = Checkpoint(args.checkpoint, enabled=not args.dry_run)
+    service = BankService.create_default(args.db)
+    try:
+        with BatchHasher(args.workers) as hasher:
+            for path, kind in ((args.admins, "admin"), (args.customers, "customer")):
+                report = migrate_file(service, path, kind, hasher, checkpoint, args.chunk_size, args.dry_run)
+                if report is not None:
+                    report.print(args.dry_run)
+    finally:
+        service.close()
+    print("Dry run complete." if args.dry_run else "Migration complete.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT_DIR))
+
+from bank_app.config import DB_PATH
+from bank_app.storage import Storage
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Recompute the daily balance and totals snapshots from the customers and transactions tables.",
+    )
+    parser.add_argument("--db", type=Path, default=DB_PATH, help="SQLite database to rebuild")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if not args.db.exists():
+        print(f"No database found at {args.db}")
+        return 1
+    storage = Storage(args.db)
+    try:
+        storage.init_db()
+        start = time.perf_counter()
+        rows = storage.rebuild_snapshots()
+        print(f"Rebuilt {rows} daily balances in {time.perf_counter() - start:.1f}s")
+    finally:
+        storage.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,40 @@
+import pytest
+
+from bank_app.config import MIN_BALANCE
+
+
+def make_customer_record(account_number, **overrides):
+    """Arguments for BankService.create_customer, also the API's and import_customers' payload."""
+    record = {
+        "account_number": account_number,
+        "name": f"User {account_number}",
+        "account_type": "Savings",
+        "date_of_birth": "01/01/2000",
+        "mobile": "1234567890",
+        "gender": "Female",
+        "nationality": "Testland",
+        "kyc_document": "Passport",
+        "pin": "1234",
+        "initial_balance": str(MIN_BALANCE),
+    }
+    record.update(overrides)
+    return record
+
+
+def make_customer_row(account_number, balance=MIN_BALANCE, created_at="2024-05-01T08:00:00.000000", **overrides):
+    """A row for Storage.create_customers: the PIN is already hashed and the balance is taken as is."""
+    record = make_customer_record(account_number)
+    del record["pin"], record["initial_balance"]
+    record.update(pin_hash="h", balance=balance, created_at=created_at)
+    record.update(overrides)
+    return record
+
+
+@pytest.fixture
+def customer_record():
+    return make_customer_record
+
+
+@pytest.fixture
+def customer_row():
+    return make_customer_row
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+
+import pytest
+
+from bank_app.aio import AsyncBankService
+from bank_app.config import MIN_BALANCE
+from bank_app.errors import BusinessRuleError, NotFoundError, ValidationError
+from bank_app.security import BatchHasher
+
+
+def test_async_operations_keep_service_errors(tmp_path, customer_record):
+    async def scenario():
+        async with AsyncBankService.create_default(tmp_path / "bank.db") as bank:
+            await bank.create_customer(**customer_record("30001"))
+            assert await bank.authenticate_customer_with_identifier("30001", "1234") == "30001"
+            assert await bank.deposit("30001", "250") == MIN_BALANCE + 250
+            with pytest.raises(BusinessRuleError):
+                await bank.withdraw("30001", "1000")
+            with pytest.raises(NotFoundError):
+                await bank.get_balance("39999")
+            with pytest.raises(ValidationError):
+                await bank.deposit("30001", "-5")
+
+    asyncio.run(scenario())
+
+
+def test_login_storm_does_not_starve_deposits(tmp_path, customer_record):
+    gate = threading.Event()
+
+    async def scenario():
+        async with AsyncBankService.create_default(tmp_path / "bank.db", io_workers=2, hash_workers=1) as bank:
+            await bank.create_customer(**customer_record("30002"))
+
+            def slow_login(identifier, pin):
+                gate.wait(10)
+                return identifier
+
+            bank.service.authenticate_customer_with_identifier = slow_login
+            logins = [asyncio.create_task(bank.authenticate_customer_with_identifier("30002", "1234"))
+                      for _ in range(5)]
+            # The hash lane is saturated and blocked, yet every deposit completes.
+            balances = await asyncio.wait_for(
+                asyncio.gather(*(bank.deposit("30002", "10") for _ in range(20))), timeout=10
+            )
+            assert max(balances) == MIN_BALANCE + 200
+            assert not any(task.done() for task in logins)
+            gate.set()
+            assert await asyncio.gather(*logins) == ["30002"] * 5
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_calls_waiting_for_a_slot_never_run(tmp_path):
+    gate = threading.Event()
+    started = []
+
+    async def scenario():
+        async with AsyncBankService.create_default(tmp_path / "bank.db", hash_workers=1) as bank:
+            def blocking_change_pin(account_number, new_pin):
+                started.append(new_pin)
+                gate.wait(10)
+
+            bank.service.change_pin = blocking_change_pin
+            running = asyncio.create_task(bank.change_pin("30003", "1111"))
+            waiting = asyncio.create_task(bank.change_pin("30003", "2222"))
+            await asyncio.sleep(0.1)
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+            gate.set()
+            await running
+
+    asyncio.run(scenario())
+    assert started == ["1111"]
+
+
+def test_directory_search(tmp_path, customer_record):
+    async def scenario():
+        async with AsyncBankService.create_default(tmp_path / "bank.db") as bank:
+            for n in range(3):
+                await bank.create_customer(**customer_record(f"3100{n}", name=f"Dir User {n}", mobile=f"98765432{n}0"))
+            page = await bank.search_customers("dir", limit=2)
+            assert [item["account_number"] for item in page["items"]] == ["31000", "31001"]
+            assert page["has_more"] is True
+            with pytest.raises(ValidationError):
+                await bank.search_customers(field="balance")
+            assert await bank.rebuild_snapshots() == 3
+
+    asyncio.run(scenario())
+
+
+def test_bulk_operations_run_on_the_hash_lane(tmp_path, customer_record):
+    async def scenario():
+        async with AsyncBankService.create_default(tmp_path / "bank.db") as bank:
+            with BatchHasher(workers=2) as hasher:
+                imported = await bank.import_customers(
+                    [customer_record(f"3200{n}", mobile=f"98765433{n}0") for n in range(3)], hasher=hasher
+                )
+                assert imported["imported"] == ["32000", "32001", "32002"]
+                assert (await bank.import_admins([("ops", "secret1")], hasher=hasher))["imported"] == ["ops"]
+                assert (await bank.reset_pins({"32000": "4321"}, hasher=hasher))["updated"] == ["32000"]
+            assert await bank.authenticate_customer("32000", "4321") is True
+            assert await bank.authenticate_admin("ops", "secret1") is True
+
+    asyncio.run(scenario())
@@ -0,0 +1,113 @@
+from datetime import date
+
+import pytest
+
+from bank_app.interest import accrue_interest, period_end, validate_period
+from bank_app.storage import INTEREST_CHUNK_SQL, Storage
+
+OPENED_AT = "2024-04-15T09:00:00.000000"
+
+
+@pytest.fixture
+def storage(tmp_path, customer_row):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    storage.create_customers([
+        customer_row("1001", 120_000, OPENED_AT),
+        customer_row("1002", 240_000, OPENED_AT, account_type="Current"),
+        customer_row("1003", 1_000_000, OPENED_AT),
+        customer_row("1004", 100, OPENED_AT),  # earns less than one unit
+        customer_row("1005", 360_000, OPENED_AT),
+    ])
+    yield storage
+    storage.close()
+
+
+def balances(storage):
+    with storage.connect() as conn:
+        return dict(conn.execute("SELECT account_number, balance FROM customers").fetchall())
+
+
+def test_interest_is_posted_to_savings_accounts_only(storage):
+    # Money that arrives after the period closes does not earn interest for it.
+    storage.update_balance_with_transaction("1001", 60_000, "deposit")
+    run = accrue_interest(storage, "2024-05", rate_bps=600, chunk_size=2)
+
+    # 6% a year is 0.5% a month of the closing balance on 31 May, rounded down.
+    assert balances(storage) == {
+        "1001": 180_600, "1002": 240_000, "1003": 1_005_000, "1004": 100, "1005": 361_800,
+    }
+    assert (run.accounts, run.total) == (3, 600 + 5_000 + 1_800)
+    with storage.connect() as conn:
+        ledger = conn.execute(
+            "SELECT account_number, amount, tx_type, balance_after FROM transactions "
+            "WHERE tx_type = 'interest' ORDER BY account_number"
+        ).fetchall()
+    assert [tuple(row) for row in ledger] == [
+        ("1001", 600, "interest", 180_600),
+        ("1003", 5_000, "interest", 1_005_000),
+        ("1005", 1_800, "interest", 361_800),
+    ]
+    [today] = storage.list_daily_totals(date.today(), date.today())
+    assert (today["credits"], today["debits"], today["tx_count"]) == (60_000 + 7_400, 0, 4)
+
+
+def test_accounts_opened_after_the_period_earn_nothing_for_it(storage, customer_row):
+    storage.create_customers([customer_row("1006", 500_000, "2024-06-02T09:00:00.000000")])
+    accrue_interest(storage, "2024-05", rate_bps=600)
+    assert balances(storage)["1006"] == 500_000
+    accrue_interest(storage, "2024-06", rate_bps=600)
+    assert balances(storage)["1006"] == 502_500
+
+
+def test_interest_is_idempotent_per_period(storage):
+    first = accrue_interest(storage, "2024-05", rate_bps=600, chunk_size=2)
+    after_first = balances(storage)
+    again = accrue_interest(storage, "2024-05", rate_bps=600, chunk_size=2)
+    assert balances(storage) == after_first
+    assert (again.accounts, again.total) == (first.accounts, first.total)
+
+    with pytest.raises(ValueError):
+        accrue_interest(storage, "2024-05", rate_bps=700)
+    accrue_interest(storage, "2024-06", rate_bps=600)
+    assert balances(storage)["1001"] == 120_600 + 600
+
+
+def test_interrupted_run_resumes_from_checkpoint(storage, customer_row):
+    storage.start_interest_run("2024-05", 600)
+    run = storage.accrue_interest_chunk("2024-05", period_end("2024-05"), chunk_size=2)
+    assert (run["last_account"], run["accounts"], run["completed_at"]) == ("1003", 2, None)
+    # An account added mid-run (here, a backdated import) is still picked up when the run resumes.
+    storage.create_customers([customer_row("1006", 120_000, OPENED_AT)])
+
+    resumed = accrue_interest(storage, "2024-05", rate_bps=600, chunk_size=2)
+    assert (resumed.accounts, resumed.total) == (4, 600 + 5_000 + 1_800 + 600)
+    assert balances(storage)["1001"] == 120_600
+
+    # The chunks kept the snapshots exactly as a full rebuild computes them.
+    today = date.today()
+    incremental = [tuple(row) for row in storage.list_daily_totals(today, today)]
+    storage.rebuild_snapshots()
+    assert [tuple(row) for row in storage.list_daily_totals(today, today)] == incremental
+
+
+def test_interest_chunks_seek_indexes(storage):
+    params = {"period_end": "2024-05-31", "rate_bps": 600, "account_type": "Savings", "after": "", "limit": 10}
+    plan = storage.explain_query_plan(INTEREST_CHUNK_SQL, params)
+    assert any("SEARCH customers USING INDEX idx_customers_type_account" in step for step in plan)
+    assert any("SEARCH daily_balances USING PRIMARY KEY" in step for step in plan)
+    assert not [step for step in plan if step.startswith("SCAN") or "TEMP B-TREE" in step]
+
+
+@pytest.mark.parametrize("period", ["2024-13", "2024-5", "May 2024", ""])
+def test_invalid_periods_are_rejected(period):
+    with pytest.raises(ValueError):
+        validate_period(period)
+
+
+def test_only_finished_months_can_be_accrued():
+    assert validate_period("2024-05", today=date(2024, 6, 1)) == "2024-05"
+    assert period_end("2024-12") == date(2024, 12, 31)
+    for period in ("2024-06", "2999-12"):
+        with pytest.raises(ValueError, match="month has ended"):
+            validate_period(period, today=date(2024, 6, 30))
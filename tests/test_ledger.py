@@ -0,0 +1,79 @@
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bank_app.config import MIN_BALANCE
+from bank_app.errors import BusinessRuleError, NotFoundError
+from bank_app.ledger import LedgerWriter
+from bank_app.services import BankService
+from bank_app.storage import Storage, now_timestamp
+
+
+def seeded_storage(tmp_path, *accounts):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    for account_number in accounts:
+        storage.create_customer(
+            account_number, "h", 1000, now_timestamp(), "A", "Savings", "01/01/2000", "1234567890", "Male", "X",
+            "Passport",
+        )
+    return storage
+
+
+def test_queued_changes_share_one_commit(tmp_path):
+    storage = seeded_storage(tmp_path, "1")
+    writer = LedgerWriter(storage)
+    blocker = sqlite3.connect(tmp_path / "bank.db", isolation_level=None)
+    blocker.execute("BEGIN IMMEDIATE")
+    # The first change stalls on the write lock; everything submitted meanwhile joins the next group.
+    futures = [writer.submit("1", 10, "deposit") for _ in range(50)]
+    blocker.execute("COMMIT")
+    blocker.close()
+    balances = [future.result(timeout=30) for future in futures]
+    writer.close()
+
+    assert sorted(balances) == list(range(1010, 1510, 10))
+    assert writer.groups_committed <= 2
+    assert storage.get_customer("1")["balance"] == 1500
+    with storage.connect() as conn:
+        assert conn.execute("SELECT count(*) FROM transactions").fetchone()[0] == 50
+    storage.close()
+
+
+def test_failures_do_not_affect_the_rest_of_the_group(tmp_path):
+    storage = seeded_storage(tmp_path, "1", "2")
+    writer = LedgerWriter(storage, max_wait_ms=50)
+    missing = writer.submit("9", 10, "deposit")
+    guarded = writer.submit("1", -900, "withdraw", min_balance=500)
+    applied = writer.submit("2", -100, "withdraw", min_balance=500)
+    with pytest.raises(ValueError):
+        missing.result(timeout=30)
+    assert guarded.result(timeout=30) is None
+    assert applied.result(timeout=30) == 900
+    writer.close()
+    with pytest.raises(RuntimeError):
+        writer.submit("1", 10, "deposit")
+    storage.close()
+
+
+def test_service_routes_balance_changes_through_the_writer(tmp_path, customer_record):
+    service = BankService(Storage(tmp_path / "bank.db", pool_size=8), ledger_writer=True)
+    service.create_customer(**customer_record("60001", initial_balance=str(MIN_BALANCE + 1000)))
+    withdrawals = []
+
+    def withdraw(_):
+        try:
+            service.withdraw("60001", "100")
+            withdrawals.append(True)
+        except BusinessRuleError:
+            pass
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(withdraw, range(20)))
+    assert len(withdrawals) == 10
+    assert service.get_balance("60001") == MIN_BALANCE
+    with pytest.raises(NotFoundError):
+        service.deposit("69999", "10")
+    service.close()
+    assert service.ledger.groups_committed >= 1
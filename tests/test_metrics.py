@@ -0,0 +1,99 @@
+import json
+from http import HTTPStatus
+
+import pytest
+
+from bank_app.errors import BusinessRuleError, NotFoundError
+from bank_app.metrics import MetricsRegistry, metrics
+from bank_app.server import BankAPI
+from bank_app.services import BankService
+from bank_app.storage import Storage
+
+
+@pytest.fixture
+def enabled_metrics(monkeypatch):
+    metrics.reset()
+    monkeypatch.setattr(metrics, "enabled", True)
+    yield metrics
+    metrics.reset()
+
+
+def series(snapshot, kind, name, **labels):
+    return next(item for item in snapshot[kind][name] if item["labels"] == labels)
+
+
+def test_histogram_buckets_are_cumulative_in_prometheus_text():
+    registry = MetricsRegistry(enabled=True)
+    registry.observe("bank_sql_seconds", 0.0002)
+    registry.observe("bank_sql_seconds", 0.003)
+    registry.increment("bank_service_errors_total", method="withdraw", error="BusinessRuleError")
+
+    text = registry.to_prometheus()
+    assert "# TYPE bank_sql_seconds histogram" in text
+    assert 'bank_sql_seconds_bucket{le="0.0005"} 1' in text
+    assert 'bank_sql_seconds_bucket{le="0.005"} 2' in text
+    assert 'bank_sql_seconds_bucket{le="+Inf"} 2' in text
+    assert "bank_sql_seconds_count 2" in text
+    assert 'bank_service_errors_total{error="BusinessRuleError",method="withdraw"} 1' in text
+
+    histogram = registry.snapshot()["histograms"]["bank_sql_seconds"][0]
+    assert histogram["count"] == 2
+    assert histogram["buckets"]["+Inf"] == 2
+
+
+def test_disabled_registry_records_nothing(tmp_path, customer_record):
+    metrics.reset()
+    assert metrics.enabled is False
+    service = BankService(Storage(tmp_path / "bank.db"))
+    service.create_customer(**customer_record("1001"))
+    service.deposit("1001", "100")
+    service.close()
+    assert metrics.snapshot()["histograms"] == {}
+    assert metrics.snapshot()["counters"] == {}
+
+
+def test_service_calls_record_latency_errors_and_time_split(tmp_path, enabled_metrics, customer_record):
+    service = BankService(Storage(tmp_path / "bank.db"))
+    service.create_customer(**customer_record("1001"))
+    service.deposit("1001", "100")
+    with pytest.raises(BusinessRuleError):
+        service.withdraw("1001", "1000000")
+    with pytest.raises(NotFoundError):
+        service.get_balance("9999")
+    assert service.authenticate_customer("1001", "1234") is True
+    service.close()
+
+    snapshot = enabled_metrics.snapshot()
+    assert series(snapshot, "histograms", "bank_service_call_seconds", method="deposit")["count"] == 1
+    assert series(snapshot, "histograms", "bank_service_call_seconds", method="withdraw")["count"] == 1
+    errors = {(item["labels"]["method"], item["labels"]["error"]): item["value"]
+              for item in snapshot["counters"]["bank_service_errors_total"]}
+    assert errors == {("withdraw", "BusinessRuleError"): 1, ("get_balance", "NotFoundError"): 1}
+
+    assert series(snapshot, "histograms", "bank_argon2_seconds", op="hash")["count"] >= 1
+    assert series(snapshot, "histograms", "bank_argon2_seconds", op="verify")["count"] == 1
+    sql = series(snapshot, "histograms", "bank_sql_seconds")
+    wait = series(snapshot, "histograms", "bank_pool_wait_seconds")
+    assert sql["count"] >= 4
+    assert wait["count"] == sql["count"]
+
+
+def test_metrics_route_and_file_export(tmp_path, enabled_metrics):
+    service = BankService(Storage(tmp_path / "bank.db"))
+    api = BankAPI(service, "token")
+    api.dispatch("GET", "/health", "Bearer token", b"")
+    service.admin_exists()
+
+    status, text = api.dispatch("GET", "/metrics", "Bearer token", b"")
+    assert status == HTTPStatus.OK
+    assert 'bank_service_call_seconds_count{method="admin_exists"} 1' in text
+    status, snapshot = api.dispatch("GET", "/metrics?format=json", "Bearer token", b"")
+    assert series(snapshot, "histograms", "bank_service_call_seconds", method="admin_exists")["count"] == 1
+    assert api.dispatch("GET", "/metrics", None, b"")[0] == HTTPStatus.UNAUTHORIZED
+    service.close()
+
+    stop = enabled_metrics.start_file_export(tmp_path / "bank.prom", interval=60)
+    stop()
+    assert "bank_service_call_seconds_bucket" in (tmp_path / "bank.prom").read_text()
+    enabled_metrics.write_json(tmp_path / "bank.json")
+    assert json.loads((tmp_path / "bank.json").read_text())["enabled"] is True
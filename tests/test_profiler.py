@@ -0,0 +1,81 @@
+import json
+import sqlite3
+
+from bank_app.profiler import ProfilingConnection, SQLProfiler
+from bank_app.services import BankService
+from bank_app.storage import Storage
+
+
+def test_profiling_is_off_by_default(tmp_path):
+    storage = Storage(tmp_path / "bank.db")
+    assert storage.profiler is None
+    with storage.connect() as conn:
+        assert type(conn) is sqlite3.Connection
+    storage.close()
+
+
+def test_statements_are_timed_with_row_counts(tmp_path):
+    profiler = SQLProfiler(slow_ms=10_000, log_path=tmp_path / "slow.log")
+    storage = Storage(tmp_path / "bank.db", profiler=profiler)
+    storage.init_db()
+    with storage.connect() as conn:
+        assert isinstance(conn, ProfilingConnection)
+        conn.executemany(
+            "INSERT INTO admins (username, password_hash, created_at) VALUES (?, ?, ?)",
+            [(f"admin{i}", "hash", "2024-01-01") for i in range(3)],
+        )
+        assert len(conn.execute("SELECT * FROM admins").fetchall()) == 3
+        # Read only partly: the record is closed when the connection goes back to the pool.
+        conn.execute("SELECT username FROM admins ORDER BY username").fetchone()
+    storage.close()
+
+    stats = {item.sql: item for item in profiler.stats()}
+    assert stats["SELECT * FROM admins"].rows == 3
+    assert stats["SELECT username FROM admins ORDER BY username"].rows == 1
+    assert stats["INSERT INTO admins (username, password_hash, created_at) VALUES (?, ?, ?)"].rows == 3
+    assert not (tmp_path / "slow.log").exists()
+
+
+def test_slow_statements_are_logged_with_plan_and_full_scans(tmp_path, customer_record):
+    log_path = tmp_path / "slow.log"
+    profiler = SQLProfiler(slow_ms=0, log_path=log_path)
+    service = BankService(Storage(tmp_path / "bank.db", profiler=profiler))
+    service.create_customer(**customer_record("1001", mobile="5550000001"))
+    with service.storage.connect() as conn:
+        conn.execute("SELECT account_number FROM customers WHERE kyc_document = ?", ("Passport",)).fetchall()
+    service.close()
+
+    sql = "SELECT account_number FROM customers WHERE kyc_document = ?"
+    assert sql in [query.sql for query in profiler.full_scans()]
+    entries = [json.loads(line) for line in log_path.read_text().splitlines()]
+    scan = next(entry for entry in entries if entry["sql"] == sql)
+    assert scan["full_scans"] == ["SCAN customers"]
+    # Parameter values (PIN hashes among them) never reach the log.
+    assert "Passport" not in log_path.read_text()
+    assert "argon2" not in log_path.read_text()
+
+
+def test_request_paths_avoid_full_scans(tmp_path, customer_record):
+    profiler = SQLProfiler(slow_ms=0, log_path=None)
+    service = BankService(Storage(tmp_path / "bank.db", profiler=profiler))
+    service.create_customer(**customer_record("1001", mobile="5550000001"))
+    service.create_customer(**customer_record("1002", mobile="5550000002"))
+    # Schema migrations scan whole tables once; only the request paths below matter.
+    profiler.reset()
+
+    service.deposit("1001", "100")
+    service.withdraw("1001", "50")
+    service.get_balance("1001")
+    service.get_customer_summary("1001")
+    service.get_transactions("1001")
+    service.authenticate_customer_with_identifier("5550000002", "1234")
+    service.authenticate_customer_with_identifier("User 1001", "1234")
+    service.post_batch([{"account_number": "1002", "tx_type": "deposit", "amount": "5"}])
+    service.search_customers("User", field="name")
+    service.search_customers("555", field="mobile")
+    service.change_pin("1001", "4321")
+    service.delete_customer("1002")
+    service.close()
+
+    assert profiler.stats()
+    assert [(query.sql, query.full_scans) for query in profiler.full_scans()] == []
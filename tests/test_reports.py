@@ -0,0 +1,126 @@
+import csv
+import json
+from datetime import date
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from bank_app.config import MIN_BALANCE
+from bank_app.reports import build_daily_report, write_csv, write_json
+from bank_app.profiler import SQLProfiler
+from bank_app.storage import Storage
+
+
+@pytest.fixture
+def storage(tmp_path, customer_row):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    storage.create_customers([
+        customer_row("100", 5_000),
+        customer_row("200", 60_000),
+        customer_row("300", 20_000, account_type="Current"),
+        customer_row("400", 2_000_000, account_type="Current"),
+    ])
+    ledger = [
+        ("100", 700, "deposit", "2024-05-02T09:00:00.000000"),
+        ("200", 400, "withdraw", "2024-05-02T10:00:00.000000"),
+        ("300", 900, "deposit", "2024-05-02T11:00:00.000000"),
+        ("300", 100, "withdraw", "2024-05-02T12:00:00.000000"),
+        ("400", 25_000, "withdraw", "2024-05-02T23:59:59.999999"),
+        ("400", 9_999, "deposit", "2024-05-03T00:00:00.000000"),  # next day
+    ]
+    with storage.connect() as conn:
+        conn.executemany(
+            "INSERT INTO transactions (account_number, amount, tx_type, balance_after, created_at) "
+            "VALUES (?, ?, ?, 0, ?)",
+            ledger,
+        )
+    yield storage
+    storage.close()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 1000])
+def test_daily_report_aggregates_do_not_depend_on_chunk_size(storage, chunk_size):
+    report = build_daily_report(storage, date(2024, 5, 2), chunk_size=chunk_size, top=2)
+
+    assert report["transactions"] == [
+        {"tx_type": "deposit", "account_type": "Savings", "count": 1, "amount": 700},
+        {"tx_type": "deposit", "account_type": "Current", "count": 1, "amount": 900},
+        {"tx_type": "withdraw", "account_type": "Savings", "count": 1, "amount": 400},
+        {"tx_type": "withdraw", "account_type": "Current", "count": 2, "amount": 25_100},
+    ]
+    assert report["top_movers"] == [
+        {"account_number": "400", "net_change": -25_000, "turnover": 25_000, "transactions": 1},
+        {"account_number": "300", "net_change": 800, "turnover": 1_000, "transactions": 2},
+    ]
+
+    balances = report["balances"]
+    assert balances["accounts"] == 4
+    assert balances["total_balance"] == 2_085_000
+    assert balances["below_minimum"] == 1
+    assert (balances["min_balance"], balances["max_balance"]) == (5_000, 2_000_000)
+    assert balances["by_account_type"] == [
+        {"account_type": "Savings", "accounts": 2, "total_balance": 65_000, "below_minimum": 1},
+        {"account_type": "Current", "accounts": 2, "total_balance": 2_020_000, "below_minimum": 0},
+    ]
+    distribution = {row["range"]: row["accounts"] for row in balances["distribution"]}
+    assert distribution[f"0-{MIN_BALANCE - 1}"] == 1
+    assert distribution[f"{MIN_BALANCE}-49999"] == 1
+    assert distribution["50000-99999"] == 1
+    assert distribution["1000000-9999999"] == 1
+    assert sum(distribution.values()) == 4
+
+
+def test_money_totals_are_exact_beyond_float_precision(tmp_path, customer_row):
+    storage = Storage(tmp_path / "big.db")
+    storage.init_db()
+    storage.create_customers([customer_row("100", 2**53 + 1), customer_row("200", 1)])
+    with storage.connect() as conn:
+        conn.executemany(
+            "INSERT INTO transactions (account_number, amount, tx_type, balance_after, created_at) "
+            "VALUES (?, ?, 'deposit', 0, '2024-05-02T09:00:00.000000')",
+            [("100", 2**53 + 1), ("200", 1)],
+        )
+    report = build_daily_report(storage, date(2024, 5, 2))
+    storage.close()
+    assert report["balances"]["total_balance"] == 2**53 + 2
+    assert report["balances"]["by_account_type"][0]["total_balance"] == 2**53 + 2
+    assert report["transactions"][0]["amount"] == 2**53 + 2
+
+
+def test_daily_report_reads_only_that_day_of_the_ledger(storage):
+    profiler = SQLProfiler(slow_ms=0, log_path=None)
+    profiled = Storage(storage.pool.db_path, profiler=profiler)
+    build_daily_report(profiled, date(2024, 5, 2))
+    profiled.close()
+
+    plans = [query.plan for query in profiler.slow_queries if "FROM transactions" in query.sql]
+    assert len(plans) == 2
+    for plan in plans:
+        assert any("SEARCH transactions USING INDEX idx_transactions_created_at" in step for step in plan)
+        assert not [step for step in plan if step.startswith("SCAN")]
+
+
+def test_daily_report_for_a_quiet_day(storage):
+    report = build_daily_report(storage, date(2024, 6, 1))
+    assert report["transactions"] == []
+    assert report["top_movers"] == []
+    assert report["balances"]["accounts"] == 4
+
+
+def test_daily_report_exports(storage, tmp_path):
+    report = build_daily_report(storage, date(2024, 5, 2))
+    write_json(report, tmp_path / "out" / "report.json")
+    assert json.loads((tmp_path / "out" / "report.json").read_text()) == report
+
+    paths = write_csv(report, tmp_path / "csv")
+    assert [path.name for path in paths] == [
+        "2024-05-02-transactions.csv",
+        "2024-05-02-top_movers.csv",
+        "2024-05-02-balances_by_type.csv",
+        "2024-05-02-balance_distribution.csv",
+    ]
+    with paths[0].open(newline="") as handle:
+        rows = list(csv.DictReader(handle))
+    assert rows[0] == {"tx_type": "deposit", "account_type": "Savings", "count": "1", "amount": "700"}
@@ -1,6 +1,12 @@
 import pytest
 
-from bank_app.security import hash_secret, verify_and_update
+from bank_app.security import (
+    build_hasher,
+    hash_secret,
+    hash_secrets,
+    resolve_argon2_profile,
+    verify_and_update,
+)
 
 
 def test_hash_and_verify_round_trip():
@@ -15,3 +21,31 @@ def test_hash_rejects_wrong_password():
     valid, new_hash = verify_and_update(hashed, "wrong")
     assert valid is False
     assert new_hash is None
+
+
+def test_batch_hashing_across_processes():
+    batch = hash_secrets(["1111", "2222", "3333"], workers=2)
+    assert len(batch.hashes) == 3
+    assert batch.hashes_per_second > 0
+    for secret, hashed in zip(["1111", "2222", "3333"], batch.hashes):
+        assert verify_and_update(hashed, secret)[0] is True
+
+
+def test_resolve_argon2_profile_applies_overrides():
+    assert resolve_argon2_profile("low-memory") == {"time_cost": 2, "memory_cost": 19456, "parallelism": 1}
+    assert resolve_argon2_profile("standard", {"memory_cost": 32768})["memory_cost"] == 32768
+    with pytest.raises(ValueError):
+        resolve_argon2_profile("cheapest")
+    with pytest.raises(ValueError):
+        resolve_argon2_profile("standard", {"lanes": 2})
+    with pytest.raises(ValueError):
+        resolve_argon2_profile("standard", {"time_cost": 0})
+
+
+def test_verify_rehashes_hashes_from_another_profile():
+    old_hash = build_hasher({"time_cost": 1, "memory_cost": 8192, "parallelism": 1}).hash("1234")
+    valid, new_hash = verify_and_update(old_hash, "1234")
+    assert valid is True
+    assert new_hash is not None and new_hash != old_hash
+    # The upgraded hash matches the active profile, so the next login leaves it alone.
+    assert verify_and_update(new_hash, "1234") == (True, None)
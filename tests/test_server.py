@@ -0,0 +1,200 @@
+import http.client
+import json
+import socket
+import sqlite3
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from bank_app.config import MIN_BALANCE
+from bank_app.server import BankAPI, SessionStore, create_server
+from bank_app.services import BankService
+from bank_app.storage import Storage
+
+TOKEN = "test-token"
+
+
+@pytest.fixture
+def server(tmp_path):
+    service = BankService(Storage(tmp_path / "bank.db", pool_size=2))
+    server = create_server(service, TOKEN, host="127.0.0.1", port=0, workers=2, request_timeout=0.5)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+@pytest.fixture
+def api(tmp_path):
+    service = BankService(Storage(tmp_path / "bank.db", pool_size=4))
+    service.create_admin("admin", "pass123")
+    server = create_server(service, TOKEN, host="127.0.0.1", port=0, workers=4)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def call(method, path, body=None, token=TOKEN, session=None):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        if session:
+            headers["X-Session-Token"] = session
+        request = urllib.request.Request(
+            f"http://127.0.0.1:{server.server_port}{path}",
+            data=None if body is None else json.dumps(body).encode(),
+            method=method,
+            headers=headers,
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                raw = response.read()
+                return response.status, json.loads(raw) if raw else None
+        except urllib.error.HTTPError as exc:
+            return exc.code, json.loads(exc.read())
+
+    call.admin = call("POST", "/admins/login", {"admin_id": "admin", "password": "pass123"})[1]["session"]
+    yield call
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def test_requests_need_the_api_token(api):
+    assert api("GET", "/health", token=None)[0] == 401
+    assert api("GET", "/health", token="wrong")[0] == 401
+    assert api("GET", "/health") == (200, {"status": "ok"})
+
+
+def login(api, identifier, pin="1234"):
+    status, payload = api("POST", "/customers/login", {"identifier": identifier, "pin": pin})
+    return payload["session"] if status == 200 else status
+
+
+def test_customer_round_trip(api, customer_record):
+    status, summary = api("POST", "/customers", customer_record("40001"), session=api.admin)
+    assert status == 201 and summary["balance"] == MIN_BALANCE
+    assert api("POST", "/customers", customer_record("40001"), session=api.admin)[0] == 409
+
+    status, payload = api("POST", "/customers/login", {"identifier": "40001", "pin": "1234"})
+    assert status == 200 and payload["account_number"] == "40001"
+    assert login(api, "40001", "0000") == 401
+    session = payload["session"]
+
+    assert api("POST", "/customers/40001/deposit", {"amount": 500}, session=session) == (
+        200,
+        {"account_number": "40001", "balance": MIN_BALANCE + 500},
+    )
+    assert api("POST", "/customers/40001/withdraw", {"amount": 1000}, session=session)[0] == 422
+    assert api("POST", "/customers/40001/deposit", {"amount": "abc"}, session=session)[0] == 400
+
+    status, page = api("GET", "/customers/40001/transactions?limit=5", session=session)
+    assert status == 200 and [item["tx_type"] for item in page["items"]] == ["deposit"]
+
+    assert api("POST", "/customers/40001/pin", {"pin": "4321"}, session=session) == (204, None)
+    assert api("DELETE", "/customers/40001", session=api.admin) == (204, None)
+    assert api("GET", "/customers/40001", session=api.admin)[0] == 404
+    assert api("GET", "/customers/40001/balance", session=session)[0] == 401
+
+
+def test_account_routes_need_a_matching_login(api, customer_record):
+    api("POST", "/customers", customer_record("40003"), session=api.admin)
+    api("POST", "/customers", customer_record("40004", mobile="1234567891"), session=api.admin)
+    own, other = login(api, "40003"), login(api, "40004")
+
+    # The API token alone no longer moves money or closes accounts.
+    assert api("POST", "/customers/40003/deposit", {"amount": 10})[0] == 401
+    assert api("DELETE", "/customers/40003")[0] == 401
+    assert api("POST", "/customers/40003/deposit", {"amount": 10}, session="forged")[0] == 401
+
+    assert api("POST", "/customers/40003/withdraw", {"amount": 10}, session=other)[0] == 403
+    assert api("GET", "/customers/40003/transactions", session=other)[0] == 403
+    assert api("DELETE", "/customers/40003", session=own)[0] == 403
+    assert api("POST", "/transactions/batch", {"entries": []}, session=own)[0] == 403
+    assert api("GET", "/customers/40003/balance", session=own)[0] == 200
+    assert api("GET", "/customers/40003/balance", session=api.admin)[0] == 200
+    # Admins manage accounts; moving a customer's money takes that customer's login, as in the UI.
+    assert api("POST", "/customers/40003/deposit", {"amount": 10}, session=api.admin)[0] == 403
+
+    # A PIN change ends the customer's other sessions but not the one that made it.
+    second = login(api, "40003")
+    assert api("POST", "/customers/40003/pin", {"pin": "4321"}, session=own)[0] == 204
+    assert api("GET", "/customers/40003/balance", session=second)[0] == 401
+    assert api("GET", "/customers/40003/balance", session=own)[0] == 200
+
+    assert api("POST", "/logout", session=own) == (204, None)
+    assert api("GET", "/customers/40003/balance", session=own)[0] == 401
+
+
+def test_sessions_expire():
+    store = SessionStore(ttl=0)
+    assert store.get(store.issue("customer", "40001")) is None
+
+
+def test_routing_errors(api):
+    assert api("GET", "/nowhere")[0] == 404
+    assert api("PUT", "/customers/40001/deposit", {})[0] == 405
+    assert api("POST", "/transactions/batch", {"entries": "nope"}, session=api.admin)[0] == 400
+    for atomic in ("false", 0, None):
+        status, payload = api("POST", "/transactions/batch", {"entries": [], "atomic": atomic}, session=api.admin)
+        assert (status, payload) == (400, {"error": "atomic must be true or false."})
+    assert api("POST", "/transactions/batch", {"entries": [], "atomic": False}, session=api.admin)[0] == 200
+    assert api("POST", "/customers/49999/deposit", {"amount": 10}, session=api.admin)[0] == 403
+
+
+def test_concurrent_deposits_are_all_applied(api, customer_record):
+    api("POST", "/customers", customer_record("40002"), session=api.admin)
+    session = login(api, "40002")
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        statuses = list(pool.map(
+            lambda _: api("POST", "/customers/40002/deposit", {"amount": 10}, session=session)[0], range(40)
+        ))
+    assert statuses == [200] * 40
+    assert api("GET", "/customers/40002/balance", session=session)[1]["balance"] == MIN_BALANCE + 400
+
+
+def test_unexpected_errors_become_500(tmp_path, monkeypatch, caplog):
+    service = BankService(Storage(tmp_path / "bank.db"))
+    api = BankAPI(service, TOKEN)
+
+    def locked(account_number):
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(service, "get_balance", locked)
+    session = api.sessions.issue("customer", "40001")
+    status, payload = api.dispatch("GET", "/customers/40001/balance", f"Bearer {TOKEN}", b"", session)
+    assert status == 500 and payload == {"error": "Internal server error."}
+    [record] = [record for record in caplog.records if record.name == "bank_app.server"]
+    assert record.levelname == "ERROR" and record.exc_info[0] is sqlite3.OperationalError
+    service.close()
+
+
+def test_malformed_content_length_is_rejected(server):
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    connection.putrequest("POST", "/customers/40001/deposit")
+    connection.putheader("Authorization", f"Bearer {TOKEN}")
+    connection.putheader("Content-Length", "abc")
+    connection.endheaders()
+    response = connection.getresponse()
+    assert response.status == 400
+    assert json.loads(response.read()) == {"error": "Invalid Content-Length."}
+    connection.close()
+
+
+def test_stalled_clients_do_not_hold_workers(server):
+    # Both workers get a client that promises a body and never sends it.
+    stalled = []
+    for _ in range(2):
+        sock = socket.create_connection(("127.0.0.1", server.server_port))
+        sock.sendall(b"POST /customers/1/deposit HTTP/1.1\r\nHost: x\r\nContent-Length: 10\r\n\r\n")
+        stalled.append(sock)
+
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_port, timeout=5)
+    connection.request("GET", "/health", headers={"Authorization": f"Bearer {TOKEN}"})
+    assert connection.getresponse().status == 200
+    connection.close()
+    for sock in stalled:
+        sock.settimeout(5)
+        assert b" 408 " in sock.recv(1024)
+        sock.close()
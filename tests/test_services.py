@@ -1,7 +1,11 @@
+import threading
+from datetime import date
+
 import pytest
 
-from bank_app.config import MIN_BALANCE
-from bank_app.errors import BusinessRuleError, ConflictError
+from bank_app.config import MAX_TRANSACTION, MIN_BALANCE
+from bank_app.errors import BusinessRuleError, ConflictError, NotFoundError, ValidationError
+from bank_app.security import BatchHasher
 from bank_app.services import BankService
 
 
@@ -90,3 +94,270 @@ def test_customer_identifier_login(tmp_path):
     assert service.authenticate_customer_with_identifier("9998887776", "1212") == "98765"
     assert service.authenticate_customer_with_identifier("9998887776", "0000") is None
     assert service.authenticate_customer_with_identifier("no match", "1212") is None
+
+
+def test_identifier_precedence_is_account_then_mobile_then_name(tmp_path, customer_record):
+    service = make_service(tmp_path)
+    service.create_customer(**customer_record("9998887776", name="Digits Owner", mobile="1112223334", pin="1111"))
+    service.create_customer(**customer_record("20001", name="Mobile Owner", mobile="9998887776", pin="2222"))
+    service.create_customer(**customer_record("20002", name="1112223334", mobile="5556667778", pin="3333"))
+    service.create_customer(**customer_record("20003", name="Shared Name", mobile="5556667779", pin="4444"))
+    service.create_customer(**customer_record("20004", name="shared name", mobile="5556667780", pin="5555"))
+
+    # An account number beats another customer's mobile, and a mobile beats another customer's name.
+    assert service._resolve_customer_identifier("9998887776")[0] == "9998887776"
+    assert service._resolve_customer_identifier("1112223334")[0] == "9998887776"
+    assert service._resolve_customer_identifier("20001")[0] == "20001"
+    # Duplicate names resolve to the lowest account number, case-insensitively.
+    assert service._resolve_customer_identifier("SHARED NAME")[0] == "20003"
+    assert service._resolve_customer_identifier("nobody") is None
+
+    assert service.authenticate_customer_with_identifier("9998887776", "1111") == "9998887776"
+    assert service.authenticate_customer_with_identifier("9998887776", "2222") is None
+    assert service.authenticate_customer_with_identifier("Mobile Owner", "2222") == "20001"
+
+
+def test_transactions_keyset_pagination(tmp_path, customer_record):
+    service = make_service(tmp_path)
+    service.create_customer(**customer_record("24680", account_type="Current"))
+    for amount in range(1, 6):
+        service.deposit("24680", str(amount))
+    service.withdraw("24680", "3")
+
+    first = service.get_transactions("24680", limit=4)
+    assert [item["amount"] for item in first["items"]] == [3, 5, 4, 3]
+    assert first["items"][0]["tx_type"] == "withdraw"
+    assert first["next_before_id"] == first["items"][-1]["id"]
+
+    second = service.get_transactions("24680", limit=4, before_id=first["next_before_id"])
+    assert [item["amount"] for item in second["items"]] == [2, 1]
+    assert second["next_before_id"] is None
+
+    deposits = service.get_transactions("24680", tx_type="deposit")
+    assert len(deposits["items"]) == 5
+
+    today = date.today().strftime("%d/%m/%Y")
+    assert len(service.get_transactions("24680", start_date=today, end_date=today)["items"]) == 6
+    assert service.get_transactions("24680", start_date="01/01/2999")["items"] == []
+
+    with pytest.raises(NotFoundError):
+        service.get_transactions("11111")
+    with pytest.raises(ValidationError):
+        service.get_transactions("24680", tx_type="refund")
+
+
+def test_submit_runs_credential_calls_off_thread(tmp_path):
+    service = make_service(tmp_path)
+    service.create_admin("admin", "pass123")
+    assert service.submit(service.authenticate_admin, "admin", "pass123").result(timeout=30) is True
+    failed = service.submit(service.create_admin, "admin", "pass123")
+    with pytest.raises(ConflictError):
+        failed.result(timeout=30)
+    service.close()
+
+
+def test_import_customers_hashes_in_bulk_and_reports_skips(tmp_path, customer_record):
+    service = make_service(tmp_path)
+    service.create_customer(**customer_record("10001"))
+    with BatchHasher(workers=2) as hasher:
+        result = service.import_customers(
+            [
+                customer_record("10002"),
+                customer_record("10003", pin="4321"),
+                customer_record("10001"),
+                customer_record("10002"),
+                customer_record("10004", initial_balance="5"),
+                customer_record("abc"),
+            ],
+            hasher=hasher,
+        )
+    assert result["imported"] == ["10002", "10003"]
+    assert [account for account, _ in result["skipped"]] == ["10002", "10004", "abc", "10001"]
+    assert result["hashes_per_second"] > 0
+    assert service.authenticate_customer("10003", "4321") is True
+
+
+def test_reset_pins_in_bulk(tmp_path, customer_record):
+    service = make_service(tmp_path)
+    service.create_customer(**customer_record("20001"))
+    service.create_customer(**customer_record("20002"))
+    result = service.reset_pins({"20001": "1111", "20002": "2222", "20003": "3333", "20004": "12"})
+    assert result["updated"] == ["20001", "20002"]
+    assert sorted(account for account, _ in result["skipped"]) == ["20003", "20004"]
+    assert service.authenticate_customer("20002", "2222") is True
+
+
+def test_import_admins_in_bulk(tmp_path):
+    service = make_service(tmp_path)
+    service.create_admin("admin", "pass123")
+    result = service.import_admins([("admin", "pass123"), ("teller", "teller1"), ("x", "short")])
+    assert result["imported"] == ["teller"]
+    assert service.authenticate_admin("teller", "teller1") is True
+
+
+def test_concurrent_withdrawals_never_overdraw(tmp_path, customer_record):
+    service = make_service(tmp_path)
+    service.create_customer(**customer_record("30001", initial_balance=str(MIN_BALANCE + 1000)))
+    service.create_customer(**customer_record("30002"))
+    outcomes = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(10):
+            try:
+                service.withdraw("30001", "100")
+                result = "ok"
+            except BusinessRuleError:
+                result = "rejected"
+            service.deposit("30002", "1")
+            with lock:
+                outcomes.append(result)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert outcomes.count("ok") == 10
+    assert service.get_balance("30001") == MIN_BALANCE
+    assert service.get_balance("30002") == MIN_BALANCE + 80
+    ledger = service.get_transactions("30001", limit=100)["items"]
+    assert len(ledger) == 10
+    assert min(item["balance_after"] for item in ledger) == MIN_BALANCE
+
+
+def test_post_batch_best_effort_reports_each_entry(tmp_path, customer_record):
+    service = make_service(tmp_path)
+    service.create_customer(**customer_record("40001"))
+    service.create_customer(**customer_record("40002", initial_balance=str(MIN_BALANCE + 500)))
+    summary = service.post_batch(
+        [
+            {"account_number": "40001", "tx_type": "deposit", "amount": "1000"},
+            {"account_number": "40001", "tx_type": "deposit", "amount": "2000"},
+            {"account_number": "40002", "tx_type": "withdraw", "amount": "400"},
+            {"account_number": "40002", "tx_type": "withdraw", "amount": "400"},
+            {"account_number": "40003", "tx_type": "deposit", "amount": "10"},
+            {"account_number": "40001", "tx_type": "deposit", "amount": str(MAX_TRANSACTION + 1)},
+        ],
+        atomic=False,
+    )
+    assert summary["committed"] is True
+    assert [result["status"] for result in summary["results"]] == [
+        "applied", "applied", "applied", "failed", "failed", "failed",
+    ]
+    assert [result["balance_after"] for result in summary["results"][:3]] == [
+        MIN_BALANCE + 1000, MIN_BALANCE + 3000, MIN_BALANCE + 100,
+    ]
+    assert summary["results"][3]["error"] == "Minimum balance requirement not met."
+    assert summary["results"][4]["error"] == "Account not found."
+    assert summary["results"][5]["error"] == "Limit exceeded."
+    assert service.get_balance("40001") == MIN_BALANCE + 3000
+    assert service.get_balance("40002") == MIN_BALANCE + 100
+    assert len(service.get_transactions("40001")["items"]) == 2
+
+
+def test_post_batch_rejects_zero_and_non_integer_amounts(tmp_path, customer_record):
+    service = make_service(tmp_path)
+    service.create_customer(**customer_record("40001"))
+    amounts = [0, "0", 0.0, False, None]
+    summary = service.post_batch(
+        [{"account_number": "40001", "tx_type": "deposit", "amount": amount} for amount in amounts],
+        atomic=False,
+    )
+    assert [result["error"] for result in summary["results"]] == [
+        "Amount must be a positive whole number.",
+        "Amount must be a positive whole number.",
+        "Amount must be a positive whole number.",
+        "Amount must be a positive whole number.",
+        "Amount cannot be empty.",
+    ]
+    assert service.get_transactions("40001")["items"] == []
+
+
+def test_post_batch_atomic_rolls_back_on_any_failure(tmp_path, customer_record):
+    service = make_service(tmp_path)
+    service.create_customer(**customer_record("50001"))
+    summary = service.post_batch(
+        [
+            {"account_number": "50001", "tx_type": "deposit", "amount": "1000"},
+            {"account_number": "50001", "tx_type": "withdraw", "amount": "5000"},
+        ]
+    )
+    assert summary["committed"] is False
+    assert [result["status"] for result in summary["results"]] == ["skipped", "failed"]
+    assert service.get_balance("50001") == MIN_BALANCE
+    assert service.get_transactions("50001")["items"] == []
+
+    summary = service.post_batch([{"account_number": "50001", "tx_type": "deposit", "amount": "1000"}])
+    assert summary["committed"] is True
+    assert service.get_balance("50001") == MIN_BALANCE + 1000
+
+
+def test_import_customers_dry_run_writes_nothing(tmp_path, customer_record):
+    service = make_service(tmp_path)
+    result = service.import_customers([customer_record("60001"), customer_record("60002", pin="1")], dry_run=True)
+    assert result["imported"] == ["60001"]
+    assert len(result["skipped"]) == 1
+    assert service.customer_exists("60001") is False
+
+
+def test_search_customers_pages_with_cursors(tmp_path, customer_record):
+    service = make_service(tmp_path)
+    for n in range(5):
+        service.create_customer(**customer_record(f"7000{n}", name=f"Dir User {n}", mobile=f"98765432{n}0"))
+
+    first = service.search_customers("dir", limit=2)
+    assert [item["name"] for item in first["items"]] == ["Dir User 0", "Dir User 1"]
+    assert first["has_more"] is True
+    second = service.search_customers("dir", limit=2, after=first["items"][-1]["cursor"])
+    assert [item["account_number"] for item in second["items"]] == ["70002", "70003"]
+    back = service.search_customers("dir", limit=2, before=second["items"][0]["cursor"])
+    assert back == {"items": first["items"], "has_more": False}
+    by_mobile = service.search_customers("98765432", field="mobile", limit=10)
+    assert len(by_mobile["items"]) == 5 and by_mobile["has_more"] is False
+
+    with pytest.raises(ValidationError):
+        service.search_customers(field="balance")
+    with pytest.raises(ValidationError):
+        service.search_customers(limit=0)
+    with pytest.raises(ValidationError):
+        service.search_customers(after=["a", "1"], before=["b", "2"])
+
+
+def test_historical_balances_and_period_totals(tmp_path, monkeypatch, customer_record):
+    clock = {"day": "2024-01-30"}
+    fake_now = lambda: f"{clock['day']}T12:00:00.000000"
+    monkeypatch.setattr("bank_app.services.now_timestamp", fake_now)
+    monkeypatch.setattr("bank_app.storage.now_timestamp", fake_now)
+    service = make_service(tmp_path)
+    service.create_customer(**customer_record("13579"))
+    clock["day"] = "2024-01-31"
+    service.deposit("13579", "2000")
+    clock["day"] = "2024-02-02"
+    service.withdraw("13579", "500")
+
+    assert service.get_balance_on("13579", "29/01/2024")["balance"] is None
+    assert service.get_balance_on("13579", "31/01/2024")["balance"] == MIN_BALANCE + 2000
+    assert service.get_balance_on("13579", "01/02/2024")["balance"] == MIN_BALANCE + 2000
+
+    history = service.get_balance_history("13579", "31/01/2024", "29/02/2024")
+    assert history["opening_balance"] == MIN_BALANCE
+    assert history["items"] == [
+        {"date": "2024-01-31", "closing_balance": MIN_BALANCE + 2000},
+        {"date": "2024-02-02", "closing_balance": MIN_BALANCE + 1500},
+    ]
+
+    february = service.get_period_totals("01/02/2024", "29/02/2024")
+    assert february["opening_total"] == MIN_BALANCE + 2000
+    assert february["closing_total"] == MIN_BALANCE + 1500
+    assert (february["credits"], february["debits"], february["tx_count"]) == (0, 500, 1)
+    quiet = service.get_period_totals("01/03/2024", "31/03/2024")
+    assert quiet["opening_total"] == quiet["closing_total"] == MIN_BALANCE + 1500
+    assert quiet["days"] == []
+
+    with pytest.raises(NotFoundError):
+        service.get_balance_on("99999", "01/02/2024")
+    with pytest.raises(ValidationError):
+        service.get_period_totals("29/02/2024", "01/02/2024")
+    assert service.rebuild_snapshots() == 3
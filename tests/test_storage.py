@@ -0,0 +1,425 @@
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import date
+
+import pytest
+
+from bank_app.cache import LRUCache
+from bank_app.pool import ConnectionPool
+from bank_app.storage import (
+    CUSTOMER_BY_MOBILE_SQL,
+    CUSTOMER_BY_NAME_SQL,
+    DIRECTORY_FIELDS,
+    MIGRATIONS,
+    RESOLVE_CUSTOMER_SQL,
+    SCHEMA,
+    SCHEMA_VERSION,
+    Storage,
+    now_timestamp,
+)
+
+
+def test_pool_reuses_connections(tmp_path):
+    pool = ConnectionPool(tmp_path / "pool.db", size=2)
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    assert pool.open_connections == 1
+
+
+def test_pool_is_bounded(tmp_path):
+    pool = ConnectionPool(tmp_path / "pool.db", size=1, timeout=0.05)
+    conn = pool.acquire()
+    with pytest.raises(TimeoutError):
+        pool.acquire()
+    pool.release(conn)
+    assert pool.acquire() is conn
+
+
+def test_pool_health_check_drops_broken_connections(tmp_path):
+    pool = ConnectionPool(tmp_path / "pool.db", size=2)
+    with pool.connection() as conn:
+        pass
+    conn.close()
+    assert pool.health_check() == 0
+    assert pool.open_connections == 0
+    with pool.connection() as fresh:
+        assert fresh is not conn
+
+
+def test_pool_waiters_reopen_after_a_discard(tmp_path):
+    pool = ConnectionPool(tmp_path / "pool.db", size=1, timeout=10)
+    broken = pool.acquire()
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        waiter = executor.submit(pool.acquire)
+        time.sleep(0.05)
+        # Dropping the only connection frees a slot; the waiter opens a new one instead of timing out.
+        pool.release(broken, healthy=False)
+        fresh = waiter.result(timeout=2)
+    assert fresh is not broken
+    assert pool.open_connections == 1
+    pool.release(fresh)
+    pool.close()
+
+
+def test_pool_close(tmp_path):
+    pool = ConnectionPool(tmp_path / "pool.db", size=2)
+    held = pool.acquire()
+    with pool.connection():
+        pass
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.acquire()
+    pool.release(held)
+    assert pool.open_connections == 0
+
+
+def test_storage_rolls_back_failed_transaction(tmp_path):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    with pytest.raises(RuntimeError):
+        with storage.connect() as conn:
+            conn.execute(
+                "INSERT INTO admins (username, password_hash, created_at) VALUES ('a', 'h', 'now')"
+            )
+            raise RuntimeError("boom")
+    assert storage.admin_exists("a") is False
+    storage.close()
+
+
+def test_storage_applies_connection_profile(tmp_path):
+    storage = Storage(tmp_path / "bank.db", profile="throughput")
+    with storage.connect() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA busy_timeout").fetchone()[0] == 10000
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+    storage.close()
+
+
+def test_storage_rejects_unknown_profile(tmp_path):
+    with pytest.raises(ValueError):
+        Storage(tmp_path / "bank.db", profile="fastest")
+    with pytest.raises(ValueError):
+        Storage(tmp_path / "bank.db", profile={"synchronous": "SOMETIMES"})
+
+
+def test_customer_lookups_use_indexes(tmp_path):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    mobile_plan = " ".join(storage.explain_query_plan(CUSTOMER_BY_MOBILE_SQL, ("1234567890",)))
+    name_plan = " ".join(storage.explain_query_plan(CUSTOMER_BY_NAME_SQL, ("Test User",)))
+    assert "USING INDEX idx_customers_mobile" in mobile_plan
+    assert "USING INDEX idx_customers_name_nocase" in name_plan
+    storage.close()
+
+
+def test_customer_resolver_uses_an_index_for_every_branch(tmp_path):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    params = {"account_number": "12345", "mobile": "1234567890", "name": "Test User"}
+    plan = " ".join(storage.explain_query_plan(RESOLVE_CUSTOMER_SQL, params))
+    assert "sqlite_autoindex_customers_1" in plan
+    assert "idx_customers_mobile" in plan
+    assert "idx_customers_name_nocase" in plan
+    assert "SCAN customers" not in plan
+    storage.close()
+
+
+def test_init_db_adds_indexes_to_existing_database(tmp_path):
+    db_path = tmp_path / "bank.db"
+    legacy = sqlite3.connect(db_path)
+    legacy.executescript(SCHEMA)
+    legacy.close()
+
+    storage = Storage(db_path)
+    storage.init_db()
+    with storage.connect() as conn:
+        names = {
+            row["name"]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+        }
+    assert {"idx_customers_mobile", "idx_customers_name_nocase"} <= names
+    storage.close()
+
+
+def test_init_db_records_schema_version_and_skips_ddl_when_current(tmp_path):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    assert storage.schema_version() == SCHEMA_VERSION
+    with storage.connect() as conn:
+        conn.execute("DROP INDEX idx_customers_mobile")
+    storage.init_db()
+    # A current database is left alone, so the dropped index is not recreated.
+    with storage.connect() as conn:
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'idx_customers_mobile'").fetchone() is None
+    storage.close()
+
+
+def test_failed_migration_rolls_back_and_keeps_version(tmp_path):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    broken = MIGRATIONS + ("CREATE TABLE audit (id INTEGER); CREATE INDEX idx_missing ON nowhere(id)",)
+    with pytest.raises(sqlite3.OperationalError):
+        storage.migrate(broken)
+    assert storage.schema_version() == SCHEMA_VERSION
+    with storage.connect() as conn:
+        assert conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'audit'").fetchone() is None
+
+    applied = []
+    fixed = MIGRATIONS + ("CREATE TABLE audit (id INTEGER)", applied.append)
+    assert storage.migrate(fixed) == SCHEMA_VERSION + 2
+    assert applied == [storage]
+    assert storage.migrate(fixed) == SCHEMA_VERSION + 2
+    assert applied == [storage]
+    with pytest.raises(RuntimeError):
+        storage.migrate()
+    storage.close()
+
+
+def test_legacy_timestamps_are_migrated_in_batches(tmp_path):
+    db_path = tmp_path / "bank.db"
+    legacy = sqlite3.connect(db_path)
+    legacy.executescript(SCHEMA)
+    legacy.execute(
+        "INSERT INTO customers VALUES ('1', 'h', 10000, '05/03/2021', 'A', 'Savings', "
+        "'01/01/2000', '1234567890', 'Male', 'X', 'Passport')"
+    )
+    legacy.executemany(
+        "INSERT INTO transactions (account_number, amount, tx_type, balance_after, created_at) "
+        "VALUES ('1', 1, 'deposit', 10000, ?)",
+        [(f"{day:02d}/04/2021",) for day in range(1, 8)],
+    )
+    legacy.commit()
+    legacy.close()
+
+    storage = Storage(db_path)
+    assert storage.migrate_legacy_timestamps(batch_size=3) == 8
+    storage.init_db()
+    with storage.connect() as conn:
+        customer = conn.execute("SELECT created_at FROM customers").fetchone()
+        stamps = [row[0] for row in conn.execute("SELECT created_at FROM transactions ORDER BY id")]
+    assert customer[0] == "2021-03-05T00:00:00.000000"
+    assert stamps == [f"2021-04-{day:02d}T00:00:00.000000" for day in range(1, 8)]
+    assert stamps == sorted(stamps)
+    storage.close()
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats() == {"hits": 3, "misses": 1, "size": 2, "maxsize": 2}
+
+
+def test_lru_cache_expires_entries(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("bank_app.cache.time.monotonic", lambda: now[0])
+    cache = LRUCache(4, ttl=5)
+    cache.put("a", 1)
+    now[0] += 4
+    assert cache.get("a") == 1
+    now[0] += 2
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_lru_cache_refuses_values_read_before_an_invalidation():
+    cache = LRUCache(2)
+    before = cache.generation()
+    cache.invalidate("a")
+    assert cache.put("a", "stale", before) is False
+    assert cache.put("b", "fresh", before) is True
+    assert cache.get("a") is None and cache.get("b") == "fresh"
+    # Forgetting old invalidations to stay bounded errs on the side of not caching.
+    cache.invalidate("c", "d", "e")
+    assert cache.put("a", "stale", before) is False
+    assert cache.put("a", "fresh", cache.generation()) is True
+
+
+def test_customer_cache_skips_rows_read_before_a_concurrent_write(tmp_path, monkeypatch):
+    storage = Storage(tmp_path / "bank.db", customer_cache_size=8, customer_cache_ttl=None)
+    storage.init_db()
+    storage.create_customer("1", "old", 10000, now_timestamp(), "A", "Savings", "01/01/2000", "1234567890", "Male", "X",
+                            "Passport")
+    connect = storage.connect
+    interleaved = []
+
+    @contextmanager
+    def racing_connect():
+        with connect() as conn:
+            yield conn
+        # The reader has its row; a PIN change commits before the reader can cache it.
+        if not interleaved:
+            interleaved.append(True)
+            storage.update_customer_pin("1", "new")
+
+    monkeypatch.setattr(storage, "connect", racing_connect)
+    assert storage.get_customer("1")["pin_hash"] == "old"
+    monkeypatch.setattr(storage, "connect", connect)
+    assert storage.get_customer("1")["pin_hash"] == "new"
+    storage.close()
+
+
+def test_customer_cache_is_invalidated_by_writes(tmp_path):
+    storage = Storage(tmp_path / "bank.db", customer_cache_size=8, customer_cache_ttl=None)
+    storage.init_db()
+    storage.create_customer("1", "h", 10000, now_timestamp(), "A", "Savings", "01/01/2000", "1234567890", "Male", "X", "Passport")
+    assert storage.get_customer("1")["balance"] == 10000
+    assert storage.get_customer("1")["balance"] == 10000
+    assert storage.customer_cache.hits == 1
+
+    storage.update_balance_with_transaction("1", 500, "deposit")
+    assert storage.get_customer("1")["balance"] == 10500
+    storage.post_transactions([("1", -200, "withdraw")], min_balance=0, atomic=True)
+    assert storage.get_customer("1")["balance"] == 10300
+    storage.update_customer_pin("1", "h2")
+    assert storage.get_customer("1")["pin_hash"] == "h2"
+    storage.delete_customer("1")
+    assert storage.get_customer("1") is None
+    storage.close()
+
+
+@pytest.fixture
+def directory_storage(tmp_path, customer_row):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    created_at = now_timestamp()
+    storage.create_customers([
+        customer_row(
+            str(50000 + i),
+            1000,
+            created_at,
+            name=("alice" if i % 2 else "Alice") + f" {i % 7}",
+            mobile=f"99{i % 40:08d}",
+        )
+        for i in range(120)
+    ])
+    return storage
+
+
+@pytest.mark.parametrize("field", ["name", "mobile", "account_number"])
+def test_directory_pages_cover_every_row_once_in_both_directions(directory_storage, field):
+    storage = directory_storage
+    with storage.connect() as conn:
+        expected = [row[0] for row in conn.execute(
+            f"SELECT account_number FROM customers ORDER BY {DIRECTORY_FIELDS[field]}, account_number"
+        )]
+
+    forward, after = [], None
+    while page := storage.search_customers(field, limit=17, after=after):
+        forward += [row["account_number"] for row in page]
+        after = (page[-1][field], page[-1]["account_number"])
+    assert forward == expected
+
+    backward, before = [], (after[0] + "~", "~")
+    while page := storage.search_customers(field, limit=17, before=before):
+        backward = [row["account_number"] for row in page] + backward
+        before = (page[0][field], page[0]["account_number"])
+    assert backward == expected
+    storage.close()
+
+
+def test_directory_prefix_search(directory_storage):
+    storage = directory_storage
+    names = {row["name"] for row in storage.search_customers("name", "ALICE 3", limit=500)}
+    assert names == {"alice 3", "Alice 3"}
+    mobiles = storage.search_customers("mobile", "990000001", limit=500)
+    assert {row["mobile"] for row in mobiles} == {f"99{n:08d}" for n in range(10, 20)}
+    assert [row["account_number"] for row in storage.search_customers("account_number", "5011", limit=500)] == [
+        str(n) for n in range(50110, 50120)
+    ]
+    assert storage.search_customers("name", "bob", limit=5) == []
+    storage.close()
+
+
+def test_directory_queries_stay_on_indexes(tmp_path):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    for field, index in (("name", "idx_customers_name_nocase"), ("mobile", "idx_customers_mobile")):
+        sort_key = DIRECTORY_FIELDS[field]
+        sql = (
+            f"SELECT * FROM customers WHERE {sort_key} >= ? AND ({sort_key} > ? OR account_number > ?) "
+            f"ORDER BY {sort_key}, account_number LIMIT 10"
+        )
+        plan = " ".join(storage.explain_query_plan(sql, ("a", "a", "1")))
+        assert f"SEARCH customers USING INDEX {index}" in plan
+        assert "TEMP B-TREE" not in plan
+    storage.close()
+
+
+def snapshot_rows(storage):
+    with storage.connect() as conn:
+        balances = [tuple(row) for row in conn.execute("SELECT * FROM daily_balances ORDER BY account_number, day")]
+        totals = [tuple(row) for row in conn.execute("SELECT * FROM daily_totals ORDER BY day")]
+    return balances, totals
+
+
+def test_snapshots_track_writes_and_match_a_rebuild(tmp_path, monkeypatch, customer_row):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    clock = {"day": "2024-03-01"}
+    monkeypatch.setattr("bank_app.storage.now_timestamp", lambda: f"{clock['day']}T10:00:00.000000")
+
+    storage.create_customer("1", "h", 10000, "2024-03-01T09:00:00.000000", "A", "Savings", "01/01/2000",
+                            "1234567890", "Male", "X", "Passport")
+    storage.update_balance_with_transaction("1", 500, "deposit")
+    storage.update_balance_with_transaction("1", -200, "withdraw", min_balance=0)
+    clock["day"] = "2024-03-03"
+    storage.create_customers([customer_row("2", 20000, "2024-03-03T08:00:00.000000", mobile="1234567891")])
+    storage.apply_balance_changes([("1", 1000, "deposit", None), ("2", -5000, "withdraw", 0)])
+    storage.post_transactions([("2", 300, "deposit"), ("2", -100, "withdraw")], min_balance=0)
+    clock["day"] = "2024-03-05"
+    storage.update_balance_with_transaction("2", -15000, "withdraw", min_balance=10000)  # refused, no snapshot
+
+    assert storage.balance_on("1", date(2024, 2, 29)) is None
+    assert storage.balance_on("1", date(2024, 3, 2)) == 10300
+    assert storage.balance_on("1", date(2024, 3, 31)) == 11300
+    assert storage.balance_on("2", date(2024, 3, 3)) == 15200
+    assert storage.total_on(date(2024, 3, 1)) == 10300
+    assert storage.total_on(date(2024, 3, 4)) == 26500
+    assert [tuple(row) for row in storage.list_daily_totals(date(2024, 3, 1), date(2024, 3, 31))] == [
+        ("2024-03-01", 500, 200, 2, 10300),
+        ("2024-03-03", 1300, 5100, 4, 26500),
+    ]
+
+    incremental = snapshot_rows(storage)
+    assert storage.rebuild_snapshots() == len(incremental[0])
+    assert snapshot_rows(storage) == incremental
+    storage.close()
+
+
+def test_deleting_a_customer_removes_it_from_the_snapshots(tmp_path):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    for account in ("1", "2"):
+        storage.create_customer(account, "h", 10000, now_timestamp(), "A", "Savings", "01/01/2000",
+                                f"123456789{account}", "Male", "X", "Passport")
+    storage.delete_customer("1")
+    assert storage.balance_on("1", date.today()) is None
+    assert storage.total_on(date.today()) == 10000
+    storage.close()
+
+
+def test_snapshot_queries_stay_on_indexes(tmp_path):
+    storage = Storage(tmp_path / "bank.db")
+    storage.init_db()
+    plan = " ".join(storage.explain_query_plan(
+        "SELECT closing_balance FROM daily_balances WHERE account_number = ? AND day <= ? ORDER BY day DESC LIMIT 1",
+        ("1", "2024-01-01"),
+    ))
+    assert "SEARCH daily_balances USING PRIMARY KEY" in plan
+    plan = " ".join(storage.explain_query_plan(
+        "SELECT closing_balance FROM daily_totals WHERE day < ? ORDER BY day DESC LIMIT 1", ("2024-01-01",)
+    ))
+    assert "SEARCH daily_totals USING PRIMARY KEY" in plan
+    assert "TEMP B-TREE" not in plan
+    storage.close()
@@ -0,0 +1,70 @@
+import ast
+import os
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("tkinter")
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def test_importing_ui_does_not_open_the_database(tmp_path):
+    db_path = tmp_path / "data" / "bank.db"
+    env = {**os.environ, "BANKAPP_DB_PATH": str(db_path)}
+    subprocess.run(
+        [sys.executable, "-c", "import bank_app.ui as ui; assert ui._service is None"],
+        cwd=ROOT_DIR,
+        env=env,
+        check=True,
+    )
+    assert not db_path.parent.exists()
+
+
+def test_get_service_is_created_once(tmp_path, monkeypatch):
+    ui = pytest.importorskip("bank_app.ui")
+    monkeypatch.setattr(ui, "DB_PATH", tmp_path / "bank.db")
+    monkeypatch.setattr(ui, "_service", None)
+    service = ui.get_service()
+    try:
+        assert ui.get_service() is service
+        assert (tmp_path / "bank.db").exists()
+    finally:
+        service.close()
+
+
+def test_background_task_callbacks_exist():
+    # A BackgroundTask callback is only looked up when the button is clicked, so check them all up front.
+    ui = pytest.importorskip("bank_app.ui")
+    tree = ast.parse(Path(ui.__file__).read_text(encoding="utf-8"))
+    missing = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.ClassDef):
+            continue
+        for call in ast.walk(node):
+            if isinstance(call, ast.Call) and getattr(call.func, "id", None) == "BackgroundTask":
+                for keyword in call.keywords:
+                    value = keyword.value
+                    if (keyword.arg in ("on_success", "on_error") and isinstance(value, ast.Attribute)
+                            and getattr(value.value, "id", None) == "self"
+                            and not hasattr(getattr(ui, node.name), value.attr)):
+                        missing.append(f"{node.name}.{value.attr}")
+    assert missing == []
+
+
+def test_change_pin_reports_the_result_and_closes(monkeypatch):
+    ui = pytest.importorskip("bank_app.ui")
+    shown = []
+    monkeypatch.setattr(ui, "report_customer_message", shown.append)
+    master = SimpleNamespace(withdrawn=False)
+    master.withdraw = lambda: setattr(master, "withdrawn", True)
+    dialog = object.__new__(ui.changePIN)
+    dialog.master = master
+
+    dialog._on_changed("PIN changed successfully.")
+
+    assert shown == ["PIN changed successfully."]
+    assert master.withdrawn